@@ -19,6 +19,10 @@ The following shapely geometry objects may be plotted.
 
 Includes a Style system for controlling line styles, fill colors, marker styles and legends.
 
+Large numbers of geometries can be plotted at once, with a handful of Plotly plots, via draw_many(...).
+Plots of layers drawn repeatedly can be reused from a TraceCache or DiskCache, via draw_many(..., cache=...).
+Very large figures can be written to HTML or JSON files a plot at a time, via write_html(...) and write_json(...).
+
 """
 __version__ = "1.0.0"
 
@@ -33,7 +37,24 @@ from .style import (
 
 from .plot import (
     show2d,
-    show3d
+    show3d,
+    set_trace_validation,
+    legend_scope
+)
+
+from .bulk import (
+    draw_many
+)
+
+from .cache import (
+    TraceCache,
+    DiskCache
+)
+
+from .stream import (
+    write_html,
+    write_json,
+    iter_plots
 )
 
 del resolve_info
@@ -0,0 +1,348 @@
+"""
+Performance benchmarks for the plotting functions.
+
+Random geometries are built with the same generators as the regression tests (tests/utils/rnd_shapes.py and
+tests/utils/rnd_shapes_3d.py), then densified with shapely.segmentize(...) to reach the requested number of
+vertices.  Every plot_*(...) function in plot.py, show2d(...), show3d(...) and draw_many(...) is timed over a grid
+of (number of geometries, number of vertices) cases.
+
+For each case the results record the run time, the peak memory allocated (via tracemalloc) and the size of the
+figure's JSON, which is roughly what a browser has to load.  Results are written as JSON so they can be compared
+across releases.
+
+Run from the parent directory of the repo:
+
+    python -m shapely_plotly.benchmarks.bench_plot -g 1 -g 100 -v 1000 -v 100000 -o results.json "plot_poly.*"
+"""
+
+import os
+import sys
+import re
+import json
+import time
+import math
+import random as rnd
+import platform
+import tracemalloc
+import argparse
+import datetime
+import statistics
+import subprocess
+
+import numpy as np
+import shapely as shp
+import plotly
+import plotly.io as pio
+
+import shapely_plotly as shpl
+import shapely_plotly.plot as shpl_plot
+from shapely_plotly.tests.utils import rnd_shapes
+from shapely_plotly.tests.utils import rnd_shapes_3d
+
+
+class BDef:
+    """
+    A benchmarked function.
+
+    :param name: Benchmark name.  For plot_*(...) functions, the name of the function in plot.py.
+    :param dims: 2 or 3.
+    :param rnd_class: Random geometry class from rnd_shapes/rnd_shapes_3d.  None for a random mix of all classes.
+    """
+    def __init__(self, name, dims, rnd_class=None):
+        self.name = name
+        self.dims = dims
+        self.rnd_class = rnd_class
+        return
+
+
+bench_list = [
+    BDef("plot_point3d", 3, rnd_shapes_3d.RndPoint3d),
+    BDef("plot_point2d", 2, rnd_shapes.RndPoint2d),
+    BDef("plot_multipoint3d", 3, rnd_shapes_3d.RndMultiPoint3d),
+    BDef("plot_multipoint2d", 2, rnd_shapes.RndMultiPoint2d),
+    BDef("plot_line_string3d", 3, rnd_shapes_3d.RndLineString3d),
+    BDef("plot_line_string2d", 2, rnd_shapes.RndLineString2d),
+    BDef("plot_polygon3d", 3, rnd_shapes_3d.RndPolyComplex3d),
+    BDef("plot_polygon2d", 2, rnd_shapes.RndPolyComplex2d),
+    BDef("plot_multipolygon3d", 3, rnd_shapes_3d.RndMultiPoly3d),
+    BDef("plot_multipolygon2d", 2, rnd_shapes.RndMultiPoly2d),
+    BDef("plot_multiline3d", 3, rnd_shapes_3d.RndMultiLine3d),
+    BDef("plot_multiline2d", 2, rnd_shapes.RndMultiLine2d),
+    BDef("plot_geometry_collection3d", 3, rnd_shapes_3d.RndGeomCollection3d),
+    BDef("plot_geometry_collection2d", 2, rnd_shapes.RndGeomCollection2d),
+    BDef("show2d", 2),
+    BDef("show3d", 3),
+    BDef("draw_many2d", 2),
+    BDef("draw_many3d", 3),
+]
+
+default_geoms = [1, 100, 1000]
+default_vertices = [1000, 100000]
+
+
+# -----------------------------------------------------------------
+# Geometry
+# -----------------------------------------------------------------
+
+def rnd_geoms(bench, num_geoms):
+    """
+    Build num_geoms random geometries for a benchmark, laid out on a grid.
+    """
+    classes = rnd_shapes_3d.rnd_geom_classes if bench.dims == 3 else rnd_shapes.rnd_geom_classes
+    cols = math.ceil(math.sqrt(num_geoms))
+
+    geoms = np.empty(num_geoms, dtype=object)
+    for i in range(num_geoms):
+        rnd_class = rnd.choice(classes) if bench.rnd_class is None else bench.rnd_class
+        x, y = (i % cols) * 5.0, (i // cols) * 5.0
+        if bench.dims == 3:
+            geoms[i], _ = rnd_class.rnd_shape_3d(x, y, -1.0, 4.0, 4.0, 2.0)
+        else:
+            geoms[i], _ = rnd_class.rnd_shape_2d(x, y, 4.0, 4.0)
+
+    return geoms
+
+
+def densify(geoms, num_vertices):
+    """
+    Add vertices along lines and polygon edges until the geometries have about num_vertices vertices in total.
+    Points cannot be densified.
+    """
+    if shp.get_num_coordinates(geoms).sum() >= num_vertices:
+        return geoms
+
+    lengths = shp.length(geoms)
+    has_length = lengths > 0.0
+    if not has_length.any():
+        return geoms
+
+    # Spread the vertices evenly over the total length.
+    max_segment = lengths[has_length].sum() / num_vertices
+    geoms = geoms.copy()
+    geoms[has_length] = shp.segmentize(geoms[has_length], max_segment)
+    return geoms
+
+
+# -----------------------------------------------------------------
+# Measurement
+# -----------------------------------------------------------------
+
+def bench_runner(bench, geoms, binary=False):
+    """
+    Get a function that runs the benchmark once, and returns (plot_data, figure).  figure is None for the
+    plot_*(...) benchmarks.
+    """
+    if bench.name.startswith("plot_"):
+        f = getattr(shpl_plot, bench.name)
+
+        def run():
+            plot_data = []
+            for geom in geoms:
+                f(geom, plot_data)
+            return plot_data, None
+
+    elif bench.name.startswith("draw_many"):
+        def run():
+            plot_data = []
+            shpl.draw_many(geoms, plot_data, dims=bench.dims)
+            return plot_data, None
+
+    else:
+        # Plotting is done up front.  Only building the figure is timed.
+        plot_data = []
+        for geom in geoms:
+            geom.plotly_draw3d(plot_data) if bench.dims == 3 else geom.plotly_draw2d(plot_data)
+
+        show = shpl.show3d if bench.dims == 3 else shpl.show2d
+
+        def run():
+            return plot_data, show(plot_data, show=False, validate=shpl_plot.validate_traces, binary=binary)
+
+    return run
+
+
+def figure_json_bytes(bench, plot_data, fig, binary=False):
+    """
+    Size in bytes of the figure's JSON.
+    """
+    if fig is None:
+        show = shpl.show3d if bench.dims == 3 else shpl.show2d
+        fig = show(plot_data, show=False, validate=shpl_plot.validate_traces, binary=binary)
+
+    return len(pio.to_json(fig, validate=False).encode("utf-8"))
+
+
+def run_case(bench, num_geoms, num_vertices, repeat, seed, binary=False):
+    """
+    Run one benchmark case.
+
+    :return: Dictionary of results.
+    """
+    rnd.seed(seed)
+    geoms = densify(rnd_geoms(bench, num_geoms), num_vertices)
+    run = bench_runner(bench, geoms, binary)
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        plot_data, fig = run()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return dict(
+        name=bench.name,
+        dims=bench.dims,
+        geometries=num_geoms,
+        vertices_requested=num_vertices,
+        vertices=int(shp.get_num_coordinates(geoms).sum()),
+        traces=len(plot_data),
+        repeat=repeat,
+        time_s=min(times),
+        time_median_s=statistics.median(times),
+        peak_bytes=peak_bytes,
+        json_bytes=figure_json_bytes(bench, plot_data, fig, binary)
+    )
+
+
+# Run in a fresh interpreter by import_times(...).  Prints the import times as JSON.
+import_time_script = """
+import json, time
+t0 = time.perf_counter()
+import shapely_plotly
+t1 = time.perf_counter()
+import plotly.graph_objects
+plotly.graph_objects.Figure()
+plotly.graph_objects.Scatter()
+t2 = time.perf_counter()
+print(json.dumps(dict(import_s=t1 - t0, import_plotly_s=t2 - t1)))
+"""
+
+
+def import_times():
+    """
+    Time the imports in a fresh Python interpreter, where nothing is cached in sys.modules.
+
+    :return: Dictionary.  "import_s" - Time for import shapely_plotly.
+                          "import_plotly_s" - Time to then import plotly.graph_objects and build a first Figure and
+                                              Scatter.  plotly.graph_objects loads its classes on first use, so
+                                              this is the cost deferred until the first graph object is built or
+                                              a figure is shown.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    out = subprocess.run([sys.executable, "-c", import_time_script], env=env, check=True, capture_output=True,
+                         text=True).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def run_benchmarks(names=(".*",), geoms=None, vertices=None, repeat=3, seed=0, validate=True, binary=False,
+                   log=None):
+    """
+    Run all the cases for the benchmarks matching names.
+
+    :param names: Regular expressions.  Benchmarks with fully matching names are run.
+    :param geoms: List of numbers of geometries.
+    :param vertices: List of total numbers of vertices.
+    :param repeat: Number of timed runs per case.  The fastest is reported as time_s.
+    :param seed: Random seed for the geometries.
+    :param validate: If False, run with set_trace_validation(False).
+    :param binary: Figures are built with show2d/show3d(binary=binary).  False, True or "f4".
+    :param log: If not None, a file to write progress messages to.
+    :return: Dictionary, {"meta": {...}, "results": [...]}.
+    """
+    geoms = default_geoms if geoms is None else geoms
+    vertices = default_vertices if vertices is None else vertices
+    name_res = [re.compile(n) for n in names]
+
+    meta = dict(
+        timestamp=datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        python=platform.python_version(),
+        platform=platform.platform(),
+        numpy=np.__version__,
+        shapely=shp.__version__,
+        plotly=plotly.__version__,
+        validate=validate,
+        binary=binary,
+        repeat=repeat,
+        seed=seed,
+        **import_times()
+    )
+
+    results = []
+    shpl.set_trace_validation(validate)
+    try:
+        for bench in bench_list:
+            if not any(n.fullmatch(bench.name) for n in name_res):
+                continue
+
+            for num_geoms in geoms:
+                for num_vertices in vertices:
+                    res = run_case(bench, num_geoms, num_vertices, repeat, seed, binary)
+                    if log is not None:
+                        print(f"{bench.name} geometries={num_geoms} vertices={res['vertices']}: "
+                              f"{res['time_s']:.4f}s", file=log)
+                    results.append(res)
+    finally:
+        shpl.set_trace_validation(True)
+
+    return dict(meta=meta, results=results)
+
+
+def main():
+    usage = """Usage: %(prog)s [options] benchmarks...
+
+Benchmarks can be regular expressions.  All matching benchmarks are run.  Default is all.
+
+Defined benchmarks are:"""
+
+    for b in bench_list:
+        usage += "\n   " + b.name
+
+    parser = argparse.ArgumentParser(usage=usage)
+
+    parser.add_argument("-g", "--geoms", type=int, default=[], action="append",
+                        help=f"Number of geometries.  May be given more than once.  Default {default_geoms}.")
+
+    parser.add_argument("-v", "--vertices", type=int, default=[], action="append",
+                        help=f"Total number of vertices.  May be given more than once.  Default {default_vertices}.")
+
+    parser.add_argument("-r", "--repeat", type=int, default=3,
+                        help="Number of timed runs per case.")
+
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Random seed for the geometries.")
+
+    parser.add_argument("--no-validate", default=False, action="store_true",
+                        help="Run with shapely_plotly.set_trace_validation(False).")
+
+    parser.add_argument("--binary", default=False, choices=["f8", "f4"],
+                        help="Build figures with coordinates as typed arrays, float64 (f8) or float32 (f4).")
+
+    parser.add_argument("-o", "--output", default=None,
+                        help="JSON output file.  Default is stdout.")
+
+    parser.add_argument("bench_list", nargs="*", default=[".*"],
+                        help="Benchmarks to run.  These are regular expressions.")
+
+    args = parser.parse_args()
+
+    res = run_benchmarks(args.bench_list, args.geoms or None, args.vertices or None, args.repeat, args.seed,
+                         not args.no_validate, args.binary, log=sys.stderr)
+
+    if args.output is None:
+        json.dump(res, sys.stdout, indent=1)
+        print()
+    else:
+        with open(args.output, "w") as f:
+            json.dump(res, f, indent=1)
+
+    return
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,811 @@
+"""
+Bulk plotting of many geometries.
+
+The plotly_draw*(...) methods plot a single geometry, and produce one or more Plotly plots for each geometry.
+For large numbers of geometries this is slow, both to build the plots and to display them in Plotly.
+
+draw_many(...) plots an entire list or NumPy array of geometries with a handful of Plotly plots.  Geometries that
+share a style, name and legend group are merged.  All coordinates are extracted with Shapely's vectorized functions,
+and merged geometries of the same kind are joined into a single scatter plot, with gaps between them.
+
+Colors and marker sizes can be given per geometry, rather than by style.  These are expanded to one value per vertex,
+so that many differently colored geometries still share a single plot.  2D lines cannot be colored per vertex, so
+their colors are quantized into a bounded number of buckets, with a plot per bucket.
+"""
+
+from __future__ import annotations
+import warnings
+import numpy as np
+import shapely as sh
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from shapely_plotly import DEFAULT
+from shapely_plotly.style import resolve_info
+from shapely_plotly.plot import (
+    unique_legend_group, legend_scope, no_line_style, new_trace, scatter2d, mesh3d_kwargs, is_numeric, color_kwargs,
+    array_style, style_dict
+)
+from shapely_plotly.cache import (
+    cache_legend_prefix, array_digest, store_plots, use_legend_groups, cached_plots
+)
+from shapely_plotly.coords import (
+    as_geometry_array, explode, split_by_type, get_coords, line_coords, polygon_rings, fill_oriented,
+    lod_tolerance, simplify, in_view, clip_to_view
+)
+
+
+def line_mode(line_style, marker_style):
+    """
+    Plotly scatter mode for a line and marker style.  None means nothing is drawn.
+    """
+    if line_style is None:
+        if marker_style is None:
+            return None
+        return "markers"
+
+    if marker_style is None:
+        return "lines"
+
+    return "lines+markers"
+
+
+def xyz_kwargs(coords, dims):
+    """
+    Scatter/Scatter3d coordinate keyword arguments for a (N, dims) coordinate array.
+    """
+    if dims == 3:
+        return dict(x=coords[:, 0], y=coords[:, 1], z=coords[:, 2])
+
+    return dict(x=coords[:, 0], y=coords[:, 1])
+
+
+def select(values, index):
+    """
+    values[index], or None if values is None.
+    """
+    return None if values is None else values[index]
+
+
+def ring_kwargs(rings, dims, values):
+    """
+    Scatter/Scatter3d coordinate keyword arguments for an array of lines/rings.  If values is not None (one value
+    per line), the values expanded to one per vertex are added as "values".  See color_kwargs(...).
+    """
+    if values is None:
+        return xyz_kwargs(line_coords(rings, dims), dims)
+
+    coords, vertex_values = line_coords(rings, dims, values)
+    return dict(xyz_kwargs(coords, dims), values=vertex_values)
+
+
+def polygon_plots2d(polygons, style, plots, values=None, has_interiors=None):
+    """
+    Build the plot keyword arguments for an array of polygons - 2D.  Follows the same rules as plot_polygon2d.
+    has_interiors overrides whether the polygons have holes, when they are a part of a larger group.
+    """
+    rings, is_exterior, ring_index = polygon_rings(polygons, return_index=True)
+    if len(rings) == 0:
+        return
+
+    values = select(values, ring_index)
+
+    if has_interiors is None:
+        has_interiors = not is_exterior.all()
+    fill_color = style.fill_color
+    mode = line_mode(style.line_style, style.vertex_style)
+
+    if (fill_color is not None) or (mode is not None and not has_interiors):
+        if has_interiors or (mode is None):
+            # Fill only.  Lines and markers are drawn by the plots below.
+            f_mode, f_line_style, f_marker_style = "lines", no_line_style, None
+        else:
+            f_mode, f_line_style, f_marker_style = mode, style.line_style, style.vertex_style
+
+        plots.append(dict(ring_kwargs(fill_oriented(rings, is_exterior), 2, values),
+                          line=f_line_style, marker=f_marker_style, mode=f_mode,
+                          fillcolor=fill_color, fill="toself"))
+
+    if has_interiors:
+        if mode is not None:
+            plots.append(dict(ring_kwargs(rings[is_exterior], 2, select(values, is_exterior)),
+                              line=style.line_style, marker=style.vertex_style, mode=mode))
+
+        h_mode = line_mode(style.hole_line_style, style.hole_vertex_style)
+        if h_mode is not None:
+            plots.append(dict(ring_kwargs(rings[~is_exterior], 2, select(values, ~is_exterior)),
+                              line=style.hole_line_style, marker=style.hole_vertex_style, mode=h_mode))
+
+    return
+
+
+def polygon_plots3d(polygons, style, plots, values=None):
+    """
+    Build the plot keyword arguments for an array of polygons - 3D.  Exteriors and holes are outlined.  If the style
+    has fill_3d set, all the polygons are filled by a single Mesh3d plot.
+    """
+    rings, is_exterior, ring_index = polygon_rings(polygons, return_index=True)
+    if len(rings) == 0:
+        return
+
+    values = select(values, ring_index)
+
+    if style.fill_3d and (style.fill_color is not None):
+        mesh = mesh3d_kwargs(polygons, style.fill_color)
+        if mesh is not None:
+            plots.append(dict(mesh, type="mesh3d"))
+
+    mode = line_mode(style.line_style, style.vertex_style)
+    if mode is not None:
+        plots.append(dict(ring_kwargs(rings[is_exterior], 3, select(values, is_exterior)),
+                          line=style.line_style, marker=style.vertex_style, mode=mode))
+
+    h_mode = line_mode(style.hole_line_style, style.hole_vertex_style)
+    if (h_mode is not None) and not is_exterior.all():
+        plots.append(dict(ring_kwargs(rings[~is_exterior], 3, select(values, ~is_exterior)),
+                          line=style.hole_line_style, marker=style.hole_vertex_style, mode=h_mode))
+
+    return
+
+
+def line_plots(lines, style, dims, plots, values=None):
+    """
+    Build the plot keyword arguments for an array of LineStrings/LinearRings.
+    """
+    mode = line_mode(style.line_style, style.vertex_style)
+    if mode is None:
+        return
+
+    kwargs = ring_kwargs(lines, dims, values)
+    if len(kwargs["x"]) == 0:
+        return
+
+    plots.append(dict(kwargs,
+                      line=style.line_style, marker=style.vertex_style, mode=mode))
+    return
+
+
+def point_plots(points, style, dims, plots, values=None):
+    """
+    Build the plot keyword arguments for an array of Points.
+    """
+    coords, index = get_coords(points, dims, return_index=True)
+    if len(coords) == 0:
+        return
+
+    assert style.point_style is not None
+    kwargs = xyz_kwargs(coords, dims)
+    if values is not None:
+        kwargs["values"] = values[index]
+
+    plots.append(dict(kwargs, marker=style.point_style, mode="markers"))
+    return
+
+
+def apply_colors(kwargs, dims, colors, sizes, c_kwargs, line_color=None):
+    """
+    Replace the per-vertex "values" of plot keyword arguments, which are geometry indexes, with line and marker
+    colors and marker sizes.  2D lines cannot be colored per vertex, so only their markers are colored, unless
+    line_color gives a single color for the lines.  Fills keep the style's fill color.
+    """
+    index = kwargs.pop("values", None)
+    if index is None:
+        return kwargs
+
+    v_colors = select(colors, index)
+    marker = kwargs.get("marker")
+    if marker is not None:
+        kwargs["marker"] = array_style(marker, v_colors, select(sizes, index), c_kwargs)
+
+    line = kwargs.get("line")
+    if (dims == 3) and (line is not None) and (v_colors is not None):
+        kwargs["line"] = array_style(line, v_colors, None, c_kwargs)
+    elif (line_color is not None) and (line is not None) and (line is not no_line_style):
+        kwargs["line"] = dict(style_dict(line), color=line_color)
+
+    return kwargs
+
+
+def stage_plots(geoms, style, dims, geom_index=None, has_interiors=None):
+    """
+    Internal function.  Build the plot keyword arguments for an array of geometries sharing a single resolved style.
+
+    :param geom_index: If not None, the index into colors and sizes of each geometry.  Each plot then has the index
+                       of each vertex as "values".  See apply_colors(...).
+    :param has_interiors: 2D only.  If not None, whether any polygon of the whole group has holes.  See
+                          polygon_plots2d(...).
+    :return: ([polygon plots], [line plots], [point plots]).  Drawn in this order, so that the smaller items are on
+             top.
+    """
+    parts, part_index = explode(geoms, return_index=True)
+    points, lines, polygons, (point_index, line_index, polygon_index) = split_by_type(parts, return_index=True)
+    part_values = select(geom_index, part_index)
+
+    stages = ([], [], [])
+    if dims == 3:
+        polygon_plots3d(polygons, style, stages[0], select(part_values, polygon_index))
+    else:
+        polygon_plots2d(polygons, style, stages[0], select(part_values, polygon_index), has_interiors)
+
+    line_plots(lines, style, dims, stages[1], select(part_values, line_index))
+    point_plots(points, style, dims, stages[2], select(part_values, point_index))
+    return stages
+
+
+def draw_plots(plots, data, style, name, legend_group, show_legend, dims, renderer,
+               colors=None, sizes=None, c_kwargs=None, line_color=None):
+    """
+    Internal function.  Build the Plotly plots of a group from their keyword arguments, and append them to data.
+    Per-vertex "values" are replaced by colors and sizes, see apply_colors(...).
+    """
+    plots = [apply_colors(kwargs, dims, colors, sizes, c_kwargs, line_color) for kwargs in plots]
+
+    # Tie multiple plots together under a single legend entry.
+    if (legend_group is None) and (len(plots) > 1):
+        legend_group = unique_legend_group()
+
+    if renderer is DEFAULT:
+        renderer = style.renderer
+
+    for kwargs in plots:
+        if kwargs.get("type") == "mesh3d":
+            # Scatter keyword arguments may not apply to Mesh3d.
+            mesh = {k: v for k, v in kwargs.items() if k != "type"}
+            scat = new_trace("mesh3d", **mesh, name=name, showlegend=show_legend, legendgroup=legend_group)
+        elif dims == 3:
+            scat = new_trace("scatter3d", **kwargs,
+                             name=name, showlegend=show_legend, legendgroup=legend_group,
+                             **style.scatter_kwargs)
+        else:
+            scat = scatter2d(renderer, **kwargs,
+                             name=name, showlegend=show_legend, legendgroup=legend_group,
+                             **style.scatter_kwargs)
+        data.append(scat)
+        show_legend = False  # Only the first plot has a legend entry.
+
+    return
+
+
+def shared_legend(legends, style, name, show_legend, legend_group, indexes):
+    """
+    Internal function.  Share the legend entry of a group with earlier groups of the same style, name and legend
+    group.  The first such group gets the legend entry, and the legend group the others join.
+
+    :param legends: Dictionary of the legend group used by each group.
+    :return: (style, name, show_legend, legend_group, indexes).  See group_by_info(...).
+    """
+    key = (id(style), name, show_legend, legend_group)
+    shared_group = legends.get(key)
+    if shared_group is not None:
+        return style, name, False, shared_group, indexes
+
+    if legend_group is None:
+        legend_group = unique_legend_group()
+    legends[key] = legend_group
+    return style, name, show_legend, legend_group, indexes
+
+
+def group_by_info(geoms, style, name, legend_group, show_legend):
+    """
+    Internal function.  Group geometries by their resolved style, name, legend group and legend flag.
+    See resolve_info(...).
+
+    Returns a list of (style, name, show_legend, legend_group, indexes) tuples, in order of first appearance.
+    indexes selects the group's geometries from geoms.
+    """
+    if (style is not DEFAULT) and (name is not DEFAULT):
+        # Nothing to look up per geometry.  All in one group.
+        style, name, show_legend, legend_group = resolve_info(None, style, name, legend_group, show_legend)
+        return [(style, name, show_legend, legend_group, slice(None))]
+
+    groups = {}
+    for i, geom in enumerate(geoms):
+        info = resolve_info(geom, style, name, legend_group, show_legend)
+        g_style, g_name, g_show_legend, g_legend_group = info
+        key = (id(g_style), g_name, g_show_legend, g_legend_group)
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = (info, [])
+        group[1].append(i)
+
+    return [(*info, indexes) for info, indexes in groups.values()]
+
+
+# -----------------------------------------------------------------
+# Color buckets
+#
+# Plotly 2D Scatter lines have a single color.  To color lines by value with a bounded number of plots, the values
+# are quantized into buckets, and each bucket is drawn with a single color.
+# -----------------------------------------------------------------
+
+# Colorscale used for bucketing when none is given.  This is the default of Plotly's standard template.
+default_colorscale = "Plasma"
+
+# Largest difference in any RGB channel (0-255) between a color and its bucket's color that is not reported as a
+# visible quantization.
+visible_color_step = 8
+
+
+def colorscale_rgb(colorscale, values):
+    """
+    Sample a Plotly colorscale.
+
+    :param colorscale: Plotly colorscale name, or list of [position, color] with "rgb(...)" or "#rrggbb" colors.
+    :param values: Array of positions, 0.0 to 1.0.
+    :return: (N, 3) float array of RGB components, 0 to 255.
+    """
+    import plotly.colors
+
+    if isinstance(colorscale, str):
+        colorscale = plotly.colors.get_colorscale(colorscale)
+
+    pos = np.array([float(p) for p, _ in colorscale])
+    rgb = np.array([plotly.colors.hex_to_rgb(c) if c.startswith("#") else plotly.colors.unlabel_rgb(c)
+                    for _, c in colorscale], dtype=float)
+    return np.stack([np.interp(values, pos, rgb[:, i]) for i in range(3)], axis=1)
+
+
+def bucket_plots(geoms, style):
+    """
+    Internal function.  The most plots a bucket of a group of geometries can take - 2D.  Follows the rules of
+    stage_plots(...): up to three plots for polygons with holes, and one each for lines and points.
+
+    :param geoms: 1D NumPy object array of the group's geometries.
+    :param style: The group's resolved style.
+    """
+    points, lines, polygons = split_by_type(explode(geoms))
+    mode = line_mode(style.line_style, style.vertex_style)
+
+    num_plots = 0
+    if len(polygons) > 0:
+        if (sh.get_num_interior_rings(polygons) > 0).any():
+            h_mode = line_mode(style.hole_line_style, style.hole_vertex_style)
+            num_plots += (style.fill_color is not None) + (mode is not None) + (h_mode is not None)
+        else:
+            num_plots += (style.fill_color is not None) or (mode is not None)
+    if (len(lines) > 0) and (mode is not None):
+        num_plots += 1
+    if len(points) > 0:
+        num_plots += 1
+
+    return num_plots
+
+
+def quantize(colors, c_kwargs, num_buckets):
+    """
+    Internal function.  Bucket number of each numeric color, for num_buckets buckets of equal width between cmin and
+    cmax.  NaN colors are put in the lowest bucket.
+    """
+    c_min, c_max = c_kwargs["cmin"], c_kwargs["cmax"]
+    c_range = (c_max - c_min) if c_max > c_min else 1.0
+    pos = np.nan_to_num(np.clip((colors - c_min) / c_range, 0.0, 1.0), nan=0.0)
+    return np.minimum((pos * num_buckets).astype(int), num_buckets - 1)
+
+
+def color_buckets(colors, c_kwargs, max_traces, group_index, group_plots):
+    """
+    Quantize colors into buckets, so that the plots of all the groups fit in max_traces.
+
+    Numeric colors are split into buckets of equal width between cmin and cmax, as many as fit the budget.  Each
+    bucket is colored from the colorscale at its center.  A warning is issued if the colors in a bucket visibly
+    differ from the bucket's color.  See visible_color_step.  Color strings cannot be quantized.  Each distinct
+    string is a bucket.  A warning is issued if the plots exceed max_traces, e.g. with more groups than max_traces.
+
+    :param colors: 1D NumPy array of colors.  See color_kwargs(...).
+    :param c_kwargs: color_kwargs(...) for colors.
+    :param max_traces: Maximum number of plots, for all the groups.
+    :param group_index: For each group, the index into colors of its geometries.
+    :param group_plots: For each group, the most plots a bucket can take.  See bucket_plots(...).
+    :return: (bucket, bucket_colors).  bucket has the bucket number of each color.  bucket_colors has a Plotly
+             color string for each bucket.
+    """
+    def num_plots(bucket):
+        return sum(len(np.unique(bucket[index])) * plots for index, plots in zip(group_index, group_plots))
+
+    if not is_numeric(colors):
+        bucket_colors, bucket = np.unique(colors, return_inverse=True)
+        bucket = bucket.ravel()
+        total = num_plots(bucket)
+        if total > max_traces:
+            warnings.warn(f"{len(bucket_colors)} distinct color strings take {total} plots, exceeding max_traces of "
+                          f"{max_traces}.  Use numeric colors to quantize them.", stacklevel=3)
+        return bucket, list(bucket_colors)
+
+    # Search for the most buckets within the budget.  Plots mostly grow with the buckets, and each step is checked.
+    low, high = 1, max(1, max_traces)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if num_plots(quantize(colors, c_kwargs, mid)) <= max_traces:
+            low = mid
+        else:
+            high = mid - 1
+    max_buckets = low
+    bucket = quantize(colors, c_kwargs, max_buckets)
+
+    total = num_plots(bucket)
+    if total > max_traces:
+        warnings.warn(f"{len(group_plots)} groups take {total} plots with a single color bucket, exceeding "
+                      f"max_traces of {max_traces}.", stacklevel=3)
+
+    # Colors are most different from their bucket's center color at the edges of the bucket.
+    colorscale = c_kwargs["colorscale"]
+    edges = colorscale_rgb(colorscale, np.linspace(0.0, 1.0, max_buckets + 1))
+    centers = colorscale_rgb(colorscale, (np.arange(max_buckets) + 0.5) / max_buckets)
+    used = np.unique(bucket)
+    step = max(np.abs(edges[used] - centers[used]).max(), np.abs(edges[used + 1] - centers[used]).max())
+    if step > visible_color_step:
+        warnings.warn(f"Quantizing colors into {max_buckets} buckets changes them by up to {step:.0f} levels "
+                      f"(of 255).  Increase max_traces for smoother colors.", stacklevel=3)
+
+    bucket_colors = [f"rgb({r:.0f},{g:.0f},{b:.0f})" for r, g, b in centers]
+    return bucket, bucket_colors
+
+
+# -----------------------------------------------------------------
+# Parallel plot building
+#
+# Extracting coordinates, and triangulating 3D fills, is split into chunks of geometries and run by an executor.
+# Styles, names and legend groups are resolved, and the Plotly plots built, in the calling process.
+# -----------------------------------------------------------------
+
+# Number of geometries sent to a worker at a time by draw_many(..., parallel=...).
+parallel_chunk_size = 5000
+
+# Line and marker components of a style, named in the plots built from a StyleSpec.
+plot_style_names = ("line_style", "vertex_style", "hole_line_style", "hole_vertex_style", "point_style")
+
+
+class StyleSpec:
+    """
+    Internal.  A compact, picklable stand-in for a resolved style, for building plots in another process.
+
+    Only the fill color and fill_3d are kept.  Each line and marker style is replaced by its own name, or None if it
+    is not drawn.  Plots built with a StyleSpec name their styles, e.g. line="hole_line_style".  See resolve_plot(...).
+    """
+
+    __slots__ = plot_style_names + ("fill_color", "fill_3d")
+
+    def __init__(self, style):
+        for n in plot_style_names:
+            setattr(self, n, None if getattr(style, n) is None else n)
+        self.fill_color = style.fill_color
+        self.fill_3d = style.fill_3d
+        return
+
+
+def chunk_plots(geoms, spec, dims, geom_index, has_interiors, wkb):
+    """
+    Internal function.  Run by a worker.  stage_plots(...) for a chunk of geometries.  If wkb is True, the geometries
+    are given as WKB.
+    """
+    if wkb:
+        geoms = sh.from_wkb(geoms)
+    return stage_plots(geoms, spec, dims, geom_index, has_interiors)
+
+
+def join_plots(parts, gap):
+    """
+    Internal function.  Join the keyword arguments of plots with the same styles, built for consecutive chunks.
+
+    :param parts: List of keyword argument dictionaries.
+    :param gap: If True, lines and rings are separated by a NaN gap, as by coords.gap_join(...).
+    :return: Keyword argument dictionary.
+    """
+    res = dict(parts[0])
+    parts = [p for p in parts if len(p["x"])] or [res]
+
+    if res.get("type") == "mesh3d":
+        # Vertices shared between chunks are stored once, as by coords.triangulate(...).
+        vertices = np.concatenate([np.stack([p["x"], p["y"], p["z"]], axis=1) for p in parts])
+        offsets = np.cumsum([0] + [len(p["x"]) for p in parts])
+        faces = np.concatenate([np.stack([p["i"], p["j"], p["k"]], axis=1) + offset
+                                for p, offset in zip(parts, offsets)])
+        vertices, index = np.unique(vertices, axis=0, return_inverse=True)
+        faces = index.reshape(-1)[faces].astype(np.int32)
+        res.update(x=vertices[:, 0], y=vertices[:, 1], z=vertices[:, 2], i=faces[:, 0], j=faces[:, 1], k=faces[:, 2])
+        return res
+
+    for key in ("x", "y", "z", "values"):
+        if key not in res:
+            continue
+
+        arrays = []
+        for p in parts:
+            if gap and arrays:
+                arrays.append([np.nan] if key != "values" else arrays[-1][-1:])
+            arrays.append(p[key])
+        res[key] = np.concatenate(arrays)
+
+    return res
+
+
+def merge_plots(chunks):
+    """
+    Internal function.  Merge the stage_plots(...) of consecutive chunks of a group into the plots for the whole
+    group, in drawing order.  Within each stage, plots with the same styles are joined.
+    """
+    plots = []
+    for stage in range(3):
+        merged = {}
+        for stages in chunks:
+            for kwargs in stages[stage]:
+                key = tuple((k, repr(v)) for k, v in kwargs.items() if k not in ("x", "y", "z", "i", "j", "k",
+                                                                                   "values"))
+                merged.setdefault(key, []).append(kwargs)
+
+        # Points are not joined by lines, so need no gaps.
+        plots += [join_plots(parts, stage != 2) for parts in merged.values()]
+
+    return plots
+
+
+def resolve_plot(kwargs, style):
+    """
+    Internal function.  Replace the style names of plot keyword arguments built from a StyleSpec with the
+    components of style.
+    """
+    for key in ("line", "marker"):
+        v = kwargs.get(key)
+        if isinstance(v, str):
+            kwargs[key] = getattr(style, v)
+        elif v == no_line_style:
+            kwargs[key] = no_line_style  # Compared by identity.  See apply_colors(...).
+
+    return kwargs
+
+
+def parallel_executor(parallel, workers):
+    """
+    Internal function.  The executor for draw_many(..., parallel=...), as a context manager.  Pools created here
+    are shut down on exit.  A given executor is left running.
+    """
+    if parallel is True:
+        return ProcessPoolExecutor(max_workers=workers)
+    if parallel == "threads":
+        return ThreadPoolExecutor(max_workers=workers)
+
+    return nullcontext(parallel or None)
+
+
+def map_chunks(executor, func, geoms, *args):
+    """
+    Internal function.  func(geoms, *args), for a vectorized function of an array of geometries.  With a thread pool,
+    func is run on chunks of parallel_chunk_size geometries in parallel.  Shapely releases the GIL in its vectorized
+    functions, so the threads use several cores.  Otherwise, func is run directly.
+    """
+    if (not isinstance(executor, ThreadPoolExecutor)) or (len(geoms) <= parallel_chunk_size):
+        return func(geoms, *args)
+
+    futures = [executor.submit(func, geoms[start:start + parallel_chunk_size], *args)
+               for start in range(0, len(geoms), parallel_chunk_size)]
+    return np.concatenate([f.result() for f in futures])
+
+
+def wkb_geoms(geoms, dims):
+    """
+    Internal function.  WKB of geometries, to send to other processes.  GEOS may report a geometry as 2D while some
+    of its coordinates have z, e.g. after clip_by_rect(...), and WKB would then drop z.  For 3D, such geometries are
+    rebuilt as 3D, with missing z-coordinates as 0.0, as get_coords(...) reads them.
+    """
+    if dims == 3:
+        flat = ~sh.has_z(geoms)
+        if flat.any():
+            geoms = geoms.copy()
+            geoms[flat] = sh.set_coordinates(sh.force_3d(geoms[flat]), get_coords(geoms[flat], 3))
+
+    return sh.to_wkb(geoms)
+
+
+def parallel_plots(jobs, dims, executor):
+    """
+    Internal function.  The plot keyword arguments of each job, built in chunks by an executor.
+
+    :param jobs: List of (geoms, style, geom_index).  See stage_plots(...).
+    :param executor: concurrent.futures.Executor.  Geometries are sent to other processes as WKB, and to threads as
+                     they are.
+    :return: List with a list of plot keyword arguments for each job.
+    """
+    wkb = not isinstance(executor, ThreadPoolExecutor)
+
+    futures = []
+    for geoms, style, geom_index in jobs:
+        spec = StyleSpec(style)
+
+        # Whether holes are outlined separately depends on the whole group.
+        has_interiors = None
+        if dims == 2:
+            has_interiors = bool((sh.get_num_interior_rings(explode(geoms)) > 0).any())
+
+        chunks = [slice(start, start + parallel_chunk_size) for start in range(0, len(geoms), parallel_chunk_size)]
+        futures.append([executor.submit(chunk_plots, wkb_geoms(geoms[c], dims) if wkb else geoms[c], spec, dims,
+                                        select(geom_index, c), has_interiors, wkb)
+                        for c in chunks])
+
+    return [[resolve_plot(kwargs, style) for kwargs in merge_plots([f.result() for f in job_futures])]
+            for (_, style, _), job_futures in zip(jobs, futures)]
+
+
+def groups_key(groups, cache):
+    """
+    Internal function.  The part of a cache key for the groups of group_by_info(...).  Styles are keyed by
+    cache.style_key(...).
+    """
+    return tuple((cache.style_key(g_style), g_name, g_show_legend, g_legend_group,
+                  None if isinstance(indexes, slice) else array_digest(indexes))
+                 for g_style, g_name, g_show_legend, g_legend_group, indexes in groups)
+
+
+def cached_draw_many(cache, geoms, data, style, name, legend_group, show_legend, dims, merge, renderer, tolerance,
+                     max_vertices, view, colors, sizes, colorscale, cmin, cmax, max_traces, parallel, workers):
+    """
+    Internal function.  draw_many(...), reusing plots from a TraceCache.  The key covers the geometries, their
+    resolved styles and names, and all the arguments that change the plots.
+    """
+    arr, index = as_geometry_array(geoms, return_index=True)
+    groups = group_by_info(arr, style, name, legend_group, show_legend)
+    key = (cache.fingerprint(arr), array_digest(index), groups_key(groups, cache), dims, merge, repr(renderer),
+           tolerance, max_vertices, None if view is None else tuple(view), array_digest(colors), array_digest(sizes),
+           repr(colorscale), cmin, cmax, max_traces)
+
+    plots = cache.get(key)
+    if plots is not None:
+        data.extend(cached_plots(plots))
+        return
+
+    # Generated legend groups are replaced on every use.  See cache.use_legend_groups(...).
+    plots = []
+    with legend_scope(cache_legend_prefix):
+        draw_many(geoms, plots, style, name, legend_group, show_legend, dims, merge, renderer, tolerance,
+                  max_vertices, view, colors, sizes, colorscale, cmin, cmax, max_traces, parallel, workers)
+    cache.put(key, store_plots(plots), arr if cache.key == "id" else None)
+    data.extend(use_legend_groups(plots))
+    return
+
+
+def draw_many(geoms, data, style=DEFAULT, name=DEFAULT, legend_group=DEFAULT, show_legend=True, dims=2,
+              merge=True, renderer=DEFAULT, tolerance=None, max_vertices=None, view=None,
+              colors=None, sizes=None, colorscale=None, cmin=None, cmax=None, max_traces=None, parallel=False,
+              workers=None, cache=None, legends=None):
+    """
+    Plot many geometries at once, 2D or 3D.
+
+    The style and name of each geometry is resolved just like plotly_draw2d/3d(...).  Geometries with the same
+    resolved style, name and legend group are merged into a single group, which is plotted under a single
+    legend entry.  Within a group, at most one plot is produced for all the points, one for all the lines,
+    and one to three for all the polygons.  Collections are flattened into their parts.
+
+    Groups are plotted in order of their first geometry.  So the drawing order of overlapping geometries with
+    different styles may differ from plotting them individually.
+
+    :param geoms: List or NumPy object array of Shapely geometries.  None entries are skipped.
+    :param data: List of plotly graph objects.  Graphs are appended to this.
+    :param style:  shapely_plotly Style object.  Overrides any style defined for the geometries.
+    :param name:   Name for the geometries in Plotly plot.  Overrides any name defined for the geometries.
+    :param legend_group   Legend group to use (groups multiple items under a single legend).  Overrides style.
+    :param dims:   2 for 2D plotting (Scatter), 3 for 3D plotting (Scatter3d).
+    :param merge:  If False, geometries are not merged.  Each is plotted individually with plotly_draw2d/3d(...).
+    :param renderer: 2D only.  "svg", "webgl" or "auto".  Overrides style.  See Style.renderer.
+    :param tolerance: Simplify lines and polygons before plotting.  None, "auto" or a number.  "auto" uses the
+                      extent of all the geometries.  See coords.lod_tolerance(...).
+    :param max_vertices: If not None, simplify all the geometries together to at most this many vertices.
+    :param view:   If not None, only plot what is inside this (min_x, min_y, max_x, max_y) rectangle, or
+                   (min_x, min_y, min_z, max_x, max_y, max_z) box.  Geometries outside are skipped, and geometries
+                   crossing the edge are clipped.  With merge=False, geometries are skipped but not clipped.
+                   See coords.in_view(...).
+    :param colors: If not None, a color for each geometry in geoms, either a Plotly color string or a number.
+                   Numbers are mapped to colors with colorscale.  These override the line and marker colors of the
+                   styles (line colors in 3D only), so geometries that differ only by color can share a style, and
+                   be drawn in a single plot.  Requires merge=True.
+    :param sizes:  If not None, a marker size for each geometry in geoms.  Overrides the marker sizes of the styles.
+                   Requires merge=True.
+    :param colorscale: Plotly colorscale for numeric colors.  None uses Plotly's default.
+    :param cmin:   Number mapped to the bottom of the colorscale.  Default is the smallest of colors.
+    :param cmax:   Number mapped to the top of the colorscale.  Default is the largest of colors.
+    :param max_traces: 2D only.  If not None, lines are also colored by colors.  As each 2D line plot has a single
+                   color, colors are quantized into buckets, and each bucket is drawn as separate plots with its own
+                   line color.  The buckets are shared between the groups, and as many are used as keep the number
+                   of plots within max_traces.  A bucket of a group may take up to five plots, e.g. polygons with
+                   holes, lines and points.  Warns if the quantization is visible, or if the plots cannot fit, e.g.
+                   with more groups than max_traces.  See color_buckets(...).
+    :param parallel: If not False, extract coordinates in parallel, in chunks of parallel_chunk_size geometries.
+                   True - In a new pool of worker processes.  Geometries are sent to the workers as WKB, with a
+                          StyleSpec in place of each style.
+                   "threads" - In a new pool of threads.  Clipping and simplifying are also run in chunks.  No
+                               processes are started, so this can be used in web servers.
+                   A concurrent.futures.Executor - In that executor, e.g. to reuse a pool between calls.  A
+                                                   ThreadPoolExecutor is used as for "threads".
+                   Styles, names and legend groups are resolved, and the Plotly plots built, in the calling process,
+                   so the plots are the same as without parallel.  Requires merge=True.
+    :param workers: Number of worker processes or threads for parallel=True or "threads".  None is Python's default
+                    for the pool.
+    :param cache:  If not None, a cache.TraceCache or cache.DiskCache.  If the same geometries were drawn with the
+                   same styles, names and arguments before, their cached plots are reused.  Not used with legends.
+    :param legends: Internal.  If not None, a dictionary shared between several draw_many(...) calls, so that they
+                   share legend entries.  See stream.iter_plots(...).
+    """
+    assert dims in (2, 3)
+
+    if (cache is not None) and (legends is None):
+        cached_draw_many(cache, geoms, data, style, name, legend_group, show_legend, dims, merge, renderer, tolerance,
+                         max_vertices, view, colors, sizes, colorscale, cmin, cmax, max_traces, parallel, workers)
+        return
+
+    geoms, index = as_geometry_array(geoms, return_index=True)
+    if view is not None:
+        geoms, view_index = in_view(geoms, view, return_index=True)
+        index = index[view_index]
+
+    # Colors and sizes are looked up by each vertex's index into the original geoms.
+    geom_index = c_kwargs = None
+    if (colors is not None) or (sizes is not None):
+        assert merge, "colors and sizes require merge=True"
+        geom_index = index
+
+    if colors is not None:
+        colors = np.asarray(colors)
+        assert colors.ndim == 1
+        if (max_traces is not None) and (colorscale is None):
+            # The markers and the line buckets must use the same colorscale.
+            colorscale = default_colorscale
+        # The color range is set from all the colors, including geometries that are not plotted.
+        c_kwargs = color_kwargs(colors, colorscale, cmin, cmax)
+
+    if sizes is not None:
+        sizes = np.asarray(sizes)
+        assert sizes.ndim == 1
+
+    if not merge:
+        assert not parallel, "parallel requires merge=True"
+        tolerance = lod_tolerance(geoms, tolerance, max_vertices)
+        for geom in geoms:
+            if dims == 3:
+                geom.plotly_draw3d(data, style, name, legend_group, show_legend, tolerance=tolerance)
+            else:
+                geom.plotly_draw2d(data, style, name, legend_group, show_legend, renderer=renderer,
+                                   tolerance=tolerance)
+        return
+
+    groups = group_by_info(geoms, style, name, legend_group, show_legend)
+    if legends is not None:
+        groups = [shared_legend(legends, *group) for group in groups]
+
+    with parallel_executor(parallel, workers) as executor:
+        # Clipping and simplifying create new geometries.  Styles and names are looked up from the originals.
+        draw_geoms = map_chunks(executor, clip_to_view, geoms, view)
+        draw_geoms = map_chunks(executor, simplify, draw_geoms, lod_tolerance(draw_geoms, tolerance, max_vertices))
+
+        # Each job is an array of geometries drawn as one group: (geoms, style, name, legend_group, show_legend,
+        # geom_index, line_color).  See stage_plots(...) and draw_plots(...).
+        jobs = []
+        if (max_traces is None) or (colors is None) or (dims == 3):
+            for g_style, g_name, g_show_legend, g_legend_group, indexes in groups:
+                jobs.append((draw_geoms[indexes], g_style, g_name, g_legend_group, g_show_legend,
+                             select(geom_index, indexes), None))
+        else:
+            bucket, bucket_colors = color_buckets(
+                colors, c_kwargs, max_traces, [geom_index[g[4]] for g in groups],
+                [bucket_plots(draw_geoms[g[4]], g[0]) for g in groups])
+            for g_style, g_name, g_show_legend, g_legend_group, indexes in groups:
+                g_geoms, g_index = draw_geoms[indexes], geom_index[indexes]
+                g_bucket = bucket[g_index]
+                g_buckets = np.unique(g_bucket)
+
+                # All the buckets of a group share a single legend entry.
+                if (g_legend_group is None) and (len(g_buckets) > 1):
+                    g_legend_group = unique_legend_group()
+
+                for b in g_buckets:
+                    in_bucket = g_bucket == b
+                    jobs.append((g_geoms[in_bucket], g_style, g_name, g_legend_group, g_show_legend,
+                                 g_index[in_bucket], bucket_colors[b]))
+                    g_show_legend = False
+
+        if executor is not None:
+            job_plots = parallel_plots([(j[0], j[1], j[5]) for j in jobs], dims, executor)
+        else:
+            job_plots = [sum(stage_plots(j[0], j[1], dims, j[5]), []) for j in jobs]
+
+    for (_, j_style, j_name, j_legend_group, j_show_legend, _, j_line_color), plots in zip(jobs, job_plots):
+        draw_plots(plots, data, j_style, j_name, j_legend_group, j_show_legend, dims, renderer, colors, sizes,
+                   c_kwargs, j_line_color)
+
+    return
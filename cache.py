@@ -0,0 +1,356 @@
+"""
+Caching of drawn plots.
+
+Dashboards often redraw the same layers, such as roads or boundaries, for every figure.  A TraceCache passed to
+draw_many(..., cache=...) keeps the plots drawn for a set of geometries, keyed by a fingerprint of the geometries,
+their resolved styles and names, and the draw arguments.  Drawing the same layer again reuses the plots, skipping
+coordinate extraction and plot construction.
+
+TraceCache is a least recently used cache in memory, bounded by the memory taken by the plots' arrays.  DiskCache
+keeps the plots in a directory, so that they survive restarts, and memory-maps their arrays when they are used.
+"""
+
+from __future__ import annotations
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import shapely as sh
+
+from shapely_plotly.plot import new_trace, unique_legend_group
+
+# Prefix of the legend groups generated while drawing plots for the cache.  They are replaced by legend groups of
+# the current legend_scope(...) every time the plots are used.  See use_legend_groups(...).
+cache_legend_prefix = "\0shapely_plotly_cache"
+
+
+def array_digest(values):
+    """
+    A short digest of an array's type, shape and contents, or None for None.
+    """
+    if values is None:
+        return None
+
+    values = np.ascontiguousarray(values)
+    if values.dtype.kind == "O":
+        values = np.array([str(v) for v in values.ravel()])
+    h = hashlib.blake2b(values.data, digest_size=16)
+    return values.dtype.str, values.shape, h.digest()
+
+
+def plot_bytes(obj):
+    """
+    Approximate memory taken by a plot dictionary, counting arrays by their size.
+    """
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return 64 + sum(64 + plot_bytes(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return 64 + sum(8 + plot_bytes(v) for v in obj)
+    if isinstance(obj, str):
+        return 49 + len(obj)
+
+    return 32
+
+
+def wkb_fingerprint(geoms):
+    """
+    Fingerprint of an array of geometries, from a digest of their WKB.  The same in every process.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for wkb in sh.to_wkb(geoms):
+        h.update(wkb)
+    return "wkb", len(geoms), h.digest()
+
+
+def plain_json(obj):
+    """
+    JSON encoding of the NumPy values and Plotly objects in plots and styles.  For json.dumps(..., default=...).
+    """
+    if hasattr(obj, "to_plotly_json"):
+        return obj.to_plotly_json()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+
+def plot_get(plot, key):
+    """
+    A property of a plot, either a graph object or a dictionary.  None if not set.
+    """
+    return plot.get(key) if isinstance(plot, dict) else plot[key]
+
+
+class TraceCache:
+    """
+    A least recently used cache of the plots drawn by draw_many(...).  Thread-safe.
+
+    Cached plots are stored as dictionaries.  A hit returns new dictionaries, or new graph objects if trace
+    validation is on, but the coordinate arrays are shared with the cache.  Do not modify them in place.
+
+    :param max_bytes: Maximum memory taken by the cached plots, in bytes.  Least recently used entries are dropped
+                      to stay within it.  Entries larger than this are not cached.
+    :param key: How geometries are recognized.
+                "wkb" - By a digest of their WKB.  Equal geometries hit, even if they are new objects.  Costs a pass
+                        over the coordinates.
+                "id" - By object identity.  Only the same geometry objects hit.  No coordinates are read.  Entries
+                       hold references to their geometries, so the identities are not reused.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, key="wkb"):
+        assert key in ("wkb", "id"), f"Unknown cache key {repr(key)}"
+        self.max_bytes = max_bytes
+        self.key = key
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.num_bytes = 0
+        self._entries = OrderedDict()  # key -> (plots, num_bytes, refs)
+        self._lock = threading.Lock()
+        return
+
+    def __len__(self):
+        return len(self._entries)
+
+    def fingerprint(self, geoms):
+        """
+        Fingerprint of an array of geometries.  See the key argument.
+        """
+        if self.key == "id":
+            ids = np.fromiter((id(g) for g in geoms), dtype=np.uint64, count=len(geoms))
+            return "id", hashlib.blake2b(ids.data, digest_size=16).digest()
+
+        return wkb_fingerprint(geoms)
+
+    def style_key(self, style):
+        """
+        The part of a key for a style.  The key holds the style, so its identity is not reused while it is cached.
+        The version changes whenever the style or a parent is modified.
+        """
+        return style, style.version
+
+    def get(self, key):
+        """
+        Look up the plot dictionaries for a key, and count a hit or a miss.
+
+        :return: List of plot dictionaries, or None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, plots, refs=None):
+        """
+        Store plot dictionaries, and drop least recently used entries to stay within max_bytes.
+
+        :param plots: List of plot dictionaries.
+        :param refs: Objects kept alive as long as the entry, e.g. the geometries of an identity fingerprint.
+        """
+        num_bytes = sum(plot_bytes(p) for p in plots)
+        if num_bytes > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.num_bytes -= old[1]
+
+            self._entries[key] = (plots, num_bytes, refs)
+            self.num_bytes += num_bytes
+            while self.num_bytes > self.max_bytes:
+                _, (_, old_bytes, _) = self._entries.popitem(last=False)
+                self.num_bytes -= old_bytes
+                self.evictions += 1
+
+        return
+
+    def clear(self):
+        """
+        Drop all entries.  The counters are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.num_bytes = 0
+
+        return
+
+
+class DiskCache:
+    """
+    A cache of the plots drawn by draw_many(...), kept in a directory.  Entries survive restarts, and are shared by
+    all the processes using the directory.
+
+    The key is the same as for TraceCache(key="wkb"), except that styles are recognized by their resolved contents,
+    so that keys are the same in every process.  Each entry is a JSON file with the plots, and a .npy file for each
+    numeric array.  When an entry is used, the arrays are memory-mapped read-only, rather than read.
+
+    Files are written under temporary names and renamed into place, with the JSON file last, so readers never see
+    part of an entry.  Entries are not removed automatically.  See clear().
+
+    :param directory: Directory of the cache files.  Created if needed.
+    """
+
+    # Geometries are recognized by their WKB.  See draw_many(...).
+    key = "wkb"
+
+    def __init__(self, directory):
+        self.directory = os.fspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        return
+
+    def __len__(self):
+        return sum(1 for f in os.listdir(self.directory) if f.endswith(".json"))
+
+    def fingerprint(self, geoms):
+        """
+        Fingerprint of an array of geometries.  See wkb_fingerprint(...).
+        """
+        return wkb_fingerprint(geoms)
+
+    def style_key(self, style):
+        """
+        The part of a key for a style: its resolved components, as JSON.
+        """
+        r = style.resolved()
+        return json.dumps([getattr(r, n) for n in type(r).__slots__ if n not in ("version", "versions")],
+                          sort_keys=True, default=plain_json)
+
+    def entry_path(self, key, suffix):
+        """
+        Path of a file of the entry for a key.  Named by a digest of the key.
+        """
+        name = hashlib.blake2b(repr(key).encode("utf-8"), digest_size=16).hexdigest()
+        return os.path.join(self.directory, name + suffix)
+
+    def write_file(self, path, write):
+        """
+        Write a file under a temporary name, then rename it into place.
+
+        :param write: Function writing the contents to a binary file.
+        """
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+        return
+
+    def get(self, key):
+        """
+        Look up the plot dictionaries for a key, and count a hit or a miss.
+
+        :return: List of plot dictionaries, with memory-mapped arrays, or None.
+        """
+        path = self.entry_path(key, ".json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                plots = json.load(f)["plots"]
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        def load(obj):
+            if isinstance(obj, dict):
+                npy = obj.get("__npy__")
+                if npy is not None:
+                    return np.load(os.path.join(self.directory, npy), mmap_mode="r")
+                return {k: load(v) for k, v in obj.items()}
+            if isinstance(obj, list):
+                return [load(v) for v in obj]
+            return obj
+
+        plots = load(plots)
+        with self._lock:
+            self.hits += 1
+        return plots
+
+    def put(self, key, plots, refs=None):
+        """
+        Write plot dictionaries to the cache.  Numeric arrays are written as .npy files.
+
+        :param plots: List of plot dictionaries.
+        :param refs: Not used.  See TraceCache.put(...).
+        """
+        path = self.entry_path(key, ".json")
+        prefix = os.path.basename(path)[:-len(".json")]
+        arrays = []
+
+        def save(obj):
+            if isinstance(obj, np.ndarray) and (obj.dtype.kind in "biuf"):
+                npy = f"{prefix}_{len(arrays)}.npy"
+                arrays.append((npy, obj))
+                return {"__npy__": npy}
+            if isinstance(obj, dict):
+                return {k: save(v) for k, v in obj.items()}
+            if isinstance(obj, (list, tuple)):
+                return [save(v) for v in obj]
+            return obj
+
+        plots = save(plots)
+        for npy, arr in arrays:
+            self.write_file(os.path.join(self.directory, npy), lambda f: np.save(f, arr, allow_pickle=False))
+
+        text = json.dumps(dict(plots=plots), default=plain_json)
+        self.write_file(path, lambda f: f.write(text.encode("utf-8")))
+        return
+
+    def clear(self):
+        """
+        Remove all the cache files.  The counters are kept.
+        """
+        for f in os.listdir(self.directory):
+            if f.endswith((".json", ".npy")):
+                os.remove(os.path.join(self.directory, f))
+
+        return
+
+
+def store_plots(plots):
+    """
+    Plot dictionaries to cache, from plots drawn in a legend_scope(cache_legend_prefix).
+    """
+    return [dict(p) if isinstance(p, dict) else p.to_plotly_json() for p in plots]
+
+
+def use_legend_groups(plots):
+    """
+    Replace the generated legend groups of plots drawn for the cache, in place, with new legend groups of the
+    current legend_scope(...).  Plots sharing a legend group still share one.
+    """
+    groups = {}
+    for p in plots:
+        group = plot_get(p, "legendgroup")
+        if isinstance(group, str) and group.startswith(cache_legend_prefix):
+            new_group = groups.get(group)
+            if new_group is None:
+                new_group = groups[group] = unique_legend_group()
+            p["legendgroup"] = new_group
+
+    return plots
+
+
+def cached_plots(plots):
+    """
+    New plots from cached plot dictionaries.  Graph objects if trace validation is on, see new_trace(...).
+    """
+    res = []
+    for p in plots:
+        kwargs = dict(p)
+        res.append(new_trace(kwargs.pop("type", "scatter"), **kwargs))
+
+    return use_legend_groups(res)
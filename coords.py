@@ -0,0 +1,447 @@
+"""
+Vectorized coordinate extraction.
+
+Helper functions that turn arrays of Shapely geometries into NumPy coordinate buffers, ready to be handed to
+Plotly.  Separate line strings/rings are joined into a single buffer, with a row of NaN values between them.
+Plotly treats NaN (serialized as null) as a gap, so the lines are not connected.
+
+These functions are internal.  No symbols need be exported.
+"""
+
+from __future__ import annotations
+import numpy as np
+import shapely as sh
+
+# Shapely type ids.  See shapely.get_type_id(...)
+POINT = 0
+LINE_STRING = 1
+LINEAR_RING = 2
+POLYGON = 3
+MULTI_POINT = 4
+
+
+def as_geometry_array(geoms, return_index=False):
+    """
+    Convert a list/tuple/array of geometries into a 1D NumPy object array.  Missing geometries (None) are removed.
+
+    :param geoms: Iterable of Shapely geometries, or NumPy object array.
+    :param return_index: If True, also return the position in geoms of each geometry kept.
+    :return: 1D NumPy object array, or (array, index).
+    """
+    if isinstance(geoms, np.ndarray):
+        arr = geoms.ravel()
+    else:
+        geoms = list(geoms)
+        arr = np.empty(len(geoms), dtype=object)
+        arr[:] = geoms
+
+    index = np.arange(len(arr))
+    missing = sh.is_missing(arr)
+    if missing.any():
+        arr = arr[~missing]
+        index = index[~missing]
+
+    return (arr, index) if return_index else arr
+
+
+def explode(geoms, return_index=False):
+    """
+    Flatten multi-part geometries and geometry collections, recursively, into single part geometries.
+
+    :param geoms: 1D NumPy object array of geometries.
+    :param return_index: If True, also return the index of the geometry in geoms each part came from.
+    :return: 1D NumPy object array of Points, LineStrings, LinearRings and Polygons, or (array, index).
+    """
+    index = np.arange(len(geoms))
+    while (len(geoms) > 0) and (sh.get_type_id(geoms) >= MULTI_POINT).any():
+        geoms, part_index = sh.get_parts(geoms, return_index=True)
+        index = index[part_index]
+
+    return (geoms, index) if return_index else geoms
+
+
+def split_by_type(geoms, return_index=False):
+    """
+    Split single part geometries into points, lines (LineString and LinearRing) and polygons.
+
+    :param geoms: 1D NumPy object array of single part geometries.  See explode(...).
+    :param return_index: If True, also return the positions in geoms of the points, lines and polygons.
+    :return: (points, lines, polygons), each a 1D NumPy object array.  With return_index, a fourth item,
+             (point_index, line_index, polygon_index).
+    """
+    types = sh.get_type_id(geoms)
+    index = (np.flatnonzero(types == POINT),
+             np.flatnonzero((types == LINE_STRING) | (types == LINEAR_RING)),
+             np.flatnonzero(types == POLYGON))
+    points, lines, polygons = (geoms[i] for i in index)
+    return (points, lines, polygons, index) if return_index else (points, lines, polygons)
+
+
+def get_coords(geoms, dims, return_index=False):
+    """
+    Get the coordinates of an array of geometries as a single (N, dims) float64 array.
+
+    For 3D, missing z-coordinates are taken as 0.0.
+
+    :param geoms: 1D NumPy object array of geometries.
+    :param dims: 2 or 3.
+    :param return_index: If True, also return the index of the geometry each coordinate belongs to.
+    :return: coords, or (coords, index)
+    """
+    res = sh.get_coordinates(geoms, include_z=(dims == 3), return_index=return_index)
+    coords = res[0] if return_index else res
+    if dims == 3:
+        z = coords[:, 2]
+        z[np.isnan(z)] = 0.0
+
+    return res
+
+
+def gap_join(coords, index):
+    """
+    Insert a row of NaN values between runs of coordinates belonging to different geometries.
+
+    :param coords: (N, dims) coordinate array, as from get_coords(..., return_index=True).
+    :param index: (N,) geometry index for each coordinate.
+    :return: (N + number of gaps, dims) coordinate array.
+    """
+    if len(coords) == 0:
+        return coords
+
+    breaks = np.flatnonzero(index[1:] != index[:-1]) + 1
+    return np.insert(coords, breaks, np.nan, axis=0)
+
+
+def gap_join_values(values, index):
+    """
+    Insert a value between runs of values belonging to different geometries, to match gap_join(...).  The inserted
+    value repeats the value before the gap.
+
+    :param values: (N,) array with a value for each coordinate.
+    :param index: (N,) geometry index for each coordinate.
+    :return: (N + number of gaps,) array.
+    """
+    if len(values) == 0:
+        return values
+
+    breaks = np.flatnonzero(index[1:] != index[:-1]) + 1
+    return np.insert(values, breaks, values[breaks - 1])
+
+
+def line_coords(lines, dims, values=None):
+    """
+    Coordinates for an array of LineStrings/LinearRings, joined into one buffer with NaN gaps.
+
+    :param lines: 1D NumPy object array of LineStrings or LinearRings.
+    :param dims: 2 or 3.
+    :param values: If not None, an array with a value per line.  The values are expanded to one per coordinate.
+    :return: (N, dims) coordinate array, or (coords, values) with an (N,) array of values.
+    """
+    coords, index = get_coords(lines, dims, return_index=True)
+    if values is None:
+        return gap_join(coords, index)
+
+    return gap_join(coords, index), gap_join_values(values[index], index)
+
+
+def polygon_rings(polygons, return_index=False):
+    """
+    Get the rings of an array of polygons.
+
+    :param polygons: 1D NumPy object array of Polygons.
+    :param return_index: If True, also return the index of the polygon each ring belongs to.
+    :return: (rings, is_exterior) or (rings, is_exterior, index).  rings is a 1D NumPy object array of LinearRings.
+             Each polygon's exterior is followed by its interiors.  is_exterior is a boolean array marking the
+             exterior rings.
+    """
+    rings, poly_index = sh.get_rings(polygons, return_index=True)
+    is_exterior = np.ones(len(rings), dtype=bool)
+    is_exterior[1:] = poly_index[1:] != poly_index[:-1]
+    return (rings, is_exterior, poly_index) if return_index else (rings, is_exterior)
+
+
+def fill_oriented(rings, is_exterior):
+    """
+    Orient rings so Plotly will fill them correctly.  Plotly requires holes to wind in the opposite
+    direction from their exterior.  Exteriors are left as they are, and holes are reversed if needed.
+
+    :param rings: 1D NumPy object array of LinearRings, from polygon_rings(...).
+    :param is_exterior: Boolean array marking exterior rings, from polygon_rings(...).
+    :return: 1D NumPy object array of LinearRings.
+    """
+    ccw = sh.is_ccw(rings)
+
+    # Position of the exterior ring for every ring.
+    exterior_pos = np.maximum.accumulate(np.where(is_exterior, np.arange(len(rings)), 0))
+
+    flip = (~is_exterior) & (ccw == ccw[exterior_pos])
+    if flip.any():
+        rings = rings.copy()
+        rings[flip] = sh.reverse(rings[flip])
+
+    return rings
+
+
+# ------------------------------------------------------------------------
+# Level of detail
+# ------------------------------------------------------------------------
+
+# Target plot width, in pixels, for tolerance="auto".  Detail smaller than extent / lod_pixels is removed.
+lod_pixels = 2000
+
+
+def num_coords(geoms):
+    """
+    Total number of coordinates in a geometry or array of geometries.
+    """
+    return int(np.sum(sh.get_num_coordinates(geoms)))
+
+
+def extent(geoms):
+    """
+    Largest side of the 2D bounding box of a geometry or array of geometries.  0.0 if empty.
+    """
+    if np.size(geoms) == 0:
+        return 0.0
+
+    min_x, min_y, max_x, max_y = sh.total_bounds(geoms)
+    size = max(max_x - min_x, max_y - min_y)
+    return 0.0 if np.isnan(size) else float(size)
+
+
+def lod_tolerance(geoms, tolerance=None, max_vertices=None):
+    """
+    Work out the simplification tolerance for a geometry or array of geometries.
+
+    :param geoms: Shapely geometry, or NumPy object array of geometries.
+    :param tolerance: None - No simplification, unless required by max_vertices.
+                      "auto" - Remove detail smaller than a pixel, with the extent of geoms drawn lod_pixels wide.
+                      Number - Tolerance for shapely.simplify(...), in coordinate units.
+    :param max_vertices: If not None, increase the tolerance until the geometries have at most this many vertices.
+                         Topology is preserved, so very small values may not be reachable.
+    :return: Tolerance as a number, or None for no simplification.
+    """
+    if (tolerance is None) and (max_vertices is None):
+        return None
+
+    size = extent(geoms)
+
+    if tolerance == "auto":
+        tolerance = size / lod_pixels if size > 0.0 else None
+
+    if (max_vertices is None) or (num_coords(geoms) <= max_vertices):
+        return tolerance
+
+    # Double the tolerance until the vertex budget is met.  Beyond the extent, nothing more can be removed.
+    tol = max(tolerance or 0.0, size / max(max_vertices, 1))
+    while (tol < size) and (num_coords(sh.simplify(geoms, tol, preserve_topology=True)) > max_vertices):
+        tol *= 2.0
+
+    return tol if tol > 0.0 else tolerance
+
+
+def simplify(geoms, tolerance):
+    """
+    Simplify a geometry or array of geometries, keeping topology.  See lod_tolerance(...).
+
+    :param geoms: Shapely geometry, or NumPy object array of geometries.
+    :param tolerance: Tolerance as a number, or None for no simplification.
+    :return: Simplified geometries, or geoms itself if tolerance is None.
+    """
+    if not tolerance:
+        return geoms
+
+    return sh.simplify(geoms, tolerance, preserve_topology=True)
+
+
+# ------------------------------------------------------------------------
+# Viewport culling and clipping
+# ------------------------------------------------------------------------
+
+# The clipping rectangle is larger than the view by this fraction of its size on every side.  Edges created by
+# clipping then fall just outside the view, and are not seen when the axes are set to the view.
+view_margin = 0.01
+
+
+def view_bounds(view):
+    """
+    Unpack a view into its bounds, including the clipping margin.  See view_margin.
+
+    :param view: (min_x, min_y, max_x, max_y) rectangle, or (min_x, min_y, min_z, max_x, max_y, max_z) box.
+    :return: (min_x, min_y, max_x, max_y, min_z, max_z).  min_z and max_z are None for a rectangle.
+    """
+    assert len(view) in (4, 6), f"View must be a rectangle or box, not {repr(view)}"
+    if len(view) == 4:
+        min_x, min_y, max_x, max_y = view
+        min_z = max_z = None
+    else:
+        min_x, min_y, min_z, max_x, max_y, max_z = view
+
+    dx = (max_x - min_x) * view_margin
+    dy = (max_y - min_y) * view_margin
+    return min_x - dx, min_y - dy, max_x + dx, max_y + dy, min_z, max_z
+
+
+def in_view(geoms, view, return_index=False):
+    """
+    Select the geometries that intersect a view.  Geometries are not changed, see clip_to_view(...).
+
+    For a 3D box, geometries are selected by their x/y shape, and by the range of their z-coordinates.
+
+    :param geoms: 1D NumPy object array of geometries.
+    :param view: View rectangle or box.  See view_bounds(...).
+    :param return_index: If True, also return the position in geoms of each geometry selected.
+    :return: 1D NumPy object array with the selected geometries, in their original order, or (array, index).
+    """
+    min_x, min_y, max_x, max_y, min_z, max_z = view_bounds(view)
+
+    tree = sh.STRtree(geoms)
+    index = np.sort(tree.query(sh.box(min_x, min_y, max_x, max_y), predicate="intersects"))
+
+    if (min_z is not None) and (len(index) > 0):
+        coords, coord_index = get_coords(geoms[index], 3, return_index=True)
+        z = coords[:, 2]
+        low = np.full(len(index), np.inf)
+        high = np.full(len(index), -np.inf)
+        np.minimum.at(low, coord_index, z)
+        np.maximum.at(high, coord_index, z)
+        index = index[(high >= min_z) & (low <= max_z)]
+
+    return (geoms[index], index) if return_index else geoms[index]
+
+
+def clip_to_view(geoms, view):
+    """
+    Cut geometries that cross the edge of a view to the view rectangle.  Only x and y are clipped.
+
+    :param geoms: 1D NumPy object array of geometries, usually from in_view(...).
+    :param view: View rectangle or box, or None for no clipping.  See view_bounds(...).
+    :return: 1D NumPy object array of geometries.  Geometries inside the view are unchanged.
+    """
+    if (view is None) or (len(geoms) == 0):
+        return geoms
+
+    min_x, min_y, max_x, max_y, _, _ = view_bounds(view)
+
+    crossing = ~sh.contains_properly(sh.box(min_x, min_y, max_x, max_y), geoms)
+    if crossing.any():
+        geoms = geoms.copy()
+        geoms[crossing] = sh.clip_by_rect(geoms[crossing], min_x, min_y, max_x, max_y)
+
+    return geoms
+
+
+# ------------------------------------------------------------------------
+# Triangulation
+# ------------------------------------------------------------------------
+
+def polygon_axes(polygons):
+    """
+    The axis each polygon faces most, from the normal of its exterior by Newell's method.
+
+    :param polygons: 1D NumPy object array of Polygons.
+    :return: 1D int array.  0 - Faces along z, e.g. a flat roof.  Also for degenerate polygons.  1 - Along y, e.g. an
+             x-z wall.  2 - Along x, e.g. a y-z wall.
+    """
+    coords, index = get_coords(sh.get_exterior_ring(polygons), 3, return_index=True)
+    same = index[:-1] == index[1:]
+    p, q, index = coords[:-1][same], coords[1:][same], index[:-1][same]
+
+    normal = np.stack([
+        np.bincount(index, (p[:, 0] - q[:, 0]) * (p[:, 1] + q[:, 1]), minlength=len(polygons)),
+        np.bincount(index, (p[:, 2] - q[:, 2]) * (p[:, 0] + q[:, 0]), minlength=len(polygons)),
+        np.bincount(index, (p[:, 1] - q[:, 1]) * (p[:, 2] + q[:, 2]), minlength=len(polygons))], axis=1)
+    return np.argmax(np.abs(normal), axis=1)
+
+
+# Coordinate orders that turn each axis of polygon_axes(...) into z.
+axis_orders = ([0, 1, 2], [0, 2, 1], [1, 2, 0])
+
+
+def triangulate(polygons):
+    """
+    Triangulate an array of polygons, holes included, into a single triangle mesh.
+
+    Uses shapely.constrained_delaunay_triangles(...), which needs Shapely 2.1.  With older versions, the polygon
+    vertices are Delaunay triangulated, and the triangles with centers outside the polygon are removed.  This is only
+    approximate for concave polygons.
+
+    Shapely triangulates in the x-y plane.  Polygons that are not valid there, such as vertical walls, are
+    triangulated with their coordinates swapped, so that the axis they face most becomes z.  See polygon_axes(...).
+
+    :param polygons: 1D NumPy object array of Polygons.
+    :return: (vertices, faces).  vertices is a (N, 3) float64 array.  Missing z-coordinates are 0.0.  Vertices shared
+             by several triangles are stored once.  faces is a (M, 3) int32 array of vertex indexes.
+    """
+    axes = np.zeros(len(polygons), dtype=int)
+    upright = ~sh.is_valid(polygons)
+    if upright.any():
+        axes[upright] = polygon_axes(polygons[upright])
+
+    # Each triangle is a closed ring of 4 coordinates.
+    coords = []
+    for axis, order in enumerate(axis_orders):
+        a_polygons = polygons[axes == axis]
+        if len(a_polygons) == 0:
+            continue
+        if axis != 0:
+            a_polygons = sh.transform(a_polygons, lambda c: c[:, order], include_z=True)
+
+        if hasattr(sh, "constrained_delaunay_triangles"):
+            triangles = sh.get_parts(sh.constrained_delaunay_triangles(a_polygons))
+        else:
+            triangles, poly_index = sh.get_parts(sh.delaunay_triangles(a_polygons), return_index=True)
+            triangles = triangles[sh.within(sh.centroid(triangles), a_polygons[poly_index])]
+
+        coords.append(get_coords(triangles, 3)[:, np.argsort(order)])
+
+    coords = np.concatenate(coords) if coords else np.empty((0, 3))
+    vertices, index = np.unique(coords, axis=0, return_inverse=True)
+    faces = index.reshape(-1, 4)[:, 0:3].astype(np.int32)
+    return vertices, faces
+
+
+# ------------------------------------------------------------------------
+# Output precision
+# ------------------------------------------------------------------------
+
+def round_coords(values, decimals=None, digits=None):
+    """
+    Round coordinates, so that they are written to JSON with fewer characters.
+
+    :param values: NumPy float array.  NaN values are kept.
+    :param decimals: If not None, round to this many decimal places.  Negative values round to tens, hundreds, etc.
+    :param digits: If not None, round to this many significant digits.
+    :return: Rounded float64 array.
+    """
+    if decimals is not None:
+        values = np.round(values, decimals)
+
+    if digits is not None:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            magnitude = np.floor(np.log10(np.abs(values)))
+        magnitude[~np.isfinite(magnitude)] = 0.0
+        scale = 10.0 ** (digits - 1 - magnitude)
+        values = np.round(values * scale) / scale
+
+    return values
+
+
+def auto_origin(mins, maxs):
+    """
+    A round origin near the lower corner of a bounding box, such that coordinates relative to it are short.
+
+    Each axis is rounded down to a multiple of the power of ten just above the axis' extent.  E.g. for x from
+    4512345.1 to 4513012.7, the origin is 4512000.0.
+
+    :param mins: Minimum coordinate of each axis.
+    :param maxs: Maximum coordinate of each axis.
+    :return: Tuple, with the origin on each axis.
+    """
+    origin = []
+    for lo, hi in zip(mins, maxs):
+        size = hi - lo
+        step = 10.0 ** (np.floor(np.log10(size)) + 1) if size > 0.0 else 1.0
+        origin.append(float(np.floor(lo / step) * step))
+
+    return tuple(origin)
@@ -20,18 +20,9 @@ start_color = (0, 50, 250)
 end_color = (20, 255, 20)
 
 
-def fade_colors(c1, c2, fade):
-    nfade = 1.0 - fade
-    x = tuple(int(c1[i] * nfade + c2[i] * fade + 0.4) for i in range(3))
-    return rgb(*x)
-
-
-arc_styles = tuple(
-    sh2pl.Style(line_style=dict(
-        color=fade_colors(start_color, end_color, i * 0.01),
-        width=6
-    ))
-    for i in range(101))
+# A single style for all the arcs.  The arcs are colored by draw_many(...) below.
+arc_style = sh2pl.Style(line_style=dict(width=6))
+arc_colorscale = [[0.0, rgb(*start_color)], [1.0, rgb(*end_color)]]
 
 num_grains = 4000
 num_arcs = 200
@@ -85,7 +76,7 @@ def interpolate_start_end(s, e):
 
 # Starting latitude bases.  Except it is flipped/shifted below.
 lat_bases = nprnd.uniform(0.0, pi / 2, size=num_arcs)
-arc_style_is = (lat_bases / (pi / 2) * 100 + 0.5).astype(int)
+arc_colors = lat_bases / (pi / 2)  # Color by the starting latitude, 0.0 to 1.0
 
 # The end of the arc is beyond the start.
 lat_ends = lat_bases + nprnd.uniform(0.0, arc_incl, size=num_arcs)
@@ -121,23 +112,9 @@ arc_points[:, :, 0] = np.cos(long_arrays) * plane_ds  # X : Distance along plane
 arc_points[:, :, 1] = np.sin(long_arrays) * plane_ds  # Y : Distance along plane * sin of longitude.
 arc_points[:, :, 2] = np.sin(lat_arrays) * d_arrays  # Z : Distance from center * sin of latitude.
 
-# Plot the arcs.
-
-name = "Planet"
-
-for arc in range(num_arcs):
-    # Get the x,y,z coordinates
-    arc_geom_p = arc_points[:, arc, :]
-
-    # Build the arc geometry
-    arc_geom = shp.LineString(arc_geom_p)
-
-    # Get the style (color) for the line.
-    arc_style_i = arc_style_is[arc]
-    arc_style = arc_styles[arc_style_i]
-
-    # Plot it
-    arc_geom.plotly_draw3d(plot_data, style=arc_style,
-                           name=f'{name}_t{arc}', legend_group="PLanetLG", show_legend=(arc == 0))
+# Plot the arcs.  All the arcs are drawn by a single Scatter3d, colored per vertex by arc_colors.
+arcs = shp.linestrings(arc_points.transpose((1, 0, 2)))
+sh2pl.draw_many(arcs, plot_data, style=arc_style, name="Planet", dims=3,
+                colors=arc_colors, colorscale=arc_colorscale, cmin=0.0, cmax=1.0)
 
 sh2pl.show3d(plot_data)
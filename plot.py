@@ -6,27 +6,299 @@ This file defines the plotting functions for different Shapely objects.
 """
 
 from __future__ import annotations
+import base64
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+import numpy as np
 import shapely as sh
-import plotly.graph_objects as graph
 
 from shapely_plotly import DEFAULT, resolve_info
-import random as rnd
+from shapely_plotly.coords import (
+    get_coords, line_coords, polygon_rings, fill_oriented, lod_tolerance, simplify, triangulate,
+    round_coords, auto_origin
+)
 
-# Used to generate unique legend group IDs
-group_index = 0
+
+class LegendGroups:
+    """
+    Allocator of legend group IDs, "<prefix>_0", "<prefix>_1", ...  Thread-safe.  See legend_scope(...).
+    """
+
+    def __init__(self, prefix="shapely_plotly"):
+        self.prefix = prefix
+        self._next = 0
+        self._lock = threading.Lock()
+        return
+
+    def new_group(self):
+        """
+        Allocate the next legend group ID.
+        """
+        with self._lock:
+            idx = self._next
+            self._next += 1
+
+        return f"{self.prefix}_{idx}"
+
+
+# Used to generate unique legend group IDs outside of any legend_scope(...).  The prefix differs from the default of
+# legend_scope(...), so unscoped IDs never collide with scoped ones.
+global_legend_groups = LegendGroups("shapely_plotly_g")
+
+# The allocator of the current legend_scope(...).  Context variables are separate for each thread and asyncio task.
+legend_groups = ContextVar("shapely_plotly_legend_groups", default=global_legend_groups)
 
 
 def unique_legend_group():
     """
     Generate a unique legend group name.
 
-    This consists of an incrementing index, and a random 64b number.
+    This consists of a prefix and an incrementing index, from the allocator of the current legend_scope(...).
+    Outside of a scope, the index is shared by the whole process.
+    """
+    return legend_groups.get().new_group()
+
+
+@contextmanager
+def legend_scope(prefix="shapely_plotly"):
+    """
+    Number the legend groups generated within the context from 0, e.g. for each figure.  Drawing the same
+    geometries in a new scope then gives identical plots, which can be cached or compared.
+
+    Scopes are separate for each thread and asyncio task.  Legend group IDs are only unique within a scope, so
+    give each scope a different prefix if their plots are combined in one figure.
+
+    :param prefix: Prefix of the legend group IDs.
+    """
+    token = legend_groups.set(LegendGroups(prefix))
+    try:
+        yield
+    finally:
+        legend_groups.reset(token)
+
+    return
+
+
+# ------------------------------------------------------------------------
+# Plot construction
+# ------------------------------------------------------------------------
+
+# If False, the draw functions append plain dictionaries to the plot data instead of Plotly graph objects.
+# This skips Plotly's property validation, which can take most of the time for large plots.
+validate_traces = True
+
+# Names of the graph object classes, in plotly.graph_objects, for each trace type.
+trace_classes = {
+    "scatter": "Scatter",
+    "scattergl": "Scattergl",
+    "scatter3d": "Scatter3d",
+    "mesh3d": "Mesh3d"
+}
+
+
+def plotly_graph():
+    """
+    Internal function.  The plotly.graph_objects module, imported on first use.
+
+    Importing plotly.graph_objects takes a large part of a second, so it is only done when the first graph object is
+    built or a figure is shown.  Plotting in fast mode and the streaming writers never import it.
+    """
+    import plotly.graph_objects
+    return plotly.graph_objects
+
+
+def trace_class(trace_type):
+    """
+    Internal function.  The Plotly graph object class of a trace type.  See trace_classes.
+    """
+    return getattr(plotly_graph(), trace_classes[trace_type])
+
+
+def set_trace_validation(validate):
+    """
+    Select how the draw functions build plots.
+
+    :param validate: True (the default) - Plots are Plotly graph objects, e.g. plotly.graph_objects.Scatter.
+                                          Plotly validates all properties when the plots are built.
+                     False - Plots are plain dictionaries, e.g. {"type": "scatter", "x": ..., ...}.
+                             Nothing is validated.  Much faster for large numbers of plots.  The dictionaries are
+                             accepted by show2d/show3d and Plotly itself.
+    """
+    global validate_traces
+    validate_traces = validate
+    return
+
+
+def new_trace(trace_type, **kwargs):
+    """
+    Build a plot.  Either a Plotly graph object or a plain dictionary.  See set_trace_validation(...).
+
+    :param trace_type: Plotly trace type.  "scatter", "scattergl", "scatter3d" or "mesh3d".
+    :param kwargs:  Keyword arguments for the graph object.  None values are left unset.
+    """
+    if validate_traces:
+        return trace_class(trace_type)(**kwargs)
+
+    trace = {k: v for k, v in kwargs.items() if v is not None}
+    trace["type"] = trace_type
+    return trace
+
+
+def trace_type(trace):
+    """
+    Get the Plotly trace type of a plot, either a graph object or a dictionary.
+    """
+    if isinstance(trace, dict):
+        return trace.get("type", "scatter")
+
+    return trace.plotly_name
+
+
+# ------------------------------------------------------------------------
+# 2D renderers
+# ------------------------------------------------------------------------
+
+# Minimum number of points in a 2D plot before the "auto" renderer switches from SVG to WebGL.
+webgl_threshold = 10000
+
+
+def has_gaps(x):
+    """
+    Check if coordinates have gaps, either NaN or None.  x may be a NumPy array, or a list or tuple from a Plotly
+    plot.
+    """
+    try:
+        return bool(np.isnan(np.asarray(x, dtype=float)).any())
+    except (TypeError, ValueError):
+        return any(v is None for v in x)
+
+
+def use_webgl(renderer, x, fill):
+    """
+    Decide if a 2D plot is rendered with WebGL (Scattergl) or SVG (Scatter).
+
+    :param renderer: "svg", "webgl" or "auto".  See Style.renderer.
+    :param x: Array of x-coordinates for the plot.
+    :param fill: Plotly fill mode for the plot.
+    """
+    if renderer == "svg":
+        return False
+
+    assert renderer in ("webgl", "auto"), f"Unknown renderer {repr(renderer)}"
+
+    if (renderer == "auto") and (len(x) < webgl_threshold):
+        return False
+
+    if (fill is not None) and has_gaps(x):
+        # Scattergl cannot fill multiple rings (e.g. polygons with holes) in a single plot.
+        return False
+
+    return True
+
+
+def scatter2d(renderer, **kwargs):
+    """
+    Build a 2D scatter plot.  Either a Scatter or Scattergl, depending on the renderer.  See use_webgl(...).
+    Plots using a Plotly feature that Scattergl does not support, e.g. a spline line shape, stay SVG.
+
+    :param renderer: "svg", "webgl" or "auto".
+    :param kwargs:  Keyword arguments for Scatter(...)/Scattergl(...).
+    """
+    if use_webgl(renderer, kwargs["x"], kwargs.get("fill")):
+        try:
+            return new_trace("scattergl", **kwargs)
+        except ValueError:
+            # Not supported by Scattergl.  See rerender2d(...).
+            pass
+
+    return new_trace("scatter", **kwargs)
+
+
+# ------------------------------------------------------------------------
+# Per-point colors and sizes
+# ------------------------------------------------------------------------
+
+def is_numeric(values):
     """
-    global group_index
-    idx = group_index
-    group_index += 1
-    legend_group = f"shapely_plotly_{idx}_{rnd.randrange(0, 1 << 64)}"
-    return legend_group
+    True if a NumPy array holds numbers, rather than color strings.
+    """
+    return values.dtype.kind in "biuf"
+
+
+def color_kwargs(colors, colorscale=None, cmin=None, cmax=None):
+    """
+    Plotly color keyword arguments for an array of color values.
+
+    :param colors: 1D NumPy array.  Either Plotly color strings, or numbers that are mapped to colors with
+                   colorscale.
+    :param colorscale: Plotly colorscale for numeric values.  None uses Plotly's default.
+    :param cmin: Value mapped to the bottom of the colorscale.  Default is the smallest value.
+    :param cmax: Value mapped to the top of the colorscale.  Default is the largest value.
+    :return: Keyword arguments for a Plotly line or marker, other than color.
+    """
+    if not is_numeric(colors):
+        return {}
+
+    kwargs = dict(cmin=np.nanmin(colors) if cmin is None else cmin,
+                  cmax=np.nanmax(colors) if cmax is None else cmax)
+    if colorscale is not None:
+        kwargs["colorscale"] = colorscale
+
+    return kwargs
+
+
+def style_dict(line_style):
+    """
+    A Plotly line or marker style as a dictionary.
+    """
+    if hasattr(line_style, "to_plotly_json"):
+        return line_style.to_plotly_json()
+
+    return dict(line_style)
+
+
+def array_style(line_style, colors=None, sizes=None, c_kwargs=None):
+    """
+    A copy of a Plotly line or marker style, with arrays of colors and sizes.
+
+    :param line_style: Plotly line or marker style.
+    :param colors: None, or 1D NumPy array of colors, see color_kwargs(...).
+    :param sizes: None, or 1D NumPy array of sizes.  Markers only.
+    :param c_kwargs: color_kwargs(...) for colors.
+    :return: Dictionary.
+    """
+    res = style_dict(line_style)
+    if colors is not None:
+        res.update(c_kwargs, color=colors if is_numeric(colors) else colors.tolist())
+    if sizes is not None:
+        res["size"] = sizes
+
+    return res
+
+
+def point_marker(marker_style, num_points, colors=None, sizes=None, colorscale=None, cmin=None, cmax=None):
+    """
+    The marker style for plotting points, with optional per-point colors and sizes.
+
+    :param marker_style: Plotly marker style.
+    :param num_points: Number of points plotted.
+    :param colors: None, or a color for each point.  See color_kwargs(...).
+    :param sizes: None, or a marker size for each point.
+    :return: marker_style if there are no colors or sizes.  Otherwise, a new dictionary.
+    """
+    if (colors is None) and (sizes is None):
+        return marker_style
+
+    if colors is not None:
+        colors = np.asarray(colors)
+        assert colors.shape == (num_points,)
+    if sizes is not None:
+        sizes = np.asarray(sizes)
+        assert sizes.shape == (num_points,)
+
+    c_kwargs = None if colors is None else color_kwargs(colors, colorscale, cmin, cmax)
+    return array_style(marker_style, colors, sizes, c_kwargs)
 
 
 # ------------------------------------------------------------------------
@@ -35,7 +307,8 @@ def unique_legend_group():
 
 
 # shapely Point
-def plot_point3d(sh_point, data, style=DEFAULT, name=DEFAULT, legend_group=DEFAULT, show_legend=True):
+def plot_point3d(sh_point, data, style=DEFAULT, name=DEFAULT, legend_group=DEFAULT, show_legend=True,
+                 tolerance=None):
     """
     Plot point - 3D.
 
@@ -44,20 +317,19 @@ def plot_point3d(sh_point, data, style=DEFAULT, name=DEFAULT, legend_group=DEFAU
     :param style:  shapely_plotly Style object.  Overrides any style defined for sh_point.
     :param name:   Name for the object in Plotly plot.  Overrides any name defined for the sh_point.
     :param legend_group   Legend group to use (groups multiple items under a single legend).  Overrides style.
+    :param tolerance: Ignored.  Points are never simplified.
     """
 
-    if sh_point.has_z:
-        z = sh_point.z
-    else:
-        z = 0.0
+    coords = get_coords(sh_point, 3)
 
     style, name, show_legend, legend_group = resolve_info(sh_point, style, name, legend_group, show_legend)
 
-    scat = graph.Scatter3d(x=[sh_point.x], y=[sh_point.y], z=[z],
-                           marker=style.point_style,
-                           name=name, showlegend=show_legend, legendgroup=legend_group,
-                           mode="markers",
-                           **style.scatter_kwargs)
+    scat = new_trace("scatter3d",
+                     x=coords[:, 0], y=coords[:, 1], z=coords[:, 2],
+                     marker=style.point_style,
+                     name=name, showlegend=show_legend, legendgroup=legend_group,
+                     mode="markers",
+                     **style.scatter_kwargs)
 
     data.append(scat)
     return
@@ -67,7 +339,8 @@ sh.Point.plotly_draw3d = plot_point3d
 
 
 # shapely Point
-def plot_point2d(sh_point, data, style=DEFAULT, name=DEFAULT, legend_group=DEFAULT, show_legend=True):
+def plot_point2d(sh_point, data, style=DEFAULT, name=DEFAULT, legend_group=DEFAULT, show_legend=True,
+                 renderer=DEFAULT, tolerance=None):
     """
     Plot point - 2D.
 
@@ -76,16 +349,23 @@ def plot_point2d(sh_point, data, style=DEFAULT, name=DEFAULT, legend_group=DEFAU
     :param style:  shapely_plotly Style object.  Overrides any style defined for sh_point.
     :param name:   Name for the object in Plotly plot.  Overrides any name defined for the sh_point.
     :param legend_group   Legend group to use (groups multiple items under a single legend).  Overrides style.
+    :param renderer: "svg", "webgl" or "auto".  Overrides style.  See Style.renderer.
+    :param tolerance: Ignored.  Points are never simplified.
     """
 
+    coords = get_coords(sh_point, 2)
+
     style, name, show_legend, legend_group = resolve_info(sh_point, style, name, legend_group, show_legend)
+    if renderer is DEFAULT:
+        renderer = style.renderer
 
     assert style.point_style is not None
-    scat = graph.Scatter(x=[sh_point.x], y=[sh_point.y],
-                         marker=style.point_style,
-                         name=name, showlegend=show_legend, legendgroup=legend_group,
-                         mode="markers",
-                         **style.scatter_kwargs)
+    scat = scatter2d(renderer,
+                     x=coords[:, 0], y=coords[:, 1],
+                     marker=style.point_style,
+                     name=name, showlegend=show_legend, legendgroup=legend_group,
+                     mode="markers",
+                     **style.scatter_kwargs)
 
     data.append(scat)
     return
@@ -108,7 +388,7 @@ sh.Point.plotly_draw2d = plot_point2d
 # With MultiPolygon and GeometryCollection, the contained items are other geometries, including
 # possibly nested collections in the case of GeometryCollection.  These are also always plotted as single
 # items.  All contained elements are plotted with the collection's style, and all are associated with the
-# same legend entry.
+# same legend entry.  The polygons of a MultiPolygon are plotted together, like a single polygon.
 #
 # It turns out that shapely does not store the actual Python objects that represent the collection's
 # geometries.  The collections will create new Python objects everytime the geometries are extracted.
@@ -121,7 +401,8 @@ sh.Point.plotly_draw2d = plot_point2d
 # suitable Python container, and plot them individually.
 
 # shaeply MultiPoint
-def plot_multipoint3d(sh_multipoint, data, style=DEFAULT, name=DEFAULT, legend_group=DEFAULT, show_legend=True):
+def plot_multipoint3d(sh_multipoint, data, style=DEFAULT, name=DEFAULT, legend_group=DEFAULT, show_legend=True,
+                      tolerance=None, colors=None, sizes=None, colorscale=None, cmin=None, cmax=None):
     """
     Plot multi-point - 3D.
 
@@ -130,24 +411,29 @@ def plot_multipoint3d(sh_multipoint, data, style=DEFAULT, name=DEFAULT, legend_g
     :param style:  shapely_plotly Style object.  Overrides any style defined for sh_multipoint.
     :param name:   Name for the object in Plotly plot.  Overrides any name defined for the sh_multipoint.
     :param legend_group   Legend group to use (groups multiple items under a single legend).  Overrides style.
+    :param tolerance: Ignored.  Points are never simplified.
+    :param colors: If not None, a color for each point, either a Plotly color string or a number.  Numbers are mapped
+                   to colors with colorscale.  Overrides the point style's color.
+    :param sizes:  If not None, a marker size for each point.  Overrides the point style's size.
+    :param colorscale: Plotly colorscale for numeric colors.  None uses Plotly's default.
+    :param cmin:   Number mapped to the bottom of the colorscale.  Default is the smallest of colors.
+    :param cmax:   Number mapped to the top of the colorscale.  Default is the largest of colors.
     """
 
-    points = sh_multipoint.geoms
-
     style, name, show_legend, legend_group = resolve_info(sh_multipoint, style, name, legend_group, show_legend)
 
     # Plot as a single scatter graph
-    xs = [p.x for p in points]
-    ys = [p.y for p in points]
-    zs = [p.z if p.has_z else 0 for p in points]
+    coords = get_coords(sh_multipoint, 3)
 
     assert style.point_style is not None
-
-    scat = graph.Scatter3d(x=xs, y=ys, z=zs,
-                           marker=style.point_style,
-                           name=name, showlegend=show_legend, legendgroup=legend_group,
-                           mode="markers",
-                           **style.scatter_kwargs)
+    marker = point_marker(style.point_style, len(coords), colors, sizes, colorscale, cmin, cmax)
+
+    scat = new_trace("scatter3d",
+                     x=coords[:, 0], y=coords[:, 1], z=coords[:, 2],
+                     marker=marker,
+                     name=name, showlegend=show_legend, legendgroup=legend_group,
+                     mode="markers",
+                     **style.scatter_kwargs)
     data.append(scat)
     return
 
@@ -155,7 +441,9 @@ def plot_multipoint3d(sh_multipoint, data, style=DEFAULT, name=DEFAULT, legend_g
 sh.MultiPoint.plotly_draw3d = plot_multipoint3d
 
 
-def plot_multipoint2d(sh_multipoint, data, style=DEFAULT, name=DEFAULT, legend_group=DEFAULT, show_legend=True):
+def plot_multipoint2d(sh_multipoint, data, style=DEFAULT, name=DEFAULT, legend_group=DEFAULT, show_legend=True,
+                      renderer=DEFAULT, tolerance=None, colors=None, sizes=None, colorscale=None, cmin=None,
+                      cmax=None):
     """
     Plot multi-point - 2D.
 
@@ -164,20 +452,30 @@ def plot_multipoint2d(sh_multipoint, data, style=DEFAULT, name=DEFAULT, legend_g
     :param style:  shapely_plotly Style object.  Overrides any style defined for sh_multipoint.
     :param name:   Name for the object in Plotly plot.  Overrides any name defined for the sh_multipoint.
     :param legend_group   Legend group to use (groups multiple items under a single legend).  Overrides style.
+    :param renderer: "svg", "webgl" or "auto".  Overrides style.  See Style.renderer.
+    :param tolerance: Ignored.  Points are never simplified.
+    :param colors: If not None, a color for each point.  See plot_multipoint3d(...).
+    :param sizes:  If not None, a marker size for each point.
+    :param colorscale: Plotly colorscale for numeric colors.
+    :param cmin:   Number mapped to the bottom of the colorscale.
+    :param cmax:   Number mapped to the top of the colorscale.
     """
 
-    points = sh_multipoint.geoms
-    xs = [p.x for p in points]
-    ys = [p.y for p in points]
+    coords = get_coords(sh_multipoint, 2)
 
     style, name, show_legend, legend_group = resolve_info(sh_multipoint, style, name, legend_group, show_legend)
-    assert style.point_style is not None
+    if renderer is DEFAULT:
+        renderer = style.renderer
 
-    scat = graph.Scatter(x=xs, y=ys,
-                         marker=style.point_style,
-                         name=name, showlegend=show_legend, legendgroup=legend_group,
-                         mode="markers",
-                         **style.scatter_kwargs)
+    assert style.point_style is not None
+    marker = point_marker(style.point_style, len(coords), colors, sizes, colorscale, cmin, cmax)
+
+    scat = scatter2d(renderer,
+                     x=coords[:, 0], y=coords[:, 1],
+                     marker=marker,
+                     name=name, showlegend=show_legend, legendgroup=legend_group,
+                     mode="markers",
+                     **style.scatter_kwargs)
     data.append(scat)
     return
 
@@ -216,11 +514,13 @@ def __i_plot_lines_style_info(geom, style, name, legend_group, show_legend, as_h
     return mode, line_style, marker_style, name, show_legend, legend_group, style
 
 
-def __i_plot_lines3d(geom, xs, ys, zs, data, style, name, legend_group, show_legend, as_hole):
+def __i_plot_lines3d(geom, coords, data, style, name, legend_group, show_legend, as_hole):
     """
     Internal function.  Get style for lines and plot them, 3D.
+
+    coords is a (N, 3) array of coordinates.  Rows of NaN separate disconnected lines.
     """
-    if len(xs) == 0:
+    if len(coords) == 0:
         # Empty line
         return
 
@@ -233,21 +533,24 @@ def __i_plot_lines3d(geom, xs, ys, zs, data, style, name, legend_group, show_leg
         # Invisible
         return
 
-    scat = graph.Scatter3d(x=xs, y=ys, z=zs,
-                           line=line_style,
-                           marker=marker_style,
-                           name=name, showlegend=show_legend, legendgroup=legend_group,
-                           mode=mode,
-                           **style.scatter_kwargs)
+    scat = new_trace("scatter3d",
+                     x=coords[:, 0], y=coords[:, 1], z=coords[:, 2],
+                     line=line_style,
+                     marker=marker_style,
+                     name=name, showlegend=show_legend, legendgroup=legend_group,
+                     mode=mode,
+                     **style.scatter_kwargs)
     data.append(scat)
     return
 
 
-def __i_plot_lines2d(geom, xs, ys, data, style, name, legend_group, show_legend, as_hole):
+def __i_plot_lines2d(geom, coords, data, style, name, legend_group, show_legend, as_hole, renderer):
     """
     Internal function.  Get style for lines and plot them, 2D.
+
+    coords is a (N, 2) array of coordinates.  Rows of NaN separate disconnected lines.
     """
-    if len(xs) == 0:
+    if len(coords) == 0:
         # Empty line
         return
 
@@ -258,18 +561,22 @@ def __i_plot_lines2d(geom, xs, ys, data, style, name, legend_group, show_legend,
         # Invisible
         return
 
-    scat = graph.Scatter(x=xs, y=ys,
-                         line=line_style,
-                         marker=marker_style,
-                         name=name, showlegend=show_legend, legendgroup=legend_group,
-                         mode=mode,
-                         **style.scatter_kwargs)
+    if renderer is DEFAULT:
+        renderer = style.renderer
+
+    scat = scatter2d(renderer,
+                     x=coords[:, 0], y=coords[:, 1],
+                     line=line_style,
+                     marker=marker_style,
+                     name=name, showlegend=show_legend, legendgroup=legend_group,
+                     mode=mode,
+                     **style.scatter_kwargs)
     data.append(scat)
     return
 
 
 def plot_line_string3d(sh_line_string, data, style=DEFAULT,
-                       name=DEFAULT, legend_group=DEFAULT, show_legend=True):
+                       name=DEFAULT, legend_group=DEFAULT, show_legend=True, tolerance=None, max_vertices=None):
     """
     Plot line String/Ring - 3D.
 
@@ -278,31 +585,21 @@ def plot_line_string3d(sh_line_string, data, style=DEFAULT,
     :param style:  shapely_plotly Style object.  Overrides any style defined for sh_line_string.
     :param name:   Name for the object in Plotly plot.  Overrides any name defined for the sh_line_string.
     :param legend_group   Legend group to use (groups multiple items under a single legend).  Overrides style.
+    :param tolerance: Simplify before plotting.  None, "auto" or a number.  See coords.lod_tolerance(...).
+    :param max_vertices: If not None, simplify to at most this many vertices.  See coords.lod_tolerance(...).
     """
+    tolerance = lod_tolerance(sh_line_string, tolerance, max_vertices)
     __i_plot_line_string3d(sh_line_string, data, style,
-                           name, legend_group, show_legend, as_hole=False)
+                           name, legend_group, show_legend, as_hole=False, tolerance=tolerance)
 
 
 # shapely LineString
 def __i_plot_line_string3d(sh_line_string, data, style,
-                           name, legend_group, show_legend, as_hole):
-    coords = sh_line_string.coords
-    n = len(coords)
-    xs = [None] * n
-    ys = [None] * n
-    if sh_line_string.has_z:
-        zs = [None] * n
-        for i, c in enumerate(coords):
-            xs[i] = c[0]
-            ys[i] = c[1]
-            zs[i] = c[2]
-    else:
-        zs = [0.0] * n
-        for i, c in enumerate(coords):
-            xs[i] = c[0]
-            ys[i] = c[1]
+                           name, legend_group, show_legend, as_hole, tolerance=None):
+    # The simplified line is a new object, so the original is kept for looking up the style and name.
+    coords = get_coords(simplify(sh_line_string, tolerance), 3)
 
-    __i_plot_lines3d(sh_line_string, xs, ys, zs, data, style, name, legend_group, show_legend, as_hole)
+    __i_plot_lines3d(sh_line_string, coords, data, style, name, legend_group, show_legend, as_hole)
     return
 
 
@@ -310,7 +607,7 @@ sh.LineString.plotly_draw3d = plot_line_string3d
 
 
 def plot_line_string2d(sh_line_string, data, style=DEFAULT, name=DEFAULT, legend_group=DEFAULT,
-                       show_legend=True, as_hole=False):
+                       show_legend=True, as_hole=False, renderer=DEFAULT, tolerance=None, max_vertices=None):
     """
     Plot line String/Ring - 2D.
 
@@ -319,14 +616,15 @@ def plot_line_string2d(sh_line_string, data, style=DEFAULT, name=DEFAULT, legend
     :param style:  shapely_plotly Style object.  Overrides any style defined for sh_line_string.
     :param name:   Name for the object in Plotly plot.  Overrides any name defined for the sh_line_string.
     :param legend_group   Legend group to use (groups multiple items under a single legend).  Overrides style.
+    :param renderer: "svg", "webgl" or "auto".  Overrides style.  See Style.renderer.
+    :param tolerance: Simplify before plotting.  None, "auto" or a number.  See coords.lod_tolerance(...).
+    :param max_vertices: If not None, simplify to at most this many vertices.  See coords.lod_tolerance(...).
     """
-    coords = sh_line_string.coords
-    n = len(coords)
-    xs, ys = sh_line_string.xy
-    xs = list(xs)
-    ys = list(ys)
+    # The simplified line is a new object, so the original is kept for looking up the style and name.
+    tolerance = lod_tolerance(sh_line_string, tolerance, max_vertices)
+    coords = get_coords(simplify(sh_line_string, tolerance), 2)
 
-    __i_plot_lines2d(sh_line_string, xs, ys, data, style, name, legend_group, show_legend, as_hole)
+    __i_plot_lines2d(sh_line_string, coords, data, style, name, legend_group, show_legend, as_hole, renderer)
     return
 
 
@@ -338,7 +636,85 @@ sh.LinearRing.plotly_draw3d = plot_line_string3d
 
 
 # shapely Polygon
-def plot_polygon3d(sh_polygon, data, style=DEFAULT, name=DEFAULT, legend_group=DEFAULT, show_legend=True):
+def color_opacity(color):
+    """
+    Split a Plotly "rgba(r,g,b,a)" color string into an "rgb(r,g,b)" color and an opacity.
+    Mesh3d plots ignore the alpha of their color, and need a separate opacity.
+
+    :return: (color, opacity).  opacity is None if the color has no alpha.
+    """
+    if isinstance(color, str) and color.replace(" ", "").startswith("rgba("):
+        components = color[color.index("(") + 1:color.rindex(")")].split(",")
+        return "rgb(" + ",".join(c.strip() for c in components[0:3]) + ")", float(components[3])
+
+    return color, None
+
+
+def mesh3d_kwargs(polygons, fill_color):
+    """
+    Triangulate polygons for a filled 3D plot.  See coords.triangulate(...).
+
+    :param polygons: 1D NumPy object array of Polygons.
+    :param fill_color: Plotly color.
+    :return: Keyword arguments for a Mesh3d plot, or None if there are no triangles.
+    """
+    vertices, faces = triangulate(polygons)
+    if len(faces) == 0:
+        return None
+
+    color, opacity = color_opacity(fill_color)
+    return dict(x=vertices[:, 0], y=vertices[:, 1], z=vertices[:, 2],
+                i=faces[:, 0], j=faces[:, 1], k=faces[:, 2],
+                color=color, opacity=opacity)
+
+
+def __i_plot_polygons3d(geom, polygons, data, style, name, legend_group, show_legend):
+    """
+    Internal function.  Plot an array of polygons as a single geometry, 3D.
+
+    geom is the geometry the style and name are looked up for.  polygons is a 1D array of Polygons, e.g. the parts of
+    geom.  All the exteriors are plotted as one plot, and all the holes as another.  If the style has fill_3d set,
+    all the polygons are filled by a single Mesh3d plot, drawn first.
+    """
+
+    _, _, _, name, show_legend, legend_group, style = \
+        __i_plot_lines_style_info(geom, style, name, legend_group, show_legend, as_hole=False)
+
+    rings, is_exterior = polygon_rings(polygons)
+    if len(rings) == 0:
+        # Empty polygon.  Nothing to plot.
+        return
+
+    mesh = None
+    if style.fill_3d and (style.fill_color is not None):
+        mesh = mesh3d_kwargs(polygons, style.fill_color)
+
+    # If the legend is shown and has the polygon hasinteriors or a fill, then force all plots onto the same
+    # legend group.  If one wasn't defined, then create a unique one.
+    has_interiors = not is_exterior.all()
+    if show_legend and (has_interiors or (mesh is not None)):
+        if legend_group is None:
+            legend_group = unique_legend_group()
+
+    # Plot the fill.  Scatter keyword arguments are not passed, they may not apply to Mesh3d.
+    if mesh is not None:
+        data.append(new_trace("mesh3d", **mesh, name=name, showlegend=show_legend, legendgroup=legend_group))
+        show_legend = False
+
+    # Plot the exterior hulls.  Rows of NaN separate the rings.
+    coords = line_coords(rings[is_exterior], 3)
+    __i_plot_lines3d(geom, coords, data, style, name, legend_group, show_legend, as_hole=False)
+
+    # Plot the interior holes.  No legend entry.
+    if has_interiors:
+        coords = line_coords(rings[~is_exterior], 3)
+        __i_plot_lines3d(geom, coords, data, style, name, legend_group, False, as_hole=True)
+
+    return
+
+
+def plot_polygon3d(sh_polygon, data, style=DEFAULT, name=DEFAULT, legend_group=DEFAULT, show_legend=True,
+                   tolerance=None, max_vertices=None):
     """
     Plot Polygon - 3D.
 
@@ -347,61 +723,70 @@ def plot_polygon3d(sh_polygon, data, style=DEFAULT, name=DEFAULT, legend_group=D
     :param style:  shapely_plotly Style object.  Overrides any style defined for sh_polygon.
     :param name:   Name for the object in Plotly plot.  Overrides any name defined for the sh_polygon.
     :param legend_group   Legend group to use (groups multiple items under a single legend).  Overrides style.
+    :param tolerance: Simplify before plotting.  None, "auto" or a number.  See coords.lod_tolerance(...).
+    :param max_vertices: If not None, simplify to at most this many vertices.  See coords.lod_tolerance(...).
     """
 
-    _, _, _, name, show_legend, legend_group, style = \
-        __i_plot_lines_style_info(sh_polygon, style, name, legend_group, show_legend, as_hole=False)
+    # Style and name are looked up for the original polygon.  Plot the simplified one.
+    polygons = np.array([simplify(sh_polygon, lod_tolerance(sh_polygon, tolerance, max_vertices))], dtype=object)
+    __i_plot_polygons3d(sh_polygon, polygons, data, style, name, legend_group, show_legend)
+    return
 
-    # If the legend is shown and has the polygon hasinteriors, then force all plots onto the same legend group.
-    # If one wasn't defined, then create a unique one.
-    # create a unique one.
-    if show_legend and (len(sh_polygon.interiors) > 0):
-        if legend_group is None:
-            legend_group = unique_legend_group()
 
-    # Plot the exterior hull
-    # FIXME: Misformed polygons?  Empty polygons?  Empty exterior with holes?
-    __i_plot_line_string3d(sh_polygon.exterior, data, style, name, legend_group, show_legend, False)
+sh.Polygon.plotly_draw3d = plot_polygon3d
 
-    # Plot the interior holes.  No name on these so no legend entry.
-    # FIXME: Tool tips not right, because no name.  Need explicit show-legend to this call.
-    for interior in sh_polygon.interiors:
-        __i_plot_line_string3d(interior, data, style, name, legend_group, False, True)
 
+def plot_multipolygon3d(sh_multipolygon, data, style=DEFAULT, name=DEFAULT, legend_group=DEFAULT, show_legend=True,
+                        tolerance=None, max_vertices=None):
+    """
+    Plot Multi-polygon - 3D.
+
+    :param sh_multipolygon: Shapely geometry.
+    :param data: List of plotly graph objects.  Graph is appended to this.
+    :param style:  shapely_plotly Style object.  Overrides any style defined for sh_multipolygon.
+    :param name:   Name for the object in Plotly plot.  Overrides any name defined for the sh_multipolygon.
+    :param legend_group   Legend group to use (groups multiple items under a single legend).  Overrides style.
+    :param tolerance: Simplify before plotting.  None, "auto" or a number.  See coords.lod_tolerance(...).
+    :param max_vertices: If not None, simplify to at most this many vertices.  See coords.lod_tolerance(...).
+
+    Note: All the polygons are plotted together, exactly like a single polygon with several exteriors.  There is one
+    plot for all the exteriors, and one for all the holes.
+    """
+
+    # Style and name are looked up for the original multi-polygon.  Plot the simplified one.
+    sh_simple = simplify(sh_multipolygon, lod_tolerance(sh_multipolygon, tolerance, max_vertices))
+    __i_plot_polygons3d(sh_multipolygon, sh.get_parts(sh_simple), data, style, name, legend_group, show_legend)
     return
 
 
-sh.Polygon.plotly_draw3d = plot_polygon3d
+sh.MultiPolygon.plotly_draw3d = plot_multipolygon3d
 
 # For polygons we need a line style that plots no line at all.   We use alpha=0, width=0.
 no_line_style = dict(color="rgba(0,0,0,0)", width=0)
 
 
-def plot_polygon2d(sh_polygon, data, style=DEFAULT, name=DEFAULT, legend_group=DEFAULT, show_legend=True):
+def __i_plot_polygons2d(geom, polygons, data, style, name, legend_group, show_legend, renderer):
     """
-    Plot Polygon - 2D.
+    Internal function.  Plot an array of polygons as a single geometry, 2D.
 
-    :param sh_polygon: Shapely point object.
-    :param data: List of plotly graph objects.  Graph is appended to this.
-    :param style:  shapely_plotly Style object.  Overrides any style defined for sh_polygon.
-    :param name:   Name for the object in Plotly plot.  Overrides any name defined for the sh_polygon.
-    :param legend_group   Legend group to use (groups multiple items under a single legend).  Overrides style.
+    geom is the geometry the style and name are looked up for.  polygons is a 1D array of Polygons, e.g. the parts of
+    geom.  All the polygons are plotted together, with 1 to 3 plots in total.
     """
 
     mode, line_style, marker_style, name, show_legend, legend_group, style = \
-        __i_plot_lines_style_info(sh_polygon, style, name, legend_group, show_legend, as_hole=False)
-
-    ext = sh_polygon.exterior
-    ext_n = len(ext.coords)
-    ext_ccw = ext.is_ccw
-    tot_c = ext_n
-    num_i = len(sh_polygon.interiors)
-    has_interiors = num_i > 0
-    if has_interiors:
-        # We need coordinates for each internal hole
-        # Plus a None separate to skip to it without drawing a border
-        tot_c += sum(len(ixt.coords) for ixt in sh_polygon.interiors) + num_i
+        __i_plot_lines_style_info(geom, style, name, legend_group, show_legend, as_hole=False)
+
+    if renderer is DEFAULT:
+        renderer = style.renderer
 
+    # Each exterior, followed by its interior holes.
+    rings, is_exterior = polygon_rings(polygons)
+    if len(rings) == 0:
+        # Empty polygon.  Nothing to plot.
+        return
+
+    has_interiors = not is_exterior.all()
+    if has_interiors:
         # Note on interior holes and styles.
         # We have to plot the poly as a single scatter plot to get the filling right.
         # However, we have to change marker/line styles because the holes have a different style from the
@@ -417,7 +802,7 @@ def plot_polygon2d(sh_polygon, data, style=DEFAULT, name=DEFAULT, legend_group=D
 
         # Hole styles
         h_mode, h_line_style, h_marker_style, _, _, _, _ = \
-            __i_plot_lines_style_info(sh_polygon, style, name, legend_group, show_legend, as_hole=True)
+            __i_plot_lines_style_info(geom, style, name, legend_group, show_legend, as_hole=True)
 
         # Save exterior styles for exterior plot.
         e_mode, e_line_style = mode, line_style
@@ -425,28 +810,12 @@ def plot_polygon2d(sh_polygon, data, style=DEFAULT, name=DEFAULT, legend_group=D
         # Substitue empty line plot for the main plot.
         mode = None
 
-    # List of x/y coords.
-    xs = [None] * tot_c
-    ys = [None] * tot_c
-
-    # For the outer shell
-    xs[0:ext_n], ys[0:ext_n] = ext.xy
-
-    index = ext_n
-    for ixt in sh_polygon.interiors:
-        # xs[index], ys[index] are already None
-        index += 1
-        n = len(ixt.coords)
-        assert n > 0  # Not support this yet.
-        if ixt.is_ccw == ext_ccw:
-            # Have to reverse the order.  The holes must have the opposite rotation of the exterior for
-            # Plotly to draw it properly
-            x, y = ixt.xy
-            xs[index:index + n], ys[index:index + n] = reversed(x), reversed(y)
-        else:
-            xs[index:index + n], ys[index:index + n] = ixt.xy
-
-        index += n
+    # All the rings in one plot.
+    # Rows of NaN separate the rings, to skip to the next ring without drawing a border.
+    # The holes must have the opposite rotation of the exterior for Plotly to draw it properly.
+    coords = line_coords(fill_oriented(rings, is_exterior), 2)
+    xs = coords[:, 0]
+    ys = coords[:, 1]
 
     fill_color = style.fill_color
 
@@ -460,70 +829,115 @@ def plot_polygon2d(sh_polygon, data, style=DEFAULT, name=DEFAULT, legend_group=D
             mode = "lines"
             line_style = no_line_style
 
-        # Fill color == None means no fill.
-        if fill_color is None:
-            fill_mode = None
-        else:
-            fill_mode = "toself"
-
         # Plot with fill
-        scat = graph.Scatter(x=xs, y=ys,
-                             line=line_style,
-                             marker=marker_style,
-                             fillcolor=style.fill_color,
-                             name=name, showlegend=show_legend, legendgroup=legend_group,
-                             mode=mode, fill="toself",
-                             **style.scatter_kwargs)
+        scat = scatter2d(renderer,
+                         x=xs, y=ys,
+                         line=line_style,
+                         marker=marker_style,
+                         fillcolor=style.fill_color,
+                         name=name, showlegend=show_legend, legendgroup=legend_group,
+                         mode=mode, fill="toself",
+                         **style.scatter_kwargs)
 
         data.append(scat)
 
         # Only need the above legend entry
-        h_show_legend = False
         e_show_legend = False
+        h_show_legend = False
     else:
         if not has_interiors:
             # Has no drawing elements.  Nothing to plot.
             return
 
-        if h_mode is None:
-            # Use exterior to draw legend.
-            # h_show_legend is not used.
-            e_show_legend = show_legend
-        else:
-            # Use holes to draw legend.
-            h_show_legend = show_legend
-            e_show_legend = False
+        # The first plot drawn has the legend entry.
+        e_show_legend = show_legend and (e_mode is not None)
+        h_show_legend = show_legend and not e_show_legend
 
     if has_interiors:
         # Plot exterior lines and markers.
         if e_mode is not None:
-            scat = graph.Scatter(x=xs[0:ext_n], y=ys[0:ext_n],
-                                 line=e_line_style,
-                                 marker=marker_style,
-                                 name=name, showlegend=h_show_legend, legendgroup=legend_group,
-                                 mode=e_mode,
-                                 **style.scatter_kwargs
-                                 )
+            coords = line_coords(rings[is_exterior], 2)
+            scat = scatter2d(renderer,
+                             x=coords[:, 0], y=coords[:, 1],
+                             line=e_line_style,
+                             marker=marker_style,
+                             name=name, showlegend=e_show_legend, legendgroup=legend_group,
+                             mode=e_mode,
+                             **style.scatter_kwargs
+                             )
             data.append(scat)
 
         # Plot holes lines and markers.
         if h_mode is not None:
-            scat = graph.Scatter(x=xs[ext_n + 1:], y=ys[ext_n + 1:],
-                                 line=h_line_style,
-                                 marker=h_marker_style,
-                                 name=name, showlegend=e_show_legend, legendgroup=legend_group,
-                                 mode=h_mode,
-                                 **style.scatter_kwargs
-                                 )
+            coords = line_coords(rings[~is_exterior], 2)
+            scat = scatter2d(renderer,
+                             x=coords[:, 0], y=coords[:, 1],
+                             line=h_line_style,
+                             marker=h_marker_style,
+                             name=name, showlegend=h_show_legend, legendgroup=legend_group,
+                             mode=h_mode,
+                             **style.scatter_kwargs
+                             )
             data.append(scat)
 
     return
 
 
+def plot_polygon2d(sh_polygon, data, style=DEFAULT, name=DEFAULT, legend_group=DEFAULT, show_legend=True,
+                   renderer=DEFAULT, tolerance=None, max_vertices=None):
+    """
+    Plot Polygon - 2D.
+
+    :param sh_polygon: Shapely point object.
+    :param data: List of plotly graph objects.  Graph is appended to this.
+    :param style:  shapely_plotly Style object.  Overrides any style defined for sh_polygon.
+    :param name:   Name for the object in Plotly plot.  Overrides any name defined for the sh_polygon.
+    :param legend_group   Legend group to use (groups multiple items under a single legend).  Overrides style.
+    :param renderer: "svg", "webgl" or "auto".  Overrides style.  See Style.renderer.
+    :param tolerance: Simplify before plotting.  None, "auto" or a number.  See coords.lod_tolerance(...).
+    :param max_vertices: If not None, simplify to at most this many vertices.  See coords.lod_tolerance(...).
+    """
+
+    # Style and name are looked up for the original polygon.  Plot the simplified one.
+    polygons = np.array([simplify(sh_polygon, lod_tolerance(sh_polygon, tolerance, max_vertices))], dtype=object)
+    __i_plot_polygons2d(sh_polygon, polygons, data, style, name, legend_group, show_legend, renderer)
+    return
+
+
 sh.Polygon.plotly_draw2d = plot_polygon2d
 
 
-def plot_multiline3d(sh_multiline, data, style=DEFAULT, name=DEFAULT, legend_group=DEFAULT, show_legend=True):
+def plot_multipolygon2d(sh_multipolygon, data, style=DEFAULT, name=DEFAULT, legend_group=DEFAULT, show_legend=True,
+                        renderer=DEFAULT, tolerance=None, max_vertices=None):
+    """
+    Plot Multi-polygon - 2D.
+
+    :param sh_multipolygon: Shapely geometry.
+    :param data: List of plotly graph objects.  Graph is appended to this.
+    :param style:  shapely_plotly Style object.  Overrides any style defined for sh_multipolygon.
+    :param name:   Name for the object in Plotly plot.  Overrides any name defined for the sh_multipolygon.
+    :param legend_group   Legend group to use (groups multiple items under a single legend).  Overrides style.
+    :param renderer: "svg", "webgl" or "auto".  Overrides style.  See Style.renderer.
+    :param tolerance: Simplify before plotting.  None, "auto" or a number.  See coords.lod_tolerance(...).
+    :param max_vertices: If not None, simplify to at most this many vertices.  See coords.lod_tolerance(...).
+
+    Note: All the polygons are plotted together, exactly like a single polygon with several exteriors.  There is one
+    plot for the fill and exterior outlines, or for polygons with holes, up to one plot each for the fill, the
+    exterior outlines and the hole outlines.
+    """
+
+    # Style and name are looked up for the original multi-polygon.  Plot the simplified one.
+    sh_simple = simplify(sh_multipolygon, lod_tolerance(sh_multipolygon, tolerance, max_vertices))
+    __i_plot_polygons2d(sh_multipolygon, sh.get_parts(sh_simple), data, style, name, legend_group, show_legend,
+                        renderer)
+    return
+
+
+sh.MultiPolygon.plotly_draw2d = plot_multipolygon2d
+
+
+def plot_multiline3d(sh_multiline, data, style=DEFAULT, name=DEFAULT, legend_group=DEFAULT, show_legend=True,
+                     tolerance=None, max_vertices=None):
     """
     Plot Multi-line string - 3D.
 
@@ -532,69 +946,30 @@ def plot_multiline3d(sh_multiline, data, style=DEFAULT, name=DEFAULT, legend_gro
     :param style:  shapely_plotly Style object.  Overrides any style defined for sh_multiline.
     :param name:   Name for the object in Plotly plot.  Overrides any name defined for the sh_multiline.
     :param legend_group   Legend group to use (groups multiple items under a single legend).  Overrides style.
+    :param tolerance: Simplify before plotting.  None, "auto" or a number.  See coords.lod_tolerance(...).
+    :param max_vertices: If not None, simplify to at most this many vertices.  See coords.lod_tolerance(...).
 
     Note: The legend will contain a single entry for a MultiLineString.  The name and style of the MultiLineString
     is used.  Any names/styles defined for the individual LineString objects are ignored.  Plot them individualized
     if you want individual legend entries or styles.
     """
-    # We plot this as a single scatter plot, but make the lines invisible to skip between lines.
-    nl = len(sh_multiline.geoms)
-    if nl == 0:
+    # We plot this as a single scatter plot, with a row of NaN at the breaks to disconnect the lines.
+    # Empty lines (yes, Shapely allows this) have no coordinates, and are skipped.
+    tolerance = lod_tolerance(sh_multiline, tolerance, max_vertices)
+    coords = line_coords(sh.get_parts(simplify(sh_multiline, tolerance)), 3)
+    if len(coords) == 0:
+        # All empty!
         return
 
-    n_tot = sum(len(l.coords) for l in sh_multiline.geoms)
-    num_point = n_tot + (nl - 1)  # We place a (None, None, None) coordinate in the breaks to make it disconnect.
-    xs = [None] * num_point
-    ys = [None] * num_point
-    zs = [None] * num_point
-
-    index = 0
-    first_line = True
-    for il, l in enumerate(sh_multiline.geoms):
-        coords = l.coords
-        n = len(coords)
-        if n == 0:
-            # Empty Line.  Yes, Shapely allows this.
-            # In this case we have reserved space for a separater that we do not need.
-            # We will correct length of xs,ys,zs at the end.
-            # Meanwhile, just skip.
-            continue
-
-        if first_line:
-            first_line = False
-        else:
-            # Not the first line.  Add break between line strings.
-            xs[index], ys[index], zs[index] = (None, None, None)
-            index += 1
-
-        xs[index:index + n], ys[index:index + n] = l.xy
-
-        if l.has_z:
-            zs[index:index + n] = (c[2] for c in coords)
-        else:
-            zs[index:index + n] = (0.0,) * n
-
-        index += n
-
-    if index < num_point:
-        # This can happen if there were empty lines in the list.
-        if index == 0:
-            # All empty!
-            return
-
-        # Discard the remaining unused points.
-        del xs[index:]
-        del ys[index:]
-        del zs[index:]
-
-    __i_plot_lines3d(sh_multiline, xs, ys, zs, data, style, name, legend_group, show_legend, as_hole=False)
+    __i_plot_lines3d(sh_multiline, coords, data, style, name, legend_group, show_legend, as_hole=False)
     return
 
 
 sh.MultiLineString.plotly_draw3d = plot_multiline3d
 
 
-def plot_multiline2d(sh_multiline, data, style=DEFAULT, name=DEFAULT, legend_group=DEFAULT, show_legend=True):
+def plot_multiline2d(sh_multiline, data, style=DEFAULT, name=DEFAULT, legend_group=DEFAULT, show_legend=True,
+                     renderer=DEFAULT, tolerance=None, max_vertices=None):
     """
     Plot Multi-line string - 2D.
 
@@ -603,55 +978,23 @@ def plot_multiline2d(sh_multiline, data, style=DEFAULT, name=DEFAULT, legend_gro
     :param style:  shapely_plotly Style object.  Overrides any style defined for sh_multiline.
     :param name:   Name for the object in Plotly plot.  Overrides any name defined for the sh_multiline.
     :param legend_group   Legend group to use (groups multiple items under a single legend).  Overrides style.
+    :param renderer: "svg", "webgl" or "auto".  Overrides style.  See Style.renderer.
+    :param tolerance: Simplify before plotting.  None, "auto" or a number.  See coords.lod_tolerance(...).
+    :param max_vertices: If not None, simplify to at most this many vertices.  See coords.lod_tolerance(...).
 
     Note: The legend will contain a single entry for a MultiLineString.  The name and style of the MultiLineString
     is used.  Any names/styles defined for the individual LineString objects are ignored.  Plot them individualized
     if you want individual legend entries or styles.
     """
-    # We plot this as a single scatter plot, but make the lines invisible to skip between lines.
-    nl = len(sh_multiline.geoms)
-    if nl == 0:
+    # We plot this as a single scatter plot, with a row of NaN at the breaks to disconnect the lines.
+    # Empty lines (yes, Shapely allows this) have no coordinates, and are skipped.
+    tolerance = lod_tolerance(sh_multiline, tolerance, max_vertices)
+    coords = line_coords(sh.get_parts(simplify(sh_multiline, tolerance)), 2)
+    if len(coords) == 0:
+        # All empty!
         return
 
-    n_tot = sum(len(l.coords) for l in sh_multiline.geoms)
-    num_point = n_tot + (nl - 1)  # We place a (None, None, None) coordinate in the breaks to make it disconnect.
-    xs = [None] * num_point
-    ys = [None] * num_point
-
-    index = 0
-    first_line = True
-    for il, l in enumerate(sh_multiline.geoms):
-        n = len(l.coords)
-
-        if n == 0:
-            # Empty Line.  Yes, Shapely allows this.
-            # In this case we have reserved space for a separater that we do not need.
-            # We will correct length of xs,ys,zs at the end.
-            # Meanwhile, just skip.
-            continue
-
-        if first_line:
-            first_line = False
-        else:
-            # Not the first line.  Add break between line strings.
-            xs[index], ys[index] = (None, None)
-            index += 1
-
-        xs[index:index + n], ys[index:index + n] = l.xy
-
-        index += n
-
-    if index < num_point:
-        # This can happen if there were empty lines in the list.
-        if index == 0:
-            # All empty!
-            return
-
-        # Discard the remaining unused points.
-        del xs[index:]
-        del ys[index:]
-
-    __i_plot_lines2d(sh_multiline, xs, ys, data, style, name, legend_group, show_legend, as_hole=False)
+    __i_plot_lines2d(sh_multiline, coords, data, style, name, legend_group, show_legend, False, renderer)
     return
 
 
@@ -659,7 +1002,8 @@ sh.MultiLineString.plotly_draw2d = plot_multiline2d
 
 
 # shapely GeometryCollection
-def plot_geometry_collection3d(sh_geo_col, data, style=DEFAULT, name=DEFAULT, legend_group=DEFAULT, show_legend=True):
+def plot_geometry_collection3d(sh_geo_col, data, style=DEFAULT, name=DEFAULT, legend_group=DEFAULT, show_legend=True,
+                               tolerance=None, max_vertices=None):
     """
     Plot geometry collection - 3D.
 
@@ -668,6 +1012,8 @@ def plot_geometry_collection3d(sh_geo_col, data, style=DEFAULT, name=DEFAULT, le
     :param style:  shapely_plotly Style object.  Overrides any style defined for sh_geo_col.
     :param name:   Name for the object in Plotly plot.  Overrides any name defined for the sh_geo_col.
     :param legend_group   Legend group to use (groups multiple items under a single legend).  Overrides style.
+    :param tolerance: Simplify before plotting.  None, "auto" or a number.  See coords.lod_tolerance(...).
+    :param max_vertices: If not None, simplify to at most this many vertices.  See coords.lod_tolerance(...).
 
     Note: Unless defined above, the names and styles of the contained geometry objects are used.
     Any name/style defined for the Geometry Collection itself is ignored.
@@ -685,8 +1031,11 @@ def plot_geometry_collection3d(sh_geo_col, data, style=DEFAULT, name=DEFAULT, le
     if (legend_group is None) and (len(geoms) > 1):
         legend_group = unique_legend_group()
 
+    # One tolerance for the whole collection.  "auto" and max_vertices apply to the collection as a whole.
+    tolerance = lod_tolerance(sh_geo_col, tolerance, max_vertices)
+
     for g in geoms:
-        g.plotly_draw3d(data, style, name, legend_group, show_legend)
+        g.plotly_draw3d(data, style, name, legend_group, show_legend, tolerance=tolerance)
         show_legend = False  # At most the first plot creates a legend entry.
 
     return
@@ -694,12 +1043,9 @@ def plot_geometry_collection3d(sh_geo_col, data, style=DEFAULT, name=DEFAULT, le
 
 sh.GeometryCollection.plotly_draw3d = plot_geometry_collection3d
 
-# shapely MultiPolygon
-# We use the same approach for multi-polygone.
-sh.MultiPolygon.plotly_draw3d = plot_geometry_collection3d
-
 
-def plot_geometry_collection2d(sh_geo_col, data, style=DEFAULT, name=DEFAULT, legend_group=DEFAULT, show_legend=True):
+def plot_geometry_collection2d(sh_geo_col, data, style=DEFAULT, name=DEFAULT, legend_group=DEFAULT, show_legend=True,
+                               renderer=DEFAULT, tolerance=None, max_vertices=None):
     """
     Plot geometry collection - 2D.
 
@@ -708,6 +1054,9 @@ def plot_geometry_collection2d(sh_geo_col, data, style=DEFAULT, name=DEFAULT, le
     :param style:  shapely_plotly Style object.  Overrides any style defined for sh_geo_col.
     :param name:   Name for the object in Plotly plot.  Overrides any name defined for the sh_geo_col.
     :param legend_group   Legend group to use (groups multiple items under a single legend).  Overrides style.
+    :param renderer: "svg", "webgl" or "auto".  Overrides style.  See Style.renderer.
+    :param tolerance: Simplify before plotting.  None, "auto" or a number.  See coords.lod_tolerance(...).
+    :param max_vertices: If not None, simplify to at most this many vertices.  See coords.lod_tolerance(...).
     """
     geoms = tuple(sh_geo_col.geoms)
 
@@ -722,9 +1071,12 @@ def plot_geometry_collection2d(sh_geo_col, data, style=DEFAULT, name=DEFAULT, le
     if (legend_group is None) and (len(geoms) > 1):
         legend_group = unique_legend_group()
 
+    # One tolerance for the whole collection.  "auto" and max_vertices apply to the collection as a whole.
+    tolerance = lod_tolerance(sh_geo_col, tolerance, max_vertices)
+
     # Single legend and use this style.
     for g in geoms:
-        g.plotly_draw2d(data, style, name, legend_group, show_legend)
+        g.plotly_draw2d(data, style, name, legend_group, show_legend, renderer=renderer, tolerance=tolerance)
         show_legend = False  # Only the first geometry should have a legend entry.
 
     return
@@ -732,42 +1084,323 @@ def plot_geometry_collection2d(sh_geo_col, data, style=DEFAULT, name=DEFAULT, le
 
 sh.GeometryCollection.plotly_draw2d = plot_geometry_collection2d
 
-# shapely MultiPolygon
-# We use the same approach for multi-polygone.
-sh.MultiPolygon.plotly_draw2d = plot_geometry_collection2d
 
+def rerender2d(data, renderer):
+    """
+    Convert the 2D plots in data between SVG (Scatter) and WebGL (Scattergl) rendering.
 
-def show2d(data, show=True):
+    Plots that Scattergl cannot reproduce stay SVG.  For "auto", WebGL is used if the total number of points in all
+    2D plots is at least webgl_threshold.
+
+    :param data: List of plots, Plotly graph objects or dictionaries.
+    :param renderer: "svg", "webgl" or "auto".  See Style.renderer.
+    :return: New list of plots.
     """
-    Create figure and show.  Suitable for viewing 2D plots.
+    def get(p, field):
+        return p.get(field) if isinstance(p, dict) else getattr(p, field)
+
+    scatter_data = [p for p in data if (trace_type(p) in ("scatter", "scattergl")) and (get(p, "x") is not None)]
+
+    if renderer == "auto":
+        n = sum(len(get(p, "x")) for p in scatter_data)
+        renderer = "webgl" if n >= webgl_threshold else "svg"
+
+    scatter_ids = set(id(p) for p in scatter_data)
+    new_data = []
+    for p in data:
+        if id(p) in scatter_ids:
+            new_type = "scattergl" if use_webgl(renderer, get(p, "x"), get(p, "fill")) else "scatter"
+            if new_type != trace_type(p):
+                if isinstance(p, dict):
+                    p = dict(p, type=new_type)
+                else:
+                    kwargs = p.to_plotly_json()
+                    del kwargs["type"]
+                    try:
+                        p = trace_class(new_type)(**kwargs)
+                    except ValueError:
+                        # Uses a Plotly feature not supported by the other renderer.  Leave it as it is.
+                        pass
+
+        new_data.append(p)
+
+    return new_data
+
+
+# Number of plots validated when show2d/show3d are called with validate="sample".
+validation_sample_size = 10
+
+
+def build_figure(data, layout, validate, binary=False):
+    """
+    Internal function.  Build a figure from plots and a layout dictionary.
+
+    :param data: List of plots, Plotly graph objects or dictionaries.
+    :param layout: Plotly layout dictionary.
+    :param validate: True - Build a validated plotly.graph_objects.Figure.
+                     False - Build a figure dictionary, {"data": [...], "layout": {...}}.  Nothing is validated.
+                     "sample" - Build a figure dictionary, but first validate up to validation_sample_size plots,
+                                spread evenly across data.
+    :param binary: If not False, build a figure dictionary with coordinates as typed arrays.  See encode_trace(...).
+                   With validate=True, all the plots are validated first.
     """
-    fig = graph.Figure(data=data)
-    fig.update_yaxes(scaleanchor="x", scaleratio=1)  # This forces plotly to keep the aspect ratio correct.
+    if validate is True:
+        fig = plotly_graph().Figure(data=data, layout=layout)
+        if not binary:
+            return fig
+    elif validate == "sample":
+        step = -(-len(data) // validation_sample_size)  # Round up, to sample at most validation_sample_size.
+        plotly_graph().Figure(data=data[::max(step, 1)], layout=layout)
+    else:
+        assert validate is False, f"Unknown validate option {repr(validate)}"
 
-    if show:
+    data = [p if isinstance(p, dict) else p.to_plotly_json() for p in data]
+    if binary:
+        data = [encode_trace(p, binary) for p in data]
+
+    return dict(data=data, layout=layout)
+
+
+# Plot properties written as typed arrays by encode_trace(...).  Coordinates, and Mesh3d triangle indexes.
+binary_keys = ("x", "y", "z", "i", "j", "k")
+index_keys = ("i", "j", "k")
+
+
+def typed_array(values, dtype):
+    """
+    Encode an array as a Plotly typed array, {"dtype": "f8", "bdata": "<base64>"}.  Plotly.js 2.28 and later reads
+    these directly into JavaScript typed arrays.
+
+    :param values: NumPy array, or sequence of numbers.
+    :param dtype: Encoded type.  "f8", "f4", "i4", "u4", "i2", "u2", "i1" or "u1".
+    :return: Dictionary.
+    """
+    arr = np.ascontiguousarray(values, dtype="<" + dtype)
+    return dict(dtype=dtype, bdata=base64.b64encode(arr.data).decode("ascii"))
+
+
+def encode_trace(trace, binary):
+    """
+    Copy a plot dictionary, with its coordinates and triangle indexes as typed arrays.  See typed_array(...).
+    Arrays that are not numeric, such as dates or text, are left as they are.
+
+    :param trace: Plot dictionary.
+    :param binary: True - Coordinates are encoded as float64 ("f8").
+                   "f4" - Coordinates are encoded as float32, halving the size.  Precision is limited to about 7
+                          significant digits.
+                   Triangle indexes are always int32 ("i4").
+    :return: Dictionary.
+    """
+    assert binary in (True, "f4", "f8"), f"Unknown binary option {repr(binary)}"
+    float_type = "f4" if binary == "f4" else "f8"
+
+    res = dict(trace)
+    for key in binary_keys:
+        values = res.get(key)
+        if (values is None) or isinstance(values, dict):
+            continue
+
+        values = np.asarray(values)
+        if values.dtype.kind not in "biuf":
+            continue
+
+        res[key] = typed_array(values, "i4" if key in index_keys else float_type)
+
+    return res
+
+
+def show_figure(fig):
+    """
+    Internal function.  Show a figure built by build_figure(...).
+    """
+    if isinstance(fig, dict):
+        import plotly.io as pio
+        pio.show(fig, validate=False)
+    else:
         fig.show()
 
-    return fig
+    return
+
 
+axis_names = ("x", "y", "z")
 
-def show3d(data, show=True):
+
+def output_frame(data, dims, origin=None, decimals=None, digits=None):
     """
-    Create figure and show.  Suitable for viewing 3D plots.
+    Internal function.  Shift coordinates to a new origin, and round them, for output.  See show2d(...).
+
+    Shifted plots get a hover template that shows the original coordinates, unless they already have a hover template
+    or customdata.  The original coordinates of the shifted axes, after rounding, are added as customdata.
+
+    :param data: List of plots, Plotly graph objects or dictionaries.
+    :param dims: 2 or 3.  Number of axes.
+    :param origin: None, "auto" or a tuple with the origin on each axis.  See coords.auto_origin(...).
+    :param decimals: Round to this many decimal places.  See coords.round_coords(...).
+    :param digits: Round to this many significant digits.
+    :return: (data, origin).  data is a new list of plot dictionaries.  origin is a tuple of dims values, or None.
     """
-    scene = dict(
-        aspectmode="data",  # this string can be 'data', 'cube', 'auto', 'manual'
-        aspectratio=dict(x=1, y=1, z=1)
-    )
+    data = [p if isinstance(p, dict) else p.to_plotly_json() for p in data]
+    axes = axis_names[0:dims]
+
+    mins, maxs = np.full(dims, np.inf), np.full(dims, -np.inf)
+    for p in data:
+        for i, axis in enumerate(axes):
+            values = np.asarray(p.get(axis, ()))
+            if (values.dtype.kind in "iuf") and np.isfinite(values).any():
+                mins[i] = min(mins[i], np.nanmin(values))
+                maxs[i] = max(maxs[i], np.nanmax(values))
+    mins[mins > maxs] = maxs[mins > maxs] = 0.0
+
+    if isinstance(origin, str):
+        assert origin == "auto", f"Unknown origin option {repr(origin)}"
+        origin = auto_origin(mins, maxs)
+    elif origin is not None:
+        origin = tuple(origin[0:dims]) + (0.0,) * (dims - len(origin))
+
+    # Hover text shows the original coordinates of the shifted axes from customdata, as hover templates cannot add.
+    shifted = [] if origin is None else [i for i in range(dims) if origin[i]]
+    hover = "<br>".join(f"{axis}: %{{customdata[{shifted.index(i)}]:.15g}}" if i in shifted else f"{axis}: %{{{axis}}}"
+                        for i, axis in enumerate(axes))
+
+    res = []
+    for p in data:
+        p = dict(p)
+        original = {}
+        for i, axis in enumerate(axes):
+            values = np.asarray(p.get(axis, ()))
+            if (len(values) == 0) or (values.dtype.kind not in "iuf"):
+                continue
+            if origin is not None:
+                values = values - origin[i]
+            p[axis] = round_coords(values.astype(float), decimals, digits)
+            if i in shifted:
+                original[i] = p[axis] + origin[i]
+
+        if shifted and (len(original) == len(shifted)) and ("hovertemplate" not in p) and ("customdata" not in p):
+            p["customdata"] = np.stack([original[i] for i in shifted], axis=1)
+            p["hovertemplate"] = hover
+        res.append(p)
+
+    return res, origin
+
+
+def origin_axis(axis_layout, axis, offset):
+    """
+    Internal function.  Title an axis shifted by offset with the offset, e.g. "x - 4512000".  The ticks show the
+    shifted coordinates, so they stay correct when zooming.  A range is shifted too.
+    """
+    axis_layout["title"] = dict(text=f"{axis} {'-' if offset > 0 else '+'} {abs(offset):.15g}")
+    if "range" in axis_layout:
+        axis_layout["range"] = [v - offset for v in axis_layout["range"]]
+    return axis_layout
+
+
+def layout2d(view=None, origin=None):
+    """
+    Internal function.  The layout dictionary for 2D figures.  See show2d(...).
 
-    layout = graph.Layout(
+    :param view: None, or the (min_x, min_y, max_x, max_y) rectangle or 3D box to show.
+    :param origin: None, or the (x, y) origin subtracted from the coordinates.  See output_frame(...).  The view is
+                   shifted, and the axes are titled with the origin.  See origin_axis(...).
+    """
+    # scaleanchor forces plotly to keep the aspect ratio correct.
+    layout = dict(yaxis=dict(scaleanchor="x", scaleratio=1))
+    if view is not None:
+        half = len(view) // 2
+        layout["xaxis"] = dict(range=[view[0], view[half]])
+        layout["yaxis"]["range"] = [view[1], view[half + 1]]
+
+    if origin is not None:
+        for i, axis in enumerate(("x", "y")):
+            if origin[i]:
+                layout[axis + "axis"] = origin_axis(layout.get(axis + "axis", {}), axis, origin[i])
+
+    return layout
+
+
+def layout3d(view=None, origin=None):
+    """
+    Internal function.  The layout dictionary for 3D figures.  See show3d(...) and layout2d(...).
+    """
+    layout = dict(
         scene=dict(
             aspectmode="data",  # this string can be 'data', 'cube', 'auto', 'manual'
             aspectratio=dict(x=1, y=1, z=1)
         )
     )
-    fig = graph.Figure(data=data, layout=layout)
+    if view is not None:
+        half = len(view) // 2
+        for i, axis in enumerate(("xaxis", "yaxis", "zaxis")[0:half]):
+            layout["scene"][axis] = dict(range=[view[i], view[half + i]])
+
+    if origin is not None:
+        for i, axis in enumerate(("x", "y", "z")):
+            if origin[i]:
+                layout["scene"][axis + "axis"] = origin_axis(layout["scene"].get(axis + "axis", {}), axis, origin[i])
+
+    return layout
+
+
+def show2d(data, show=True, renderer=None, validate=True, view=None, binary=False, origin=None, decimals=None,
+           digits=None):
+    """
+    Create figure and show.  Suitable for viewing 2D plots.
+
+    :param data: List of plots, Plotly graph objects or dictionaries.
+    :param show: If True, show the figure.
+    :param renderer: If not None, convert all 2D plots to this renderer, "svg", "webgl" or "auto", before creating
+                     the figure.  See rerender2d(...).
+    :param validate: True - Return a plotly.graph_objects.Figure.  All plots are validated by Plotly.
+                     False or "sample" - Return a figure dictionary, skipping validation, or validating only a
+                     sample of the plots.  See build_figure(...).
+    :param view: If not None, set the axes to this (min_x, min_y, max_x, max_y) rectangle.  A 3D box may be used, and
+                 z is ignored.  See draw_many(...).
+    :param binary: True or "f4" - Return a figure dictionary with coordinates as base64 typed arrays, float64 or
+                   float32.  Much smaller and faster to load than decimal numbers.  See encode_trace(...).
+    :param origin: If not None, subtract this (x, y) origin from all coordinates, so that they are shorter, or keep
+                   their precision as float32.  "auto" picks a round origin near the data.  The axis titles show
+                   the origin, and hover text shows the original coordinates.  See output_frame(...).
+    :param decimals: If not None, round coordinates to this many decimal places.  After the origin is subtracted.
+    :param digits: If not None, round coordinates to this many significant digits.  After the origin is subtracted.
+    """
+    if renderer is not None:
+        data = rerender2d(data, renderer)
+
+    if (origin is not None) or (decimals is not None) or (digits is not None):
+        data, origin = output_frame(data, 2, origin, decimals, digits)
+
+    fig = build_figure(data, layout2d(view, origin), validate, binary)
 
     if show:
-        fig.show()
+        show_figure(fig)
+
+    return fig
+
+
+def show3d(data, show=True, validate=True, view=None, binary=False, origin=None, decimals=None, digits=None):
+    """
+    Create figure and show.  Suitable for viewing 3D plots.
+
+    :param data: List of plots, Plotly graph objects or dictionaries.
+    :param show: If True, show the figure.
+    :param validate: True - Return a plotly.graph_objects.Figure.  All plots are validated by Plotly.
+                     False or "sample" - Return a figure dictionary, skipping validation, or validating only a
+                     sample of the plots.  See build_figure(...).
+    :param view: If not None, set the axes to this (min_x, min_y, min_z, max_x, max_y, max_z) box, or the x and y
+                 axes to this (min_x, min_y, max_x, max_y) rectangle.  See draw_many(...).
+    :param binary: True or "f4" - Return a figure dictionary with coordinates and mesh indexes as base64 typed
+                   arrays.  See show2d(...).
+    :param origin: If not None, subtract this (x, y, z) origin from all coordinates.  "auto" picks a round origin
+                   near the data.  See show2d(...).
+    :param decimals: If not None, round coordinates to this many decimal places.
+    :param digits: If not None, round coordinates to this many significant digits.
+    """
+    if (origin is not None) or (decimals is not None) or (digits is not None):
+        data, origin = output_frame(data, 3, origin, decimals, digits)
+
+    fig = build_figure(data, layout3d(view, origin), validate, binary)
+
+    if show:
+        show_figure(fig)
 
     return fig
@@ -0,0 +1,200 @@
+"""
+Streaming figure output.
+
+show2d(...)/show3d(...) build the whole figure in memory, and writing it out as HTML or JSON builds a second copy as a
+string.  For figures with tens of millions of vertices this can take several times the memory of the plots.
+
+write_json(...) and write_html(...) take an iterable of plots, and write each plot to a file as soon as it arrives.
+Only one plot is held as a JSON string at a time.  Given a generator, such as iter_plots(...), peak memory depends on
+the largest plot rather than on the whole figure.
+"""
+
+from __future__ import annotations
+import os
+import html
+
+import numpy as np
+
+from shapely_plotly.plot import layout2d, layout3d, output_frame, encode_trace, color_kwargs
+from shapely_plotly.bulk import draw_many
+
+
+def iter_plots(geoms, dims=2, chunk_size=10000, **kwargs):
+    """
+    Plot geometries with draw_many(...), a chunk at a time, and yield the plots.
+
+    Each chunk is plotted separately, so a group of geometries sharing a style is split into plots per chunk.
+    Legend entries are shared between the chunks, so the legend is the same as with a single draw_many(...).
+    colors and sizes are split with the geometries.  The color range, cmin and cmax, is set from all the colors, so
+    the colors are the same as with a single draw_many(...).
+
+    max_vertices, tolerance="auto" and max_traces are not supported, as they would be worked out for each chunk
+    separately.  Use a numeric tolerance instead, see coords.lod_tolerance(...).  2D lines are not colored by colors,
+    only markers are.
+
+    :param geoms: List or NumPy object array of Shapely geometries.
+    :param dims: 2 or 3.
+    :param chunk_size: Number of geometries plotted at a time.
+    :param kwargs: Other keyword arguments for draw_many(...).
+    :return: Generator of plots.
+    """
+    assert kwargs.get("max_vertices") is None, "iter_plots(...) does not support max_vertices"
+    assert kwargs.get("tolerance") != "auto", "iter_plots(...) does not support tolerance=\"auto\""
+    assert kwargs.get("max_traces") is None, "iter_plots(...) does not support max_traces"
+
+    colors = kwargs.pop("colors", None)
+    sizes = kwargs.pop("sizes", None)
+    if colors is not None:
+        colors = np.asarray(colors)
+        c_kwargs = color_kwargs(colors, None, kwargs.get("cmin"), kwargs.get("cmax"))
+        kwargs.update(cmin=c_kwargs.get("cmin"), cmax=c_kwargs.get("cmax"))
+    if sizes is not None:
+        sizes = np.asarray(sizes)
+
+    legends = {}  # Legend groups shared between the chunks.
+    for start in range(0, len(geoms), chunk_size):
+        plot_data = []
+        end = start + chunk_size
+        draw_many(geoms[start:end], plot_data, dims=dims, legends=legends,
+                  colors=None if colors is None else colors[start:end],
+                  sizes=None if sizes is None else sizes[start:end], **kwargs)
+        yield from plot_data
+
+    return
+
+
+def to_json(obj):
+    """
+    Internal function.  Plotly's JSON encoding of a plot or layout.  plotly.io is imported on first use.
+    """
+    import plotly.io.json as pio_json
+    return pio_json.to_json_plotly(obj)
+
+
+def plot_json(plot, dims, binary, origin, decimals, digits):
+    """
+    Internal function.  A plot as a JSON string, after the output options of write_json(...).
+    """
+    plot = plot if isinstance(plot, dict) else plot.to_plotly_json()
+    if (origin is not None) or (decimals is not None) or (digits is not None):
+        (plot,), _ = output_frame([plot], dims, origin, decimals, digits)
+    if binary:
+        plot = encode_trace(plot, binary)
+
+    return to_json(plot)
+
+
+def open_output(file):
+    """
+    Internal function.  Open a path for writing, or use an open text file as it is.
+
+    :return: (file, close).  close is True if the file was opened here.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        return open(file, "w", encoding="utf-8"), True
+
+    return file, False
+
+
+def figure_layout(dims, layout, view, origin):
+    """
+    Internal function.  The layout of show2d/show3d(...), updated with layout.
+    """
+    assert not isinstance(origin, str), "Streamed figures need an explicit origin"
+    if origin is not None:
+        origin = tuple(origin[0:dims]) + (0.0,) * (dims - len(origin))
+
+    res = layout3d(view, origin) if dims == 3 else layout2d(view, origin)
+    if layout is not None:
+        res.update(layout)
+
+    return res
+
+
+def write_json(plots, file, dims=2, layout=None, view=None, binary=False, origin=None, decimals=None, digits=None):
+    """
+    Write a figure as JSON, one plot at a time.  The result can be read by plotly.io.from_json(...).
+
+    :param plots: Iterable of plots, Plotly graph objects or dictionaries.  E.g. a list, or iter_plots(...).
+    :param file: Path, or text file open for writing.
+    :param dims: 2 or 3.  Selects the layout of show2d(...) or show3d(...).
+    :param layout: If not None, a dictionary of layout properties.  Updates the show2d/show3d layout.
+    :param view: If not None, set the axes to this rectangle or box.  See show2d(...) and show3d(...).
+    :param binary: True or "f4" - Write coordinates as base64 typed arrays.  See plot.encode_trace(...).
+    :param origin: If not None, subtract this origin from all coordinates.  "auto" is not supported, as the plots
+                   are not known in advance.  See show2d(...).
+    :param decimals: If not None, round coordinates to this many decimal places.
+    :param digits: If not None, round coordinates to this many significant digits.
+    """
+    layout = figure_layout(dims, layout, view, origin)
+    f, close = open_output(file)
+    try:
+        f.write('{"data": [')
+        for i, plot in enumerate(plots):
+            f.write(",\n" if i else "\n")
+            f.write(plot_json(plot, dims, binary, origin, decimals, digits))
+        f.write('\n], "layout": ')
+        f.write(to_json(layout))
+        f.write("}\n")
+    finally:
+        if close:
+            f.close()
+
+    return
+
+
+html_head = """<html>
+<head><meta charset="utf-8" />{title}</head>
+<body>
+    <div id="{div_id}" class="plotly-graph-div" style="height:100vh; width:100%;"></div>
+    {plotlyjs}
+    <script type="text/javascript">
+        window.PLOTLYENV = window.PLOTLYENV || {{}};
+        Plotly.newPlot("{div_id}", ["""
+
+html_tail = """], {layout}, {{"responsive": true}});
+    </script>
+</body>
+</html>
+"""
+
+
+def write_html(plots, file, dims=2, layout=None, view=None, binary=False, origin=None, decimals=None, digits=None,
+               include_plotlyjs="cdn", title=None, div_id="shapely-plotly"):
+    """
+    Write a figure as a standalone HTML page, one plot at a time.
+
+    :param plots: Iterable of plots, Plotly graph objects or dictionaries.  E.g. a list, or iter_plots(...).
+    :param file: Path, or text file open for writing.
+    :param dims, layout, view, binary, origin, decimals, digits: See write_json(...).
+    :param include_plotlyjs: "cdn" - Load plotly.js from the Plotly CDN.  Needs internet access to view.
+                             True - Include plotly.js in the page.  Adds about 3.5MB.
+                             False - Do not load plotly.js.  The page must be embedded where it is already loaded.
+    :param title: If not None, the page title.
+    :param div_id: HTML id of the figure's div.
+    """
+    from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+    layout = figure_layout(dims, layout, view, origin)
+    if include_plotlyjs == "cdn":
+        plotlyjs = f'<script src="https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"></script>'
+    elif include_plotlyjs is True:
+        plotlyjs = f'<script type="text/javascript">{get_plotlyjs()}</script>'
+    else:
+        assert include_plotlyjs is False, f"Unknown include_plotlyjs option {repr(include_plotlyjs)}"
+        plotlyjs = ""
+
+    f, close = open_output(file)
+    try:
+        title = "" if title is None else f"<title>{html.escape(title)}</title>"
+        f.write(html_head.format(title=title, div_id=div_id, plotlyjs=plotlyjs))
+        for i, plot in enumerate(plots):
+            f.write(",\n" if i else "\n")
+            # "</" would end the script element.
+            f.write(plot_json(plot, dims, binary, origin, decimals, digits).replace("</", "<\\/"))
+        f.write(html_tail.format(layout=to_json(layout).replace("</", "<\\/")))
+    finally:
+        if close:
+            f.close()
+
+    return
@@ -3,7 +3,7 @@ Style management
 """
 
 from __future__ import annotations
-from weakref import WeakKeyDictionary
+from weakref import finalize
 
 import shapely as sh
 
@@ -56,6 +56,10 @@ class Style:
 
     """
 
+    __slots__ = ("_parent", "_line_style", "_vertex_style", "_hole_line_style", "_hole_vertex_style", "_fill_color",
+                 "_point_style", "_legend_group", "_scatter_kwargs", "_renderer", "_fill_3d",
+                 "_version", "_resolved")
+
     def __init__(self,
                  parent: Style = DEFAULT,
                  line_style=DEFAULT,
@@ -66,6 +70,8 @@ class Style:
                  point_style=DEFAULT,
                  legend_group=DEFAULT,
                  scatter_kwargs=DEFAULT,
+                 renderer=DEFAULT,
+                 fill_3d=DEFAULT,
                  ):
         """
         Construct a style.
@@ -86,7 +92,8 @@ class Style:
         :param hole_vertex_style: This marker style is used for the vertices for holes/voids inside a polygon.
                            None means no markers.
 
-        :param fill_color: This is the fill color used when drawing 2D polygons.  It is a plotly string color name.
+        :param fill_color: This is the fill color used when drawing 2D polygons, and 3D polygons if fill_3d is
+                           set.  It is a plotly string color name.
                            None means no fill.
 
         :param point_style: This marker style is used for Point/MultiPoint objects.
@@ -100,10 +107,20 @@ class Style:
                                 This will pass the same keyword argument twice, resulting in a Python error.
                                 These keywords arguments are passed verbatim to the Scatter(...) and are not
                                 examined by shapely_plotly.
+
+        :param renderer:  How 2D plots are rendered by Plotly.  One of:
+                          "svg" - Scatter plots, rendered via SVG.
+                          "webgl" - Scattergl plots, rendered via WebGL.  Much faster for large numbers of points.
+                                    SVG is still used for fills that Scattergl cannot draw (e.g. polygon holes).
+                          "auto" - WebGL for plots with at least shapely_plotly.plot.webgl_threshold points,
+                                   otherwise SVG.
+                          3D plots are always rendered with WebGL.
+
+        :param fill_3d:  If True, 3D polygons are filled with fill_color.  The polygons are triangulated, and
+                         drawn as a Plotly Mesh3d plot.  False means 3D polygons are outlined only.
         """
 
-        if parent is DEFAULT:
-            self.parent = default_style
+        self._parent = default_style if parent is DEFAULT else parent
         self._line_style = line_style
         self._vertex_style = vertex_style
         self._hole_line_style = hole_line_style
@@ -112,91 +129,197 @@ class Style:
         self._point_style = point_style
         self._legend_group = legend_group
         self._scatter_kwargs = scatter_kwargs
+        self._renderer = renderer
+        self._fill_3d = fill_3d
+        self._resolved = None
+        self.modified()
+        return
+
+    def modified(self):
+        """
+        Record that the style has changed.  This invalidates the resolved snapshots of the style and of the styles
+        inheriting from it.  Called by all the setters.
+        """
+        global style_version
+        style_version += 1
+        self._version = style_version
         return
 
-    # Style accessors.  If component is DEFAULT, get from parent, recursively.
+    def resolved(self):
+        """
+        Get the fully resolved style.  All DEFAULT components are replaced by the values from the parents.
+
+        The snapshot is cached, and rebuilt only after the style, or one of its parents, has been modified.
+        :return: ResolvedStyle
+        """
+        r = self._resolved
+        if (r is None) or (r.versions != self.chain_versions()):
+            r = self._resolved = ResolvedStyle(self)
+        return r
+
+    def chain_versions(self):
+        """
+        The modification versions of the style and its parents, in order.  See ResolvedStyle.versions.
+        """
+        versions = []
+        style = self
+        while style is not None:
+            versions.append(style._version)
+            style = style._parent
+        return tuple(versions)
+
+    @property
+    def version(self):
+        """
+        Version number of the resolved style.  This changes whenever the style, or any of its parents, is modified.
+        """
+        return self.resolved().version
+
+    @property
+    def parent(self):
+        return self._parent
+
+    @parent.setter
+    def parent(self, v):
+        self._parent = default_style if v is DEFAULT else v
+        self.modified()
+
+    # Style accessors.  If component is DEFAULT, get from parent, recursively, via the resolved snapshot.
     # Setters just reflect to the equivalent self._* field.
 
     @property
     def line_style(self):
-        if self._line_style is DEFAULT:
-            return self.parent.line_style
-        return self._line_style
+        return self.resolved().line_style
 
     @line_style.setter
     def line_style(self, v):
         self._line_style = v
+        self.modified()
 
     @property
     def vertex_style(self):
-        if self._vertex_style is DEFAULT:
-            return self.parent.vertex_style
-        return self._vertex_style
+        return self.resolved().vertex_style
 
     @vertex_style.setter
     def vertex_style(self, v):
         self._vertex_style = v
+        self.modified()
 
     @property
     def hole_line_style(self):
-        if self._hole_line_style is DEFAULT:
-            return self.parent.hole_line_style
-        return self._hole_line_style
+        return self.resolved().hole_line_style
 
     @hole_line_style.setter
     def hole_line_style(self, v):
         self._hole_line_style = v
+        self.modified()
 
     @property
     def hole_vertex_style(self):
-        if self._hole_vertex_style is DEFAULT:
-            return self.parent.hole_vertex_style
-        return self._hole_vertex_style
+        return self.resolved().hole_vertex_style
 
     @hole_vertex_style.setter
     def hole_vertex_style(self, v):
         self._hole_vertex_style = v
+        self.modified()
 
     @property
     def fill_color(self):
-        if self._fill_color is DEFAULT:
-            return self.parent.fill_color
-        return self._fill_color
+        return self.resolved().fill_color
 
     @fill_color.setter
     def fill_color(self, v):
         self._fill_color = v
+        self.modified()
 
     @property
     def point_style(self):
-        if self._point_style is DEFAULT:
-            return self.parent.point_style
-        return self._point_style
+        return self.resolved().point_style
 
     @point_style.setter
     def point_style(self, v):
         self._point_style = v
+        self.modified()
 
     #
     @property
     def legend_group(self):
-        if self._legend_group is DEFAULT:
-            return self.parent.legend_group
-        return self._legend_group
+        return self.resolved().legend_group
 
     @legend_group.setter
     def legend_group(self, v):
         self._legend_group = v
+        self.modified()
 
     @property
     def scatter_kwargs(self):
-        if self._scatter_kwargs is DEFAULT:
-            return self.parent.scatter_kwargs
-        return self._scatter_kwargs
+        return self.resolved().scatter_kwargs
 
     @scatter_kwargs.setter
     def scatter_kwargs(self, v):
         self._scatter_kwargs = v
+        self.modified()
+
+    @property
+    def renderer(self):
+        return self.resolved().renderer
+
+    @renderer.setter
+    def renderer(self, v):
+        self._renderer = v
+        self.modified()
+
+    @property
+    def fill_3d(self):
+        return self.resolved().fill_3d
+
+    @fill_3d.setter
+    def fill_3d(self, v):
+        self._fill_3d = v
+        self.modified()
+
+
+# Incremented every time any Style is modified, to give each modification a new version.  See Style.modified().
+style_version = 0
+
+
+class ResolvedStyle:
+    """
+    A snapshot of a fully resolved Style.  No components are DEFAULT.  See Style.resolved().
+
+    versions holds the modification versions of the style and its parents when the snapshot was built.  The
+    snapshot is valid as long as they are unchanged, so modifying unrelated styles does not invalidate it.
+    """
+
+    __slots__ = ("line_style", "vertex_style", "hole_line_style", "hole_vertex_style", "fill_color",
+                 "point_style", "legend_group", "scatter_kwargs", "renderer", "fill_3d",
+                 "version", "versions")
+
+    def __init__(self, style: Style):
+        parent = style._parent
+        if parent is None:
+            # Root style.  All components must be set.
+            parent = self
+            self.version = style._version
+            self.versions = (style._version,)
+        else:
+            parent = parent.resolved()
+            self.version = max(style._version, parent.version)
+            self.versions = (style._version,) + parent.versions
+
+        self.line_style = parent.line_style if style._line_style is DEFAULT else style._line_style
+        self.vertex_style = parent.vertex_style if style._vertex_style is DEFAULT else style._vertex_style
+        self.hole_line_style = \
+            parent.hole_line_style if style._hole_line_style is DEFAULT else style._hole_line_style
+        self.hole_vertex_style = \
+            parent.hole_vertex_style if style._hole_vertex_style is DEFAULT else style._hole_vertex_style
+        self.fill_color = parent.fill_color if style._fill_color is DEFAULT else style._fill_color
+        self.point_style = parent.point_style if style._point_style is DEFAULT else style._point_style
+        self.legend_group = parent.legend_group if style._legend_group is DEFAULT else style._legend_group
+        self.scatter_kwargs = parent.scatter_kwargs if style._scatter_kwargs is DEFAULT else style._scatter_kwargs
+        self.renderer = parent.renderer if style._renderer is DEFAULT else style._renderer
+        self.fill_3d = parent.fill_3d if style._fill_3d is DEFAULT else style._fill_3d
+        return
 
 
 # Default style definition.  Boring but pleasant green, except Polygon holes are red.  No markers except for points.
@@ -214,7 +337,9 @@ default_style = Style(
     fill_color=default_fill_color,
     point_style={"color": default_color, "size": 3, "symbol": "circle"},
     legend_group=None,
-    scatter_kwargs={}
+    scatter_kwargs={},
+    renderer="svg",
+    fill_3d=False
 )
 
 
@@ -239,16 +364,22 @@ class GeometryInfo:
     Shapely geometries are not normal Python objects, and we cannot add fields to them.
     Instead we keep meta-data (style, name) in a separate mapping from geometry objects to info.
     The mapping is weak, in that if the geometry object is collected, the mapping will be removed.
+
+    The mapping is keyed by object identity, not equality.  Shapely hashes geometries by their WKB, which costs
+    O(vertices) for every lookup, and equal geometries would share the same meta-data.
     """
 
+    __slots__ = ("style", "name")
+
     def __init__(self):
         self.style = DEFAULT
         self.name = None
         return
 
 
-# Mapping from geometry to meta-data
-global_geom_data = WeakKeyDictionary()
+# Mapping from id(geometry) to meta-data.
+# A weakref finalizer removes the entry when the geometry is collected, before its id can be reused.
+global_geom_data = {}
 
 
 def geom_get_info(geom):
@@ -258,11 +389,12 @@ def geom_get_info(geom):
     :param geom:  Shapely object.
     :return: GeometryInfo
     """
-    if geom in global_geom_data:
-        info = global_geom_data[geom]
-    else:
+    key = id(geom)
+    info = global_geom_data.get(key)
+    if info is None:
         info = GeometryInfo()
-        global_geom_data[geom] = info
+        global_geom_data[key] = info
+        finalize(geom, global_geom_data.pop, key, None)
 
     return info
 
@@ -292,7 +424,7 @@ def geom_set_line_style(geom, line_style):
     if info.style is DEFAULT:
         info.style = Style()
 
-    info.style._line_style = line_style
+    info.style.line_style = line_style
     return
 
 
@@ -308,7 +440,7 @@ def geom_set_vertex_style(geom, vertex_style):
     if info.style is DEFAULT:
         info.style = Style()
 
-    info.style._vertex_style = vertex_style
+    info.style.vertex_style = vertex_style
     return
 
 
@@ -324,7 +456,7 @@ def geom_set_hole_line_style(geom, hole_line_style):
     if info.style is DEFAULT:
         info.style = Style()
 
-    info.style._hole_line_style = hole_line_style
+    info.style.hole_line_style = hole_line_style
     return
 
 
@@ -340,7 +472,7 @@ def geom_set_hole_vertex_style(geom, hole_vertex_style):
     if info.style is DEFAULT:
         info.style = Style()
 
-    info.style._hole_vertex_style = hole_vertex_style
+    info.style.hole_vertex_style = hole_vertex_style
     return
 
 
@@ -356,7 +488,7 @@ def geom_set_fill_color(geom, fill_color):
     if info.style is DEFAULT:
         info.style = Style()
 
-    info.style._fill_color = fill_color
+    info.style.fill_color = fill_color
     return
 
 
@@ -372,7 +504,7 @@ def geom_set_point_style(geom, point_style):
     if info.style is DEFAULT:
         info.style = Style()
 
-    info.style._point_style = point_style
+    info.style.point_style = point_style
     return
 
 
@@ -388,7 +520,7 @@ def geom_set_legend_group(geom, legend_group):
     if info.style is DEFAULT:
         info.style = Style()
 
-    info.style._legend_group = legend_group
+    info.style.legend_group = legend_group
     return
 
 
@@ -404,7 +536,39 @@ def geom_set_scatter_kwargs(geom, scatter_kwargs):
     if info.style is DEFAULT:
         info.style = Style()
 
-    info.style._scatter_kwargs = scatter_kwargs
+    info.style.scatter_kwargs = scatter_kwargs
+    return
+
+
+def geom_set_renderer(geom, renderer):
+    """
+    Set the 2D renderer for a geometry: "svg", "webgl" or "auto".
+    Note, this will change the renderer for all objects using that style.
+
+    :param geom:  Shapely object.
+    :param renderer: New renderer.
+    """
+    info = geom_get_info(geom)
+    if info.style is DEFAULT:
+        info.style = Style()
+
+    info.style.renderer = renderer
+    return
+
+
+def geom_set_fill_3d(geom, fill_3d):
+    """
+    Set whether 3D polygons are filled for a geometry.
+    Note, this will change the 3D fill for all objects using that style.
+
+    :param geom:  Shapely object.
+    :param fill_3d: True to fill 3D polygons.
+    """
+    info = geom_get_info(geom)
+    if info.style is DEFAULT:
+        info.style = Style()
+
+    info.style.fill_3d = fill_3d
     return
 
 
@@ -453,6 +617,8 @@ for cl in [sh.Point, sh.Polygon, sh.LineString, sh.LinearRing, sh.MultiPoint,
     cl.plotly_set_point_style = geom_set_point_style
     cl.plotly_set_legend_group = geom_set_legend_group
     cl.plotly_set_scatter_kwargs = geom_set_scatter_kwargs
+    cl.plotly_set_renderer = geom_set_renderer
+    cl.plotly_set_fill_3d = geom_set_fill_3d
     cl.plotly_get_name = geom_get_name
     cl.plotly_get_style = geom_get_style
 
@@ -478,10 +644,7 @@ def resolve_info(geom, style, name, legend_group, show_legend):
 
     # We will need to get info if either is DEFAULT
     if (style is DEFAULT) or (name is DEFAULT):
-        if geom in global_geom_data:
-            info = global_geom_data[geom]
-        else:
-            info = default_info
+        info = global_geom_data.get(id(geom), default_info)
 
     # Resolve style
     #  1) Value passed in
@@ -0,0 +1,48 @@
+"""
+Check the benchmark suite runs, and produces machine readable results.
+"""
+
+import json
+
+from shapely_plotly.tests.utils.run_main import run_main, TDef
+from shapely_plotly.benchmarks import bench_plot
+
+test_list = []
+
+
+def test_benchmark():
+    """
+    Run every benchmark on a tiny case.
+    """
+    res = bench_plot.run_benchmarks(geoms=[3], vertices=[200], repeat=1)
+    res = json.loads(json.dumps(res))
+
+    assert [r["name"] for r in res["results"]] == [b.name for b in bench_plot.bench_list]
+    for r in res["results"]:
+        assert r["geometries"] == 3
+        assert r["vertices"] > 0
+        assert r["traces"] > 0
+        assert r["time_s"] > 0.0
+        assert r["peak_bytes"] > 0
+        assert r["json_bytes"] > 0
+    assert res["meta"]["import_s"] > 0.0
+    assert res["meta"]["import_plotly_s"] >= 0.0
+
+    # Unvalidated runs, selected by name.
+    res = bench_plot.run_benchmarks(["plot_polygon.*"], geoms=[2], vertices=[100], repeat=1, validate=False)
+    assert [r["name"] for r in res["results"]] == ["plot_polygon3d", "plot_polygon2d"]
+    assert not res["meta"]["validate"]
+
+    # Typed arrays make smaller figures.
+    res = bench_plot.run_benchmarks(["draw_many2d"], geoms=[5], vertices=[2000], repeat=1)
+    res_f4 = bench_plot.run_benchmarks(["draw_many2d"], geoms=[5], vertices=[2000], repeat=1, binary="f4")
+    assert res_f4["meta"]["binary"] == "f4"
+    assert res_f4["results"][0]["json_bytes"] < res["results"][0]["json_bytes"]
+    return
+
+
+test_list.append(TDef(test_benchmark))
+
+
+if __name__ == "__main__":
+    run_main(test_list)
@@ -0,0 +1,118 @@
+"""
+Check figures with coordinates encoded as typed arrays.
+"""
+
+import base64
+import random as rnd
+import numpy as np
+import plotly.io as pio
+
+from shapely_plotly.tests.utils.rnd_shapes import rnd_geom_classes
+from shapely_plotly.tests.utils.rnd_shapes_3d import rnd_geom_classes as rnd_geom_classes_3d
+from shapely_plotly.tests.utils.utils import rnd_style
+from shapely_plotly.tests.utils.run_main import run_main, TDef, start_end_id
+
+import shapely_plotly as shpl
+
+test_list = []
+
+
+def decode(typed):
+    """
+    Decode a Plotly typed array.
+    """
+    return np.frombuffer(base64.b64decode(typed["bdata"]), dtype="<" + typed["dtype"])
+
+
+def do_test_binary(test_num, show, dims, test_name):
+    test_start, test_end = start_end_id(test_num, 100, 200)
+    for test_num in range(test_start, test_end):
+        rnd.seed(test_num)
+
+        geoms = []
+        for i in range(rnd.randrange(1, 20)):
+            x, y = (i % 5) * 5.0, (i // 5) * 5.0
+            if dims == 3:
+                geom, _ = rnd.choice(rnd_geom_classes_3d).rnd_shape_3d(x, y, -1.0, 4.0, 4.0, 2.0)
+            else:
+                geom, _ = rnd.choice(rnd_geom_classes).rnd_shape_2d(x, y, 4.0, 4.0)
+            geoms.append(geom)
+
+        style = rnd_style(False)
+        if dims == 3:
+            style.fill_3d = rnd.choice((True, False))
+
+        plot_data = []
+        shpl.draw_many(geoms, plot_data, style=style, dims=dims)
+
+        show_f = shpl.show3d if dims == 3 else shpl.show2d
+        fig = show_f(plot_data, show=False, validate=False)
+        fig_f8 = show_f(plot_data, show=show, binary=True)
+        fig_f4 = show_f(plot_data, show=False, validate="sample", binary="f4")
+
+        for plot_obj, plot_f8, plot_f4 in zip(fig["data"], fig_f8["data"], fig_f4["data"]):
+            for key in ("x", "y", "z", "i", "j", "k"):
+                if key not in plot_obj:
+                    assert (key not in plot_f8) and (key not in plot_f4), f'{test_name}[{test_num}]'
+                    continue
+
+                expected = np.asarray(plot_obj[key])
+                if key in ("i", "j", "k"):
+                    assert plot_f8[key]["dtype"] == plot_f4[key]["dtype"] == "i4", f'{test_name}[{test_num}]'
+                    assert np.array_equal(decode(plot_f8[key]), expected), f'{test_name}[{test_num}]'
+                    assert np.array_equal(decode(plot_f4[key]), expected), f'{test_name}[{test_num}]'
+                else:
+                    assert np.array_equal(decode(plot_f8[key]), expected, equal_nan=True), f'{test_name}[{test_num}]'
+                    assert np.array_equal(decode(plot_f4[key]), expected.astype(np.float32), equal_nan=True), \
+                        f'{test_name}[{test_num}]'
+
+            # Everything else is unchanged.
+            others = set(plot_obj) - {"x", "y", "z", "i", "j", "k"}
+            assert {k: plot_f8[k] for k in others} == {k: plot_obj[k] for k in others}, f'{test_name}[{test_num}]'
+
+    return
+
+
+def test_binary2d(test_num=None, show=False):
+    """
+    Self-checking randoms.  Typed array figures have the same coordinates - 2D.
+    """
+    do_test_binary(test_num, show, 2, "test_binary2d")
+    return
+
+
+test_list.append(TDef(test_binary2d, has_id=True, has_show=True))
+
+
+def test_binary3d(test_num=None, show=False):
+    """
+    Self-checking randoms.  Typed array figures have the same coordinates and mesh indexes - 3D.
+    """
+    do_test_binary(test_num, show, 3, "test_binary3d")
+    return
+
+
+test_list.append(TDef(test_binary3d, has_id=True, has_show=True))
+
+
+def test_binary_size():
+    """
+    Typed arrays are much smaller than decimal JSON.
+    """
+    rnd.seed(0)
+    coords = np.array([(rnd.uniform(0.0, 1e6), rnd.uniform(0.0, 1e6)) for _ in range(10000)])
+    plot_data = [dict(type="scatter", x=coords[:, 0], y=coords[:, 1], mode="lines")]
+
+    size = len(pio.to_json(shpl.show2d(plot_data, show=False, validate=False), validate=False))
+    size_f8 = len(pio.to_json(shpl.show2d(plot_data, show=False, validate=False, binary=True), validate=False))
+    size_f4 = len(pio.to_json(shpl.show2d(plot_data, show=False, validate=False, binary="f4"), validate=False))
+    assert size_f8 < size * 0.7
+    assert size_f4 < size_f8 * 0.6
+    return
+
+
+test_list.append(TDef(test_binary_size))
+
+
+if __name__ == "__main__":
+    run_main(test_list)
@@ -0,0 +1,172 @@
+"""
+Check bulk plotting via draw_many.
+"""
+
+import random as rnd
+import numpy as np
+import shapely as shp
+
+from shapely_plotly.tests.utils.rnd_shapes import rnd_geom_classes
+from shapely_plotly.tests.utils.rnd_shapes_3d import rnd_geom_classes as rnd_geom_classes_3d
+from shapely_plotly.tests.utils.utils import rnd_style, rnd_string
+from shapely_plotly.tests.utils.run_main import run_main, TDef, start_end_id
+
+import shapely_plotly as shpl
+
+test_list = []
+
+
+def plot_coord_set(plot_data, dims):
+    """
+    Set of all (x, y[, z]) coordinates drawn by the plots.  Gaps are skipped.
+    """
+    coords = set()
+    for plot_obj in plot_data:
+        axes = [plot_obj.x, plot_obj.y] + ([plot_obj.z] if dims == 3 else [])
+        for c in zip(*axes):
+            if not np.isnan(c[0]):
+                coords.add(tuple(float(v) for v in c))
+
+    return coords
+
+
+def geom_coord_set(geoms, dims):
+    """
+    Set of all (x, y[, z]) coordinates of the geometries.
+    """
+    coords = shp.get_coordinates(geoms, include_z=(dims == 3))
+    if dims == 3:
+        coords[np.isnan(coords[:, 2]), 2] = 0.0
+
+    return set(tuple(float(v) for v in c) for c in coords)
+
+
+def check_legend(plot_data, name, max_plots):
+    """
+    All the plots must share one legend entry.
+    """
+    assert 0 < len(plot_data) <= max_plots
+    assert [p.showlegend for p in plot_data] == [name is not None] + [False] * (len(plot_data) - 1)
+    assert all(p.name == name for p in plot_data)
+    assert len(set(p.legendgroup for p in plot_data)) == 1
+
+
+def do_test_draw_many(test_num, show, dims, test_name):
+    test_start, test_end = start_end_id(test_num, 100, 200)
+    for test_num in range(test_start, test_end):
+        rnd.seed(test_num)
+
+        n = rnd.randrange(1, 20)
+        geoms = []
+        for i in range(n):
+            if dims == 3:
+                geom, _ = rnd.choice(rnd_geom_classes_3d).rnd_shape_3d(i * 5.0, 0.0, -1.0, 4.0, 4.0, 2.0)
+            else:
+                geom, _ = rnd.choice(rnd_geom_classes).rnd_shape_2d(i * 5.0, 0.0, 4.0, 4.0)
+            geoms.append(geom)
+
+        # Lines and markers are always drawn, so every coordinate is visible.
+        style = rnd_style(False)
+        name = rnd.choice((None, rnd_string()))
+
+        plot_data = []
+        shpl.draw_many(geoms, plot_data, style=style, name=name, dims=dims)
+
+        if show:
+            shpl.show3d(plot_data) if dims == 3 else shpl.show2d(plot_data)
+
+        check_legend(plot_data, name, 4 if dims == 3 else 5)
+        assert plot_coord_set(plot_data, dims) == geom_coord_set(geoms, dims), f'{test_name}[{test_num}]'
+
+    return
+
+
+def test_draw_many2d(test_num=None, show=False):
+    """
+    Self-checking randoms for bulk plotting of mixed geometries - 2D.
+    """
+    do_test_draw_many(test_num, show, 2, "test_draw_many2d")
+    return
+
+
+test_list.append(TDef(test_draw_many2d, has_id=True, has_show=True))
+
+
+def test_draw_many3d(test_num=None, show=False):
+    """
+    Self-checking randoms for bulk plotting of mixed geometries - 3D.
+    """
+    do_test_draw_many(test_num, show, 3, "test_draw_many3d")
+    return
+
+
+test_list.append(TDef(test_draw_many3d, has_id=True, has_show=True))
+
+
+def test_draw_many_merge2d(test_num=None, show=False):
+    """
+    Self-checking randoms for merging geometries by their own styles and names - 2D.
+    """
+    test_start, test_end = start_end_id(test_num, 100, 200)
+    for test_num in range(test_start, test_end):
+        rnd.seed(test_num)
+
+        # A few (style, name) pairs, each with a unique name so the plots can be traced back to them.
+        num_groups = rnd.randrange(1, 5)
+        infos = [(rnd_style(False), f"group_{i}") for i in range(num_groups)]
+
+        n = rnd.randrange(1, 30)
+        geoms = []
+        group_geoms = {name: [] for _, name in infos}
+        for i in range(n):
+            geom, _ = rnd.choice(rnd_geom_classes).rnd_shape_2d(i * 5.0, 0.0, 4.0, 4.0)
+            style, name = rnd.choice(infos)
+            geom.plotly_set_style(style)
+            geom.plotly_set_name(name)
+            geoms.append(geom)
+            group_geoms[name].append(geom)
+
+        plot_data = []
+        shpl.draw_many(geoms, plot_data)
+
+        if show:
+            shpl.show2d(plot_data)
+
+        for name, g_geoms in group_geoms.items():
+            g_plot_data = [p for p in plot_data if p.name == name]
+            if len(g_geoms) == 0:
+                assert len(g_plot_data) == 0
+                continue
+
+            check_legend(g_plot_data, name, 5)
+            assert plot_coord_set(g_plot_data, 2) == geom_coord_set(g_geoms, 2), \
+                f'test_draw_many_merge2d[{test_num}]'
+
+        # Unmerged draws every geometry individually.
+        plot_data = []
+        shpl.draw_many(geoms, plot_data, merge=False)
+        assert sum(p.showlegend for p in plot_data) == n
+
+    return
+
+
+test_list.append(TDef(test_draw_many_merge2d, has_id=True, has_show=True))
+
+
+def test_draw_many_empty():
+    """
+    Empty inputs, missing geometries and empty geometries produce no plots.
+    """
+    plot_data = []
+    shpl.draw_many([], plot_data)
+    shpl.draw_many(np.array([None, shp.Polygon(), shp.LineString()], dtype=object), plot_data)
+    shpl.draw_many([shp.MultiPoint(), shp.GeometryCollection()], plot_data, dims=3)
+    assert plot_data == []
+    return
+
+
+test_list.append(TDef(test_draw_many_empty))
+
+
+if __name__ == "__main__":
+    run_main(test_list)
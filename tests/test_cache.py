@@ -0,0 +1,203 @@
+"""
+Check the trace cache of draw_many(...).
+"""
+
+import os
+import sys
+import json
+import tempfile
+import warnings
+import subprocess
+import random as rnd
+import numpy as np
+import shapely as shp
+
+from shapely_plotly.tests.utils.utils import rnd_string, rnd_geoms, figure_data
+from shapely_plotly.tests.utils.run_main import run_main, TDef, start_end_id
+
+import shapely_plotly as shpl
+
+test_list = []
+
+
+def do_test_cache(test_num, show, dims, test_name):
+    test_start, test_end = start_end_id(test_num, 100, 150)
+    try:
+        for test_num in range(test_start, test_end):
+            rnd.seed(test_num)
+            geoms = rnd_geoms(dims, rnd.randrange(1, 30))
+            colors = rnd.choice((None, np.array([rnd.uniform(0.0, 1.0) for _ in geoms])))
+            kwargs = dict(dims=dims, colors=colors, max_traces=rnd.choice((None, 4)),
+                          view=rnd.choice((None, (2.0, 2.0, 17.0, 13.0))), tolerance=rnd.choice((None, 0.2)))
+            shpl.set_trace_validation(rnd.choice((False, True)))
+            cache = shpl.TraceCache(key=rnd.choice(("wkb", "id")))
+
+            # Cached plots are the same as drawn plots.
+            plot_data = []
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                shpl.draw_many(geoms, plot_data, **kwargs)
+                for i in range(3):
+                    plot_data_cached = []
+                    shpl.draw_many(geoms, plot_data_cached, cache=cache, **kwargs)
+                    assert figure_data(plot_data_cached, dims) == figure_data(plot_data, dims), \
+                        f'{test_name}[{test_num}]'
+                    assert (cache.hits, cache.misses) == (i, 1), f'{test_name}[{test_num}]'
+
+                # Changing a style, or a name, is a miss.
+                geoms[0].plotly_get_style().fill_color = shpl.rgb(1, 2, 3)
+                shpl.draw_many(geoms, [], cache=cache, **kwargs)
+                assert (cache.hits, cache.misses) == (2, 2), f'{test_name}[{test_num}]'
+                geoms[0].plotly_set_name(rnd_string())
+                shpl.draw_many(geoms, [], cache=cache, **kwargs)
+                assert (cache.hits, cache.misses) == (2, 3), f'{test_name}[{test_num}]'
+
+            if show:
+                show_f = shpl.show3d if dims == 3 else shpl.show2d
+                show_f(plot_data_cached)
+    finally:
+        shpl.set_trace_validation(True)
+
+    return
+
+
+def test_cache2d(test_num=None, show=False):
+    """
+    Self-checking randoms.  Cached plots are the same as drawn plots - 2D.
+    """
+    do_test_cache(test_num, show, 2, "test_cache2d")
+    return
+
+
+test_list.append(TDef(test_cache2d, has_id=True, has_show=True))
+
+
+def test_cache3d(test_num=None, show=False):
+    """
+    Self-checking randoms.  Cached plots are the same as drawn plots - 3D.
+    """
+    do_test_cache(test_num, show, 3, "test_cache3d")
+    return
+
+
+test_list.append(TDef(test_cache3d, has_id=True, has_show=True))
+
+
+def test_cache_keys():
+    """
+    Identity and WKB keys, legend groups of cached plots, and the memory bound.
+    """
+    polys = [shp.box(i, 0.0, i + 0.5, 0.5).difference(shp.box(i + 0.1, 0.1, i + 0.2, 0.2)) for i in range(100)]
+    copies = [shp.from_wkb(shp.to_wkb(p)) for p in polys]
+
+    # Equal geometries hit by WKB, and only the same objects hit by identity.
+    for key, hits in (("wkb", 2), ("id", 1)):
+        cache = shpl.TraceCache(key=key)
+        for geoms in (polys, polys, copies):
+            shpl.draw_many(geoms, [], name="Polys", cache=cache)
+        assert cache.hits == hits
+        assert cache.misses == 3 - hits
+
+    # Every use of cached plots generates new legend groups.
+    with shpl.legend_scope():
+        plot_data = []
+        shpl.draw_many(polys, plot_data, name="Polys", cache=cache)
+        shpl.draw_many(polys, plot_data, name="Polys", cache=cache)
+    groups = [p.legendgroup for p in plot_data]
+    assert groups[0:len(groups) // 2] == ["shapely_plotly_0"] * (len(groups) // 2)
+    assert groups[len(groups) // 2:] == ["shapely_plotly_1"] * (len(groups) // 2)
+
+    # Least recently used entries are dropped to stay within the memory bound.
+    entry_bytes = cache.num_bytes // len(cache)
+    cache = shpl.TraceCache(max_bytes=int(2.5 * entry_bytes), key="id")
+    for i in range(4):
+        shpl.draw_many(polys, [], name=f"Polys {i}", cache=cache)
+    assert (len(cache), cache.evictions) == (2, 2)
+    assert cache.num_bytes <= cache.max_bytes
+    shpl.draw_many(polys, [], name="Polys 3", cache=cache)
+    shpl.draw_many(polys, [], name="Polys 0", cache=cache)
+    assert (cache.hits, cache.misses) == (1, 5)
+
+    # Too large to cache.
+    cache = shpl.TraceCache(max_bytes=100)
+    shpl.draw_many(polys, [], cache=cache)
+    assert (len(cache), cache.num_bytes) == (0, 0)
+    return
+
+
+test_list.append(TDef(test_cache_keys))
+
+
+# Run in a fresh interpreter.  Draws a layer with a DiskCache, and prints the figure and the cache counters.
+disk_script = """
+import sys, json
+import shapely as shp
+import plotly.io as pio
+import shapely_plotly as shpl
+
+style = shpl.Style(line_style=dict(color="rgb(200,0,0)", width=2), fill_color="rgba(200,0,0,0.2)")
+polys = [shp.box(i, 0.0, i + 0.5, 0.5).difference(shp.box(i + 0.1, 0.1, i + 0.2, 0.2)) for i in range(50)]
+lines = [shp.LineString([(i, 1.0), (i + 0.5, 1.5), (i, 2.0)]) for i in range(50)]
+
+cache = shpl.DiskCache(sys.argv[1])
+shpl.set_trace_validation(False)
+plot_data = []
+shpl.draw_many(polys + lines, plot_data, style=style, name="Layer", cache=cache, tolerance=0.01)
+fig = shpl.show2d(plot_data, show=False, validate=False)
+print(json.dumps(dict(hits=cache.hits, misses=cache.misses, fig=pio.to_json(fig, validate=False))))
+"""
+
+
+def test_disk_cache():
+    """
+    Plots cached on disk are used by a new process, and are memory-mapped.
+    """
+    rnd.seed(0)
+    geoms = rnd_geoms(2, 20)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Keys are the same in every process.
+        res = []
+        for _ in range(2):
+            out = subprocess.run([sys.executable, "-c", disk_script, cache_dir], env=env, check=True,
+                                 capture_output=True, text=True).stdout
+            res.append(json.loads(out.splitlines()[-1]))
+        assert [(r["hits"], r["misses"]) for r in res] == [(0, 1), (1, 0)]
+        assert res[1]["fig"] == res[0]["fig"]
+
+        plot_data = []
+        shpl.draw_many(geoms, plot_data)
+        cache = shpl.DiskCache(cache_dir)
+        assert len(cache) == 1
+        for validate in (True, False, True):
+            shpl.set_trace_validation(validate)
+            try:
+                plot_data_cached = []
+                shpl.draw_many(geoms, plot_data_cached, cache=cache)
+            finally:
+                shpl.set_trace_validation(True)
+            assert figure_data(plot_data_cached, 2) == figure_data(plot_data, 2)
+        assert (cache.hits, cache.misses) == (2, 1)
+        assert isinstance(plot_data_cached[0].x, np.ndarray)
+
+        # Coordinates are memory-mapped from the cache files.
+        shpl.set_trace_validation(False)
+        try:
+            plot_data_cached = []
+            shpl.draw_many(geoms, plot_data_cached, cache=shpl.DiskCache(cache_dir))
+        finally:
+            shpl.set_trace_validation(True)
+        assert isinstance(plot_data_cached[0]["x"], np.memmap)
+        del plot_data_cached
+
+        cache.clear()
+        assert len(cache) == 0
+    return
+
+
+test_list.append(TDef(test_disk_cache))
+
+
+if __name__ == "__main__":
+    run_main(test_list)
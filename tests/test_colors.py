@@ -0,0 +1,276 @@
+"""
+Check per-geometry colors and sizes in draw_many, and per-point colors and sizes for MultiPoint.
+"""
+
+import random as rnd
+import warnings
+import numpy as np
+import shapely as shp
+
+from shapely_plotly.tests.utils.rnd_shapes import rnd_geom_classes
+from shapely_plotly.tests.utils.rnd_shapes_3d import rnd_geom_classes as rnd_geom_classes_3d
+from shapely_plotly.tests.utils.utils import rnd_style, rnd_string
+from shapely_plotly.tests.utils.run_main import run_main, TDef, start_end_id
+from shapely_plotly.tests.test_bulk import check_legend
+
+import shapely_plotly as shpl
+
+test_list = []
+
+
+def vertex_colors(plot_obj, key):
+    """
+    Map of (x, y[, z]) -> color for a plot's per-vertex line or marker colors.  Gaps are skipped.
+    """
+    style = getattr(plot_obj, key)
+    if (style is None) or (style.color is None) or isinstance(style.color, str):
+        return {}
+
+    axes = [plot_obj.x, plot_obj.y] + ([plot_obj.z] if plot_obj.type == "scatter3d" else [])
+    assert len(style.color) == len(axes[0])
+    return {tuple(float(v) for v in c): color for *c, color in zip(*axes, style.color) if not np.isnan(c[0])}
+
+
+def do_test_colors(test_num, show, dims, test_name):
+    test_start, test_end = start_end_id(test_num, 100, 200)
+    for test_num in range(test_start, test_end):
+        rnd.seed(test_num)
+
+        # Geometries on a grid, so that no two share a vertex.
+        geoms = []
+        for i in range(rnd.randrange(1, 30)):
+            x, y = (i % 6) * 5.0, (i // 6) * 5.0
+            if dims == 3:
+                geom, _ = rnd.choice(rnd_geom_classes_3d).rnd_shape_3d(x, y, -1.0, 4.0, 4.0, 2.0)
+            else:
+                geom, _ = rnd.choice(rnd_geom_classes).rnd_shape_2d(x, y, 4.0, 4.0)
+            geoms.append(geom)
+
+        colors = [rnd.uniform(-10.0, 10.0) for _ in geoms]
+        style = rnd_style(False)
+        name = rnd.choice((None, rnd_string()))
+
+        plot_data = []
+        shpl.draw_many(geoms, plot_data, style=style, name=name, dims=dims, colors=colors, colorscale="Viridis")
+
+        if show:
+            shpl.show3d(plot_data) if dims == 3 else shpl.show2d(plot_data)
+
+        # Colors do not add plots.
+        check_legend(plot_data, name, 4 if dims == 3 else 5)
+
+        # Each colored vertex has the color of its geometry.
+        expected = {}
+        for geom, color in zip(geoms, colors):
+            coords = shp.get_coordinates(geom, include_z=(dims == 3))
+            if dims == 3:
+                coords[np.isnan(coords[:, 2]), 2] = 0.0
+            expected.update((tuple(float(v) for v in c), color) for c in coords)
+
+        for plot_obj in plot_data:
+            for key in ("line", "marker") if dims == 3 else ("marker",):
+                for c, color in vertex_colors(plot_obj, key).items():
+                    assert expected[c] == color, f'{test_name}[{test_num}]'
+
+                c_style = getattr(plot_obj, key)
+                if isinstance(c_style.color, tuple):
+                    assert c_style.cmin == min(colors), f'{test_name}[{test_num}]'
+                    assert c_style.cmax == max(colors), f'{test_name}[{test_num}]'
+
+    return
+
+
+def test_colors2d(test_num=None, show=False):
+    """
+    Self-checking randoms.  Geometries are colored by a value per geometry - 2D.
+    """
+    do_test_colors(test_num, show, 2, "test_colors2d")
+    return
+
+
+test_list.append(TDef(test_colors2d, has_id=True, has_show=True))
+
+
+def test_colors3d(test_num=None, show=False):
+    """
+    Self-checking randoms.  Geometries are colored by a value per geometry - 3D.
+    """
+    do_test_colors(test_num, show, 3, "test_colors3d")
+    return
+
+
+test_list.append(TDef(test_colors3d, has_id=True, has_show=True))
+
+
+def test_colors_lines():
+    """
+    Differently colored lines are drawn as a single plot, with colors per vertex.  Missing and culled geometries
+    keep the colors aligned.
+    """
+    lines = [shp.LineString([(i, 0, 0), (i, 1, 1), (i, 2, 0)]) for i in range(4)]
+    geoms = [lines[0], None, lines[1], lines[2], lines[3]]
+    colors = ["red", "black", "green", "blue", "yellow"]
+
+    plot_data = []
+    shpl.draw_many(geoms, plot_data, style=shpl.Style(line_style=dict(width=4)), dims=3, colors=colors,
+                   view=(-0.5, -0.5, 2.5, 2.5))
+    assert len(plot_data) == 1
+    assert plot_data[0].line.width == 4
+    assert plot_data[0].line.color == ("red",) * 4 + ("green",) * 4 + ("blue",) * 3
+
+    # Numbers and a colorscale.
+    plot_data = []
+    shpl.draw_many(lines, plot_data, dims=3, colors=[1, 2, 3, 4], colorscale=[[0, "red"], [1, "blue"]], cmax=10)
+    assert len(plot_data) == 1
+    line = plot_data[0].line
+    assert tuple(line.color) == (1,) * 4 + (2,) * 4 + (3,) * 4 + (4,) * 3
+    assert (line.cmin, line.cmax) == (1, 10)
+    assert line.colorscale == ((0, "red"), (1, "blue"))
+
+    # 2D lines cannot vary in color.  Only the markers are colored.
+    plot_data = []
+    shpl.draw_many(lines, plot_data, style=shpl.Style(vertex_style=dict(size=3)), colors=[1, 2, 3, 4])
+    assert len(plot_data) == 1
+    assert not isinstance(plot_data[0].line.color, tuple)
+    assert tuple(plot_data[0].marker.color) == (1,) * 4 + (2,) * 4 + (3,) * 4 + (4,) * 3
+    return
+
+
+test_list.append(TDef(test_colors_lines))
+
+
+def test_colors_points():
+    """
+    MultiPoint colors and sizes per point, and draw_many sizes per geometry.
+    """
+    mp = shp.MultiPoint([(0, 0, 1), (1, 0, 2), (2, 1, 3)])
+    style = shpl.Style(point_style=dict(symbol="cross", size=5, color="red"))
+
+    for draw, dims in ((mp.plotly_draw2d, 2), (mp.plotly_draw3d, 3)):
+        plot_data = []
+        draw(plot_data, style=style, colors=[0.5, 1.0, 2.0], sizes=[3, 4, 5], colorscale="Viridis")
+        assert len(plot_data) == 1
+        marker = plot_data[0].marker
+        assert marker.symbol == "cross"
+        assert tuple(marker.color) == (0.5, 1.0, 2.0)
+        assert tuple(marker.size) == (3, 4, 5)
+        assert (marker.cmin, marker.cmax) == (0.5, 2.0)
+
+        plot_data = []
+        draw(plot_data, style=style, colors=["red", "green", "blue"])
+        assert plot_data[0].marker.color == ("red", "green", "blue")
+        assert plot_data[0].marker.size == 5
+
+        # Nothing given, the style is used as it is.
+        plot_data = []
+        draw(plot_data, style=style)
+        assert plot_data[0].marker.color == "red"
+
+    # Points and a MultiPoint, one size per geometry.
+    geoms = [shp.Point(5, 5), mp, shp.Point(6, 6)]
+    plot_data = []
+    shpl.draw_many(geoms, plot_data, style=style, sizes=[10, 20, 30], colors=[1, 2, 3])
+    assert len(plot_data) == 1
+    assert tuple(plot_data[0].marker.size) == (10, 20, 20, 20, 30)
+    assert tuple(plot_data[0].marker.color) == (1, 2, 2, 2, 3)
+    return
+
+
+test_list.append(TDef(test_colors_points))
+
+
+def draw_warnings(*args, **kwargs):
+    """
+    Call draw_many(...), and return the messages of the warnings issued.
+    """
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        shpl.draw_many(*args, **kwargs)
+    return [str(w.message) for w in caught]
+
+
+def test_colors_buckets():
+    """
+    2D lines are colored with a bounded number of plots.  Warns when the quantization is visible.
+    """
+    lines = [shp.LineString([(i, 0), (i, 1)]) for i in range(100)]
+    colors = np.arange(100.0)
+    style = shpl.Style(line_style=dict(width=2), vertex_style=dict(size=4))
+
+    plot_data = []
+    msgs = draw_warnings(lines, plot_data, style=style, name="Lines", colors=colors, max_traces=4)
+    assert len(msgs) == 1 and msgs[0].startswith("Quantizing colors")
+
+    assert len(plot_data) == 4
+    check_legend(plot_data, "Lines", 4)
+    for i, plot_obj in enumerate(plot_data):
+        assert plot_obj.line.width == 2
+        assert isinstance(plot_obj.line.color, str)
+        # Markers keep their exact colors.
+        assert set(plot_obj.marker.color) == set(range(i * 25, (i + 1) * 25))
+
+    # Enough buckets for every color.  Nothing to warn about.
+    plot_data = []
+    assert draw_warnings(lines, plot_data, style=style, colors=colors, max_traces=1000) == []
+    assert len(plot_data) == 100
+
+    # Buckets are shared between style groups.
+    styles = [shpl.Style(line_style=dict(width=w)) for w in (1, 2)]
+    for i, line in enumerate(lines):
+        line.plotly_set_style(styles[i % 2])
+    plot_data = []
+    assert len(draw_warnings(lines, plot_data, colors=colors, max_traces=10)) == 1
+    assert len(plot_data) == 10
+
+    # 3D lines are colored per vertex.  No buckets are needed.
+    plot_data = []
+    shpl.draw_many(lines, plot_data, style=style, colors=colors, max_traces=4, dims=3)
+    assert len(plot_data) == 1
+    return
+
+
+test_list.append(TDef(test_colors_buckets))
+
+
+def test_colors_budget():
+    """
+    max_traces bounds the plots, not just the buckets.  NaN colors are bucketed.
+    """
+    polys = [shp.box(i, 0, i + 0.8, 0.8).difference(shp.box(i + 0.2, 0.2, i + 0.4, 0.4)) for i in range(50)]
+    lines = [shp.LineString([(i, 1), (i, 2)]) for i in range(50)]
+    points = [shp.Point(i, 3) for i in range(50)]
+    colors = np.tile(np.arange(50.0), 3)
+    style = shpl.Style(line_style=dict(width=2), hole_line_style=dict(width=1), fill_color="rgba(0,0,0,0.2)",
+                       point_style=dict(size=4))
+
+    # Each bucket takes five plots: polygon fill, exteriors and holes, lines and points.
+    for max_traces in (5, 12, 40):
+        plot_data = []
+        draw_warnings(polys + lines + points, plot_data, style=style, name="Mixed", colors=colors,
+                      max_traces=max_traces)
+        assert len(plot_data) <= max_traces
+        assert len(plot_data) > max_traces - 5
+
+    # More groups than the budget.  One bucket each, with a warning.
+    styles = [shpl.Style(line_style=dict(width=w)) for w in range(1, 7)]
+    for i, line in enumerate(lines):
+        line.plotly_set_style(styles[i % 6])
+    plot_data = []
+    msgs = draw_warnings(lines, plot_data, colors=colors[:50], max_traces=4)
+    assert any("exceeding max_traces" in m for m in msgs)
+    assert len(plot_data) == 6
+
+    # NaN colors go in the lowest bucket.
+    nan_colors = np.array([np.nan, 0.0, 1.0, np.nan] * 10)
+    plot_data = []
+    draw_warnings(lines[:40], plot_data, style=styles[0], colors=nan_colors, max_traces=2)
+    assert len(plot_data) == 2
+    assert list(plot_data[1].x[::3]) == [float(i) for i in range(2, 40, 4)]
+    return
+
+
+test_list.append(TDef(test_colors_budget))
+
+
+if __name__ == "__main__":
+    run_main(test_list)
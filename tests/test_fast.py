@@ -0,0 +1,102 @@
+"""
+Check the unvalidated (fast) plot construction mode.
+"""
+
+import random as rnd
+
+import plotly.graph_objects as graph
+
+from shapely_plotly.tests.utils.rnd_shapes import rnd_geom_classes
+from shapely_plotly.tests.utils.rnd_shapes_3d import rnd_geom_classes as rnd_geom_classes_3d
+from shapely_plotly.tests.utils.utils import rnd_style, normalize_plot_obj, compare_object
+from shapely_plotly.tests.utils.run_main import run_main, TDef, start_end_id
+
+import shapely_plotly as shpl
+
+test_list = []
+
+
+def dict_to_graph(trace):
+    """
+    Convert a plot dictionary to the equivalent Plotly graph object.
+    """
+    kwargs = dict(trace)
+    trace_type = kwargs.pop("type")
+    cls = {"scatter": graph.Scatter, "scattergl": graph.Scattergl, "scatter3d": graph.Scatter3d}[trace_type]
+    return cls(**kwargs)
+
+
+def normalize_no_group(plot_data):
+    """
+    Normalize plots, ignoring randomly generated legend groups.
+    """
+    norm_data = [normalize_plot_obj(p) for p in plot_data]
+    for d in norm_data:
+        del d["legendgroup"]
+
+    return norm_data
+
+
+def do_test_fast(test_num, show, dims, test_name):
+    test_start, test_end = start_end_id(test_num, 100, 200)
+    for test_num in range(test_start, test_end):
+        rnd.seed(test_num)
+
+        if dims == 3:
+            geom, _ = rnd.choice(rnd_geom_classes_3d).rnd_shape_3d(-2.0, -2.0, -1.0, 4.0, 4.0, 2.0)
+            draw, show_f = geom.plotly_draw3d, shpl.show3d
+        else:
+            geom, _ = rnd.choice(rnd_geom_classes).rnd_shape_2d(-2.0, -2.0, 4.0, 4.0)
+            draw, show_f = geom.plotly_draw2d, shpl.show2d
+
+        style = rnd_style(True)
+
+        plot_data = []
+        draw(plot_data, style=style)
+
+        shpl.set_trace_validation(False)
+        try:
+            fast_data = []
+            draw(fast_data, style=style)
+        finally:
+            shpl.set_trace_validation(True)
+
+        assert all(isinstance(p, dict) for p in fast_data)
+        compare_object("fast", normalize_no_group([dict_to_graph(p) for p in fast_data]),
+                       "validated", normalize_no_group(plot_data), f'{test_name}[{test_num}]')
+
+        # Unvalidated figures match the validated figure.
+        fig = show_f(plot_data, show=False)
+        for validate in (False, "sample"):
+            fig_dict = show_f(fast_data, show=show, validate=validate)
+            assert isinstance(fig_dict, dict)
+            assert graph.Figure(fig_dict).layout == fig.layout
+            assert len(fig_dict["data"]) == len(fig.data)
+
+    return
+
+
+def test_fast2d(test_num=None, show=False):
+    """
+    Self-checking randoms.  Unvalidated 2D plots must match validated plots.
+    """
+    do_test_fast(test_num, show, 2, "test_fast2d")
+    return
+
+
+test_list.append(TDef(test_fast2d, has_id=True, has_show=True))
+
+
+def test_fast3d(test_num=None, show=False):
+    """
+    Self-checking randoms.  Unvalidated 3D plots must match validated plots.
+    """
+    do_test_fast(test_num, show, 3, "test_fast3d")
+    return
+
+
+test_list.append(TDef(test_fast3d, has_id=True, has_show=True))
+
+
+if __name__ == "__main__":
+    run_main(test_list)
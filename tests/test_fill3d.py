@@ -0,0 +1,167 @@
+"""
+Check filled 3D polygons (Style.fill_3d), drawn as triangulated Mesh3d plots.
+"""
+
+import random as rnd
+import numpy as np
+import plotly.graph_objects as graph
+import shapely as shp
+
+from shapely_plotly.tests.utils.rnd_shapes_3d import RndPolyComplex3d, RndMultiPoly3d
+from shapely_plotly.tests.utils.utils import rnd_style, rnd_string, normalize_plot_obj, compare_object
+from shapely_plotly.tests.utils.run_main import run_main, TDef, start_end_id
+
+import shapely_plotly as shpl
+import shapely_plotly.plot as shpl_plot
+
+test_list = []
+
+
+def mesh_area(mesh):
+    """
+    Total x/y area of the triangles of a Mesh3d plot.
+    """
+    x, y = np.asarray(mesh.x), np.asarray(mesh.y)
+    i, j, k = np.asarray(mesh.i), np.asarray(mesh.j), np.asarray(mesh.k)
+    cross = (x[j] - x[i]) * (y[k] - y[i]) - (x[k] - x[i]) * (y[j] - y[i])
+    return 0.5 * np.abs(cross).sum()
+
+
+def check_mesh(mesh, geom, style):
+    """
+    The mesh must cover exactly the polygon(s).
+    """
+    assert isinstance(mesh, graph.Mesh3d)
+    assert np.isclose(mesh_area(mesh), geom.area)
+    assert np.asarray(mesh.i).dtype == np.int32
+
+    # Vertices are shared, and all come from the polygon.
+    vertices = set(zip(mesh.x, mesh.y, mesh.z))
+    assert len(vertices) == len(mesh.x)
+    coords = shp.get_coordinates(geom, include_z=True)
+    coords[np.isnan(coords[:, 2]), 2] = 0.0
+    assert vertices <= set(tuple(c) for c in coords)
+
+    color, opacity = shpl_plot.color_opacity(style.fill_color)
+    assert (mesh.color, mesh.opacity) == (color, opacity)
+
+
+def normalize_no_group(plot_data):
+    """
+    Normalize plots, ignoring legend groups and entries.
+    """
+    norm_data = [normalize_plot_obj(p) for p in plot_data]
+    for d in norm_data:
+        del d["legendgroup"]
+        del d["showlegend"]
+
+    return norm_data
+
+
+def test_fill3d(test_num=None, show=False):
+    """
+    Self-checking randoms.  Filled 3D polygons add a single mesh before the outline plots.
+    """
+    test_start, test_end = start_end_id(test_num, 100, 200)
+    for test_num in range(test_start, test_end):
+        rnd.seed(test_num)
+
+        rnd_class = rnd.choice((RndPolyComplex3d, RndMultiPoly3d))
+        geom, _ = rnd_class.rnd_shape_3d(-2.0, -2.0, -1.0, 4.0, 4.0, 2.0)
+        style = rnd_style(True)
+        name = rnd.choice((None, rnd_string()))
+
+        plot_data = []
+        geom.plotly_draw3d(plot_data, style=style, name=name)
+
+        style.fill_3d = True
+        fill_data = []
+        geom.plotly_draw3d(fill_data, style=style, name=name)
+
+        if show:
+            shpl.show3d(fill_data)
+
+        if style.fill_color is None:
+            compare_object("fill", normalize_no_group(fill_data), "outline", normalize_no_group(plot_data),
+                           f'test_fill3d[{test_num}]')
+            continue
+
+        check_mesh(fill_data[0], geom, style)
+        compare_object("fill", normalize_no_group(fill_data[1:]), "outline", normalize_no_group(plot_data),
+                       f'test_fill3d[{test_num}]')
+
+        # Single legend entry.
+        assert [p.showlegend for p in fill_data] == [name is not None] + [False] * (len(fill_data) - 1)
+        assert len(set(p.legendgroup for p in fill_data)) == 1
+
+    return
+
+
+test_list.append(TDef(test_fill3d, has_id=True, has_show=True))
+
+
+def test_fill3d_many():
+    """
+    Bulk plotting puts all polygons of a style in one mesh.  Fast mode builds the same mesh.
+    """
+    rnd.seed(0)
+    geoms = [RndPolyComplex3d.rnd_shape_3d(i * 5.0, 0.0, -1.0, 4.0, 4.0, 2.0)[0] for i in range(20)]
+    style = shpl.Style(fill_3d=True)
+
+    plot_data = []
+    shpl.draw_many(geoms, plot_data, style=style, dims=3)
+    meshes = [p for p in plot_data if isinstance(p, graph.Mesh3d)]
+    assert len(meshes) == 1 and (plot_data[0] is meshes[0])
+    check_mesh(meshes[0], shp.MultiPolygon(geoms), style)
+
+    shpl.set_trace_validation(False)
+    try:
+        fast_data = []
+        shpl.draw_many(geoms, fast_data, style=style, dims=3)
+    finally:
+        shpl.set_trace_validation(True)
+
+    assert fast_data[0]["type"] == "mesh3d"
+    assert np.array_equal(fast_data[0]["i"], meshes[0].i)
+
+    # Plain colors are used as they are.
+    assert shpl_plot.color_opacity("rgba(0,220, 0, 0.3)") == ("rgb(0,220,0)", 0.3)
+    assert shpl_plot.color_opacity("red") == ("red", None)
+    return
+
+
+test_list.append(TDef(test_fill3d_many))
+
+
+def test_fill3d_walls():
+    """
+    Vertical polygons, facing along x or y, are filled too.
+    """
+    def wall(coords, window):
+        return shp.Polygon(coords, [window])
+
+    walls = [
+        wall([(0, 0, 0), (4, 0, 0), (4, 0, 3), (0, 0, 3)], [(1, 0, 1), (2, 0, 1), (2, 0, 2), (1, 0, 2)]),
+        wall([(4, 0, 0), (4, 2, 0), (4, 2, 3), (4, 0, 3)], [(4, 0.5, 1), (4, 1.5, 1), (4, 1.5, 2), (4, 0.5, 2)]),
+        shp.Polygon([(0, 0, 3), (4, 0, 3), (4, 2, 3), (0, 2, 3)]),
+    ]
+    style = shpl.Style(fill_3d=True)
+    plot_data = []
+    shpl.draw_many(walls, plot_data, style=style, dims=3)
+    mesh = plot_data[0]
+    assert isinstance(mesh, graph.Mesh3d)
+
+    # The area of the triangles in 3D is the area of the walls, less the windows.
+    xyz = np.stack([mesh.x, mesh.y, mesh.z], axis=1)
+    i, j, k = np.asarray(mesh.i), np.asarray(mesh.j), np.asarray(mesh.k)
+    area = 0.5 * np.linalg.norm(np.cross(xyz[j] - xyz[i], xyz[k] - xyz[i]), axis=1).sum()
+    assert np.isclose(area, 12.0 - 1.0 + 6.0 - 1.0 + 8.0)
+    assert set(map(tuple, xyz)) <= set(map(tuple, shp.get_coordinates(walls, include_z=True)))
+    return
+
+
+test_list.append(TDef(test_fill3d_walls))
+
+
+if __name__ == "__main__":
+    run_main(test_list)
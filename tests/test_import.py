@@ -0,0 +1,55 @@
+"""
+Check that importing shapely_plotly defers importing Plotly.
+"""
+
+import os
+import sys
+import json
+import subprocess
+
+from shapely_plotly.tests.utils.run_main import run_main, TDef
+
+test_list = []
+
+# Run in a fresh interpreter.  Prints whether plotly.graph_objects is loaded after each step.
+import_script = """
+import sys, json
+import shapely as shp
+import shapely_plotly as shpl
+loaded = ["plotly.graph_objects" in sys.modules]
+
+# Fast mode and streaming output do not need graph objects.
+shpl.set_trace_validation(False)
+plot_data = []
+shp.LineString([(0, 0), (1, 1)]).plotly_draw2d(plot_data)
+shpl.draw_many([shp.Point(0, 0), shp.box(0, 0, 1, 1)], plot_data)
+shpl.write_json(plot_data, sys.stderr)
+loaded.append("plotly.graph_objects" in sys.modules)
+
+# Graph objects are imported on first use.
+shpl.set_trace_validation(True)
+shp.Point(0, 0).plotly_draw2d(plot_data)
+loaded.append("plotly.graph_objects" in sys.modules)
+print(json.dumps(dict(loaded=loaded, methods=hasattr(shp.Point, "plotly_draw2d"))))
+"""
+
+
+def test_lazy_import():
+    """
+    plotly.graph_objects is imported by the first graph object, not by import shapely_plotly.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    out = subprocess.run([sys.executable, "-c", import_script], env=env, check=True, capture_output=True,
+                         text=True).stdout
+    res = json.loads(out.splitlines()[-1])
+
+    assert res["methods"]
+    assert res["loaded"] == [False, False, True]
+    return
+
+
+test_list.append(TDef(test_lazy_import))
+
+
+if __name__ == "__main__":
+    run_main(test_list)
@@ -0,0 +1,99 @@
+"""
+Check generated legend group IDs.
+"""
+
+import threading
+import random as rnd
+import plotly.io as pio
+
+from shapely_plotly.tests.utils.rnd_shapes import rnd_geom_classes
+from shapely_plotly.tests.utils.utils import rnd_style, rnd_string
+from shapely_plotly.tests.utils.run_main import run_main, TDef
+
+import shapely_plotly as shpl
+import shapely_plotly.plot as shpl_plot
+
+test_list = []
+
+
+def rnd_figure_json(seed):
+    """
+    JSON of a figure of random geometries, drawn inside a legend scope.
+    """
+    rnd.seed(seed)
+    style = rnd_style(True)
+    style.legend_group = None  # Generated.
+    geoms = []
+    for i in range(20):
+        geom, _ = rnd.choice(rnd_geom_classes).rnd_shape_2d(i * 5.0, 0.0, 4.0, 4.0)
+        geom.plotly_set_name(rnd.choice((None, rnd_string())))
+        geoms.append(geom)
+
+    with shpl.legend_scope():
+        plot_data = []
+        for geom in geoms:
+            geom.plotly_draw2d(plot_data, style=style)
+        shpl.draw_many(geoms, plot_data, style=style, name="All")
+
+    return pio.to_json(shpl.show2d(plot_data, show=False, validate=False), validate=False)
+
+
+def test_legend_scope():
+    """
+    Identical drawing gives identical figures in a legend scope.
+    """
+    fig_json = rnd_figure_json(0)
+    shpl_plot.unique_legend_group()  # Moves the process wide index.
+    assert rnd_figure_json(0) == fig_json
+    assert '"shapely_plotly_0"' in fig_json
+
+    # Scopes nest, and restore the outer allocator.
+    with shpl.legend_scope("outer"):
+        assert shpl_plot.unique_legend_group() == "outer_0"
+        with shpl.legend_scope("inner"):
+            assert shpl_plot.unique_legend_group() == "inner_0"
+        assert shpl_plot.unique_legend_group() == "outer_1"
+    assert shpl_plot.unique_legend_group().startswith("shapely_plotly_g_")
+
+    # Process wide IDs never collide with the IDs of a default scope.
+    with shpl.legend_scope():
+        scoped = set(shpl_plot.unique_legend_group() for _ in range(10))
+    assert not scoped & set(shpl_plot.unique_legend_group() for _ in range(10))
+    return
+
+
+test_list.append(TDef(test_legend_scope))
+
+
+def test_legend_threads():
+    """
+    Legend group IDs are unique across threads, and scopes are separate for each thread.
+    """
+    num_threads, num_groups = 8, 2000
+    global_ids = [None] * num_threads
+    scoped_ids = [None] * num_threads
+
+    def allocate(t):
+        global_ids[t] = [shpl_plot.unique_legend_group() for _ in range(num_groups)]
+        with shpl.legend_scope():
+            scoped_ids[t] = [shpl_plot.unique_legend_group() for _ in range(num_groups)]
+        return
+
+    threads = [threading.Thread(target=allocate, args=(t,)) for t in range(num_threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    all_ids = sum(global_ids, [])
+    assert len(set(all_ids)) == len(all_ids)
+    for ids in scoped_ids:
+        assert ids == [f"shapely_plotly_{i}" for i in range(num_groups)]
+    return
+
+
+test_list.append(TDef(test_legend_threads))
+
+
+if __name__ == "__main__":
+    run_main(test_list)
@@ -0,0 +1,157 @@
+"""
+Check level of detail simplification (tolerance/max_vertices).
+"""
+
+import random as rnd
+import numpy as np
+import shapely as shp
+
+from shapely_plotly.tests.utils.rnd_shapes import rnd_geom_classes
+from shapely_plotly.tests.utils.rnd_shapes_3d import rnd_geom_classes as rnd_geom_classes_3d
+from shapely_plotly.tests.utils.utils import rnd_style, rnd_string
+from shapely_plotly.tests.utils.run_main import run_main, TDef, start_end_id
+from shapely_plotly.tests.test_bulk import plot_coord_set, geom_coord_set
+
+import shapely_plotly as shpl
+import shapely_plotly.coords as shpl_coords
+
+test_list = []
+
+
+def num_plot_coords(plot_data):
+    """
+    Number of coordinates plotted, excluding gaps.
+    """
+    return sum(int(np.count_nonzero(~np.isnan(np.asarray(p.x, dtype=float)))) for p in plot_data)
+
+
+def wiggly_circle(n, radius=1.0, z=False):
+    """
+    Circle with many vertices, and a small wiggle that tolerance="auto" should remove.
+    """
+    a = np.linspace(0.0, 2.0 * np.pi, n, endpoint=False)
+    r = radius * (1.0 + 1e-6 * np.sin(a * 997.0))
+    coords = np.stack([r * np.cos(a), r * np.sin(a)] + ([np.full(n, 1.0)] if z else []), axis=1)
+    return coords
+
+
+def do_test_lod(test_num, show, dims, test_name):
+    test_start, test_end = start_end_id(test_num, 100, 200)
+    for test_num in range(test_start, test_end):
+        rnd.seed(test_num)
+
+        if dims == 3:
+            geom, _ = rnd.choice(rnd_geom_classes_3d).rnd_shape_3d(-2.0, -2.0, -1.0, 4.0, 4.0, 2.0)
+            draw, show_f = geom.plotly_draw3d, shpl.show3d
+        else:
+            geom, _ = rnd.choice(rnd_geom_classes).rnd_shape_2d(-2.0, -2.0, 4.0, 4.0)
+            draw, show_f = geom.plotly_draw2d, shpl.show2d
+
+        # Lines and markers are always drawn, so every coordinate is visible.
+        style = rnd_style(False)
+        name = rnd_string()
+        geom.plotly_set_name(name)
+
+        plot_data = []
+        draw(plot_data, style=style)
+        tolerance = rnd.choice((0.01, 0.1, 0.5, 2.0, "auto"))
+        lod_data = []
+        draw(lod_data, style=style, tolerance=tolerance)
+
+        if show:
+            show_f(lod_data)
+
+        # Simplification only removes vertices.  The name is still taken from the original geometry.
+        assert plot_coord_set(lod_data, dims) <= plot_coord_set(plot_data, dims), f'{test_name}[{test_num}]'
+        assert num_plot_coords(lod_data) <= num_plot_coords(plot_data)
+        assert all(p.name == name for p in lod_data)
+
+        # No tolerance is the same as the default.
+        no_lod_data = []
+        draw(no_lod_data, style=style, tolerance=None)
+        assert plot_coord_set(no_lod_data, dims) == plot_coord_set(plot_data, dims)
+
+    return
+
+
+def test_lod2d(test_num=None, show=False):
+    """
+    Self-checking randoms.  Simplified plots only contain vertices of the full plots - 2D.
+    """
+    do_test_lod(test_num, show, 2, "test_lod2d")
+    return
+
+
+test_list.append(TDef(test_lod2d, has_id=True, has_show=True))
+
+
+def test_lod3d(test_num=None, show=False):
+    """
+    Self-checking randoms.  Simplified plots only contain vertices of the full plots - 3D.
+    """
+    do_test_lod(test_num, show, 3, "test_lod3d")
+    return
+
+
+test_list.append(TDef(test_lod3d, has_id=True, has_show=True))
+
+
+def test_lod_auto():
+    """
+    tolerance="auto" removes sub-pixel detail, and max_vertices limits the number of vertices.
+    """
+    n = 20000
+    circle = wiggly_circle(n)
+    shapes = [
+        shp.LineString(circle),
+        shp.LinearRing(circle),
+        shp.Polygon(circle, [wiggly_circle(n, 0.5)[::-1]]),
+        shp.MultiLineString([circle, circle * 2.0]),
+        shp.GeometryCollection([shp.Polygon(circle), shp.Point(0.0, 0.0)]),
+    ]
+
+    for geom in shapes:
+        full = shp.get_num_coordinates(geom)
+
+        plot_data = []
+        geom.plotly_draw2d(plot_data, tolerance="auto")
+        assert num_plot_coords(plot_data) < full // 10
+
+        for max_vertices in (5000, 1000, 200):
+            plot_data = []
+            geom.plotly_draw2d(plot_data, max_vertices=max_vertices)
+            assert num_plot_coords(plot_data) <= max_vertices
+
+        # 3D simplifies in x and y, and keeps z.
+        plot_data = []
+        shp.force_3d(geom, 1.0).plotly_draw3d(plot_data, max_vertices=1000)
+        assert num_plot_coords(plot_data) <= 1000
+        assert all(np.all(np.isnan(p.z) | (np.asarray(p.z) == 1.0)) for p in plot_data)
+
+    # A larger target width keeps more detail.
+    plot_data = []
+    shapes[0].plotly_draw2d(plot_data, tolerance="auto")
+    default_n = num_plot_coords(plot_data)
+    saved = shpl_coords.lod_pixels
+    try:
+        plot_data = []
+        shpl_coords.lod_pixels = 1e9
+        shapes[0].plotly_draw2d(plot_data, tolerance="auto")
+        assert num_plot_coords(plot_data) > 10 * default_n
+    finally:
+        shpl_coords.lod_pixels = saved
+
+    # Bulk plotting uses a tolerance for all the geometries together.
+    geoms = [shp.LineString(circle + [i * 3.0, 0.0]) for i in range(10)]
+    plot_data = []
+    shpl.draw_many(geoms, plot_data, max_vertices=2000)
+    assert num_plot_coords(plot_data) <= 2000
+    assert plot_coord_set(plot_data, 2) <= geom_coord_set(geoms, 2)
+    return
+
+
+test_list.append(TDef(test_lod_auto))
+
+
+if __name__ == "__main__":
+    run_main(test_list)
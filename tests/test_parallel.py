@@ -0,0 +1,101 @@
+"""
+Check draw_many(...) with plots built in parallel.
+"""
+
+import warnings
+import random as rnd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from shapely_plotly.tests.utils.rnd_shapes import rnd_geom_classes
+from shapely_plotly.tests.utils.utils import rnd_style, rnd_geoms, figure_data
+from shapely_plotly.tests.utils.run_main import run_main, TDef, start_end_id
+
+import shapely_plotly as shpl
+import shapely_plotly.bulk as shpl_bulk
+
+test_list = []
+
+
+def do_test_parallel(test_num, show, dims, test_name):
+    test_start, test_end = start_end_id(test_num, 100, 150)
+    chunk_size = shpl_bulk.parallel_chunk_size
+    try:
+        with ProcessPoolExecutor(max_workers=2) as process_pool, ThreadPoolExecutor(max_workers=3) as thread_pool:
+            for test_num in range(test_start, test_end):
+                rnd.seed(test_num)
+                geoms = rnd_geoms(dims, rnd.randrange(1, 30), rnd_fill_3d=True)
+
+                colors = rnd.choice((None, np.array([rnd.uniform(0.0, 1.0) for _ in geoms])))
+                max_traces = rnd.choice((None, 4))
+                view = rnd.choice((None, (2.0, 2.0, 17.0, 13.0)))
+                tolerance = rnd.choice((None, 0.2))
+                pool = rnd.choice((process_pool, thread_pool))
+                shpl_bulk.parallel_chunk_size = rnd.randrange(1, 8)
+
+                # Same plots as in a single process, or thread, with small chunks to exercise merging.
+                plot_data = []
+                plot_data_parallel = []
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    shpl.draw_many(geoms, plot_data, dims=dims, colors=colors, max_traces=max_traces, view=view,
+                                   tolerance=tolerance)
+                    shpl.draw_many(geoms, plot_data_parallel, dims=dims, colors=colors, max_traces=max_traces,
+                                   view=view, tolerance=tolerance, parallel=pool)
+
+                assert figure_data(plot_data_parallel, dims) == figure_data(plot_data, dims), \
+                    f'{test_name}[{test_num}]'
+
+                if show:
+                    show_f = shpl.show3d if dims == 3 else shpl.show2d
+                    show_f(plot_data_parallel)
+    finally:
+        shpl_bulk.parallel_chunk_size = chunk_size
+
+    return
+
+
+def test_parallel2d(test_num=None, show=False):
+    """
+    Self-checking randoms.  Parallel draw_many(...) builds the same plots - 2D.
+    """
+    do_test_parallel(test_num, show, 2, "test_parallel2d")
+    return
+
+
+test_list.append(TDef(test_parallel2d, has_id=True, has_show=True))
+
+
+def test_parallel3d(test_num=None, show=False):
+    """
+    Self-checking randoms.  Parallel draw_many(...) builds the same plots - 3D.
+    """
+    do_test_parallel(test_num, show, 3, "test_parallel3d")
+    return
+
+
+test_list.append(TDef(test_parallel3d, has_id=True, has_show=True))
+
+
+def test_parallel_pool():
+    """
+    parallel=True and parallel="threads" start their own pools of workers.
+    """
+    rnd.seed(0)
+    style = rnd_style(True)
+    geoms = [rnd.choice(rnd_geom_classes).rnd_shape_2d(i * 5.0, 0.0, 4.0, 4.0)[0] for i in range(20)]
+
+    plot_data = []
+    shpl.draw_many(geoms, plot_data, style=style, name="Geoms")
+    for parallel in (True, "threads"):
+        plot_data_parallel = []
+        shpl.draw_many(geoms, plot_data_parallel, style=style, name="Geoms", parallel=parallel, workers=2)
+        assert figure_data(plot_data_parallel, 2) == figure_data(plot_data, 2)
+    return
+
+
+test_list.append(TDef(test_parallel_pool))
+
+
+if __name__ == "__main__":
+    run_main(test_list)
@@ -0,0 +1,136 @@
+"""
+Check coordinate rounding and origin shifting in show2d/show3d.
+"""
+
+import random as rnd
+import numpy as np
+import shapely as shp
+
+from shapely_plotly.tests.utils.rnd_shapes import rnd_geom_classes
+from shapely_plotly.tests.utils.rnd_shapes_3d import rnd_geom_classes as rnd_geom_classes_3d
+from shapely_plotly.tests.utils.utils import rnd_style
+from shapely_plotly.tests.utils.run_main import run_main, TDef, start_end_id
+
+import shapely_plotly as shpl
+import shapely_plotly.coords as shpl_coords
+
+test_list = []
+
+
+def do_test_precision(test_num, show, dims, test_name):
+    test_start, test_end = start_end_id(test_num, 100, 200)
+    for test_num in range(test_start, test_end):
+        rnd.seed(test_num)
+
+        # Geometries far from (0, 0), as with projected coordinates.
+        offset = np.array([rnd.uniform(-5e6, 5e6), rnd.uniform(-5e6, 5e6), rnd.uniform(-100.0, 100.0)])
+        geoms = []
+        for i in range(rnd.randrange(1, 10)):
+            x, y = (i % 3) * 5.0, (i // 3) * 5.0
+            if dims == 3:
+                geom, _ = rnd.choice(rnd_geom_classes_3d).rnd_shape_3d(x, y, -1.0, 4.0, 4.0, 2.0)
+            else:
+                geom, _ = rnd.choice(rnd_geom_classes).rnd_shape_2d(x, y, 4.0, 4.0)
+            geoms.append(shp.transform(geom, lambda c: c + offset[0:c.shape[1]], include_z=(dims == 3)))
+
+        plot_data = []
+        shpl.draw_many(geoms, plot_data, style=rnd_style(False), dims=dims)
+
+        show_f = shpl.show3d if dims == 3 else shpl.show2d
+        fig = show_f(plot_data, show=False, validate=False)
+        decimals = rnd.randrange(0, 4)
+        origin = rnd.choice(("auto", tuple(offset[0:dims])))
+        fig_out = show_f(plot_data, show=show, validate=False, origin=origin, decimals=decimals)
+
+        if origin == "auto":
+            # Nearby and round.
+            all_coords = [np.concatenate([np.asarray(p[a]) for p in fig["data"]]) for a in "xyz"[0:dims]]
+            origin = shpl_coords.auto_origin([np.nanmin(c) for c in all_coords], [np.nanmax(c) for c in all_coords])
+
+        axes_layout = fig_out["layout"]["scene"] if dims == 3 else fig_out["layout"]
+        for i, axis in enumerate("xyz"[0:dims]):
+            # Shifted and rounded coordinates are within rounding of the original coordinates.
+            for plot_obj, plot_out in zip(fig["data"], fig_out["data"]):
+                shifted = np.asarray(plot_out[axis]) + origin[i]
+                assert np.allclose(shifted, np.asarray(plot_obj[axis]), rtol=0.0, atol=0.51 * 10.0 ** -decimals,
+                                   equal_nan=True), f'{test_name}[{test_num}]'
+                assert np.array_equal(np.round(plot_out[axis], decimals), plot_out[axis], equal_nan=True), \
+                    f'{test_name}[{test_num}]'
+                if not any(origin):
+                    assert "hovertemplate" not in plot_out, f'{test_name}[{test_num}]'
+                elif origin[i]:
+                    # Hover text shows the original coordinates, from customdata.
+                    column = [j for j in range(dims) if origin[j]].index(i)
+                    assert f"%{{customdata[{column}]:.15g}}" in plot_out["hovertemplate"], f'{test_name}[{test_num}]'
+                    assert np.allclose(np.asarray(plot_out["customdata"])[:, column], shifted, equal_nan=True), \
+                        f'{test_name}[{test_num}]'
+                else:
+                    assert f"%{{{axis}}}" in plot_out["hovertemplate"], f'{test_name}[{test_num}]'
+
+            # Axes are titled with the origin.  Ticks are left to Plotly, so they follow zooming.
+            if origin[i]:
+                axis_layout = axes_layout[axis + "axis"]
+                assert axis_layout["title"]["text"].startswith(f"{axis} "), f'{test_name}[{test_num}]'
+                assert "tickvals" not in axis_layout, f'{test_name}[{test_num}]'
+
+    return
+
+
+def test_precision2d(test_num=None, show=False):
+    """
+    Self-checking randoms.  Coordinates are shifted and rounded - 2D.
+    """
+    do_test_precision(test_num, show, 2, "test_precision2d")
+    return
+
+
+test_list.append(TDef(test_precision2d, has_id=True, has_show=True))
+
+
+def test_precision3d(test_num=None, show=False):
+    """
+    Self-checking randoms.  Coordinates are shifted and rounded - 3D.
+    """
+    do_test_precision(test_num, show, 3, "test_precision3d")
+    return
+
+
+test_list.append(TDef(test_precision3d, has_id=True, has_show=True))
+
+
+def test_precision_round():
+    """
+    Rounding to decimals and significant digits, and picking an origin.
+    """
+    values = np.array([4512345.123456789, -0.0123456, 0.0, np.nan])
+    assert np.array_equal(shpl_coords.round_coords(values, decimals=2), [4512345.12, -0.01, 0.0, np.nan],
+                          equal_nan=True)
+    assert np.array_equal(shpl_coords.round_coords(values, digits=3), [4510000.0, -0.0123, 0.0, np.nan],
+                          equal_nan=True)
+    assert shpl_coords.auto_origin([4512345.1, -20.0, 5.0], [4513012.7, 20.0, 5.0]) == (4512000.0, -100.0, 5.0)
+
+    # The view is shifted too.  Graph objects are accepted.
+    line = shp.LineString([(4512345.1, 3120000.5), (4512945.9, 3120500.2)])
+    plot_data = []
+    line.plotly_draw2d(plot_data)
+    fig = shpl.show2d(plot_data, show=False, view=(4512000.0, 3120000.0, 4513000.0, 3121000.0),
+                      origin=(4512000.0, 3120000.0), digits=4)
+    assert tuple(fig.data[0].x) == (345.1, 945.9)
+    assert tuple(fig.layout.xaxis.range) == (0.0, 1000.0)
+    assert fig.layout.xaxis.title.text == "x - 4512000"
+    assert fig.layout.yaxis.title.text == "y - 3120000"
+    assert fig.data[0].hovertemplate == "x: %{customdata[0]:.15g}<br>y: %{customdata[1]:.15g}"
+    assert np.allclose(fig.data[0].customdata, [[4512345.1, 3120000.5], [4512945.9, 3120500.2]], rtol=0.0, atol=1e-6)
+
+    # Only shifted axes use customdata.  Negative origins are added.
+    fig = shpl.show2d(plot_data, show=False, validate=False, origin=(0.0, -100.0))
+    assert fig["data"][0]["hovertemplate"] == "x: %{x}<br>y: %{customdata[0]:.15g}"
+    assert fig["layout"]["yaxis"]["title"]["text"] == "y + 100"
+    return
+
+
+test_list.append(TDef(test_precision_round))
+
+
+if __name__ == "__main__":
+    run_main(test_list)
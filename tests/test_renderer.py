@@ -0,0 +1,143 @@
+"""
+Check 2D renderer selection (SVG Scatter vs WebGL Scattergl).
+"""
+
+import random as rnd
+import numpy as np
+import plotly.graph_objects as graph
+import shapely as shp
+
+from shapely_plotly.tests.utils.rnd_shapes import rnd_geom_classes
+from shapely_plotly.tests.utils.utils import rnd_style, normalize_plot_obj, compare_object
+from shapely_plotly.tests.utils.run_main import run_main, TDef, start_end_id
+
+import shapely_plotly as shpl
+import shapely_plotly.plot as shpl_plot
+
+test_list = []
+
+
+def normalize_no_group(plot_data):
+    """
+    Normalize plots, ignoring randomly generated legend groups.
+    """
+    norm_data = [normalize_plot_obj(p) for p in plot_data]
+    for d in norm_data:
+        del d["legendgroup"]
+
+    return norm_data
+
+
+def needs_svg(plot_obj):
+    """
+    Scattergl cannot fill plots with multiple rings.
+    """
+    return (plot_obj.fill is not None) and np.isnan(np.asarray(plot_obj.x, dtype=float)).any()
+
+
+def test_renderer_webgl(test_num=None, show=False):
+    """
+    Self-checking randoms.  WebGL plots must match SVG plots, except for the plot type.
+    """
+    test_start, test_end = start_end_id(test_num, 100, 200)
+    for test_num in range(test_start, test_end):
+        rnd.seed(test_num)
+
+        geom, _ = rnd.choice(rnd_geom_classes).rnd_shape_2d(-2.0, -2.0, 4.0, 4.0)
+        style = rnd_style(True)
+
+        svg_data = []
+        geom.plotly_draw2d(svg_data, style=style)
+        webgl_data = []
+        geom.plotly_draw2d(webgl_data, style=style, renderer="webgl")
+
+        if show:
+            shpl.show2d(webgl_data)
+
+        assert all(isinstance(p, graph.Scatter) for p in svg_data)
+        for p in webgl_data:
+            assert isinstance(p, graph.Scatter if needs_svg(p) else graph.Scattergl)
+
+        compare_object("webgl", normalize_no_group(webgl_data), "svg", normalize_no_group(svg_data),
+                       f'test_renderer_webgl[{test_num}]')
+
+        # The style can select the renderer too.
+        style.renderer = "webgl"
+        style_data = []
+        geom.plotly_draw2d(style_data, style=style)
+        assert [type(p) for p in style_data] == [type(p) for p in webgl_data]
+
+        # Converting after the fact gives the same result.
+        assert [type(p) for p in shpl_plot.rerender2d(svg_data, "webgl")] == [type(p) for p in webgl_data]
+        assert all(isinstance(p, graph.Scatter) for p in shpl_plot.rerender2d(webgl_data, "svg"))
+
+    return
+
+
+test_list.append(TDef(test_renderer_webgl, has_id=True, has_show=True))
+
+
+def test_renderer_auto():
+    """
+    The auto renderer switches to WebGL at webgl_threshold points.
+    """
+    small = shp.LineString([(i, i % 2) for i in range(10)])
+    large = shp.LineString([(i, i % 2) for i in range(shpl_plot.webgl_threshold)])
+
+    plot_data = []
+    small.plotly_draw2d(plot_data, renderer="auto")
+    large.plotly_draw2d(plot_data, renderer="auto")
+    assert [type(p) for p in plot_data] == [graph.Scatter, graph.Scattergl]
+
+    # show2d considers the whole figure.
+    fig = shpl.show2d(plot_data[0:1], show=False, renderer="auto")
+    assert isinstance(fig.data[0], graph.Scatter)
+    fig = shpl.show2d(plot_data, show=False, renderer="auto")
+    assert all(isinstance(p, graph.Scattergl) for p in fig.data)
+
+    # Bulk plotting.
+    plot_data = []
+    shpl.draw_many([small, large], plot_data, renderer="auto")
+    assert [type(p) for p in plot_data] == [graph.Scattergl]
+    return
+
+
+test_list.append(TDef(test_renderer_auto))
+
+
+def test_renderer_gaps():
+    """
+    Plots built with Plotly directly have None gaps, or non-numeric coordinates.
+    """
+    holes = graph.Scatter(x=[0, 1, None, 2, 3, 2], y=[0, 1, None, 2, 3, 2], fill="toself")
+    ring = graph.Scatter(x=[0, 1, 1, 0], y=[0, 0, 1, 0], fill="toself")
+    dates = graph.Scatter(x=["2024-01-01", None, "2024-01-03"], y=[0, 1, 2], fill="tozeroy")
+    fig = shpl.show2d([holes, ring, dates], show=False, renderer="webgl")
+    assert [type(p) for p in fig.data] == [graph.Scatter, graph.Scattergl, graph.Scatter]
+    return
+
+
+test_list.append(TDef(test_renderer_gaps))
+
+
+def test_renderer_fallback():
+    """
+    Styles that Scattergl cannot draw stay SVG.
+    """
+    spline = shpl.Style(line_style=dict(shape="spline", width=2))
+    line = shp.LineString([(i, i % 2) for i in range(10)])
+
+    plot_data = []
+    line.plotly_draw2d(plot_data, style=spline, renderer="webgl")
+    shpl.draw_many([line, line], plot_data, style=spline, name="Lines", renderer="webgl")
+    line.plotly_draw2d(plot_data, renderer="webgl")
+    assert [type(p) for p in plot_data] == [graph.Scatter, graph.Scatter, graph.Scattergl]
+    assert plot_data[0].line.shape == "spline"
+    return
+
+
+test_list.append(TDef(test_renderer_fallback))
+
+
+if __name__ == "__main__":
+    run_main(test_list)
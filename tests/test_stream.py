@@ -0,0 +1,160 @@
+"""
+Check the streaming figure writers.
+"""
+
+import io
+import os
+import json
+import tempfile
+import random as rnd
+import numpy as np
+import shapely as shp
+import plotly.io as pio
+
+from shapely_plotly.tests.utils.utils import rnd_geoms
+from shapely_plotly.tests.utils.run_main import run_main, TDef, start_end_id
+
+import shapely_plotly as shpl
+
+test_list = []
+
+
+def figure_data(fig_json):
+    """
+    The plots of a figure's JSON, as Python objects.  Legend groups are left out, as they are generated.
+    """
+    data = json.loads(fig_json)["data"]
+    for p in data:
+        p.pop("legendgroup", None)
+    return data
+
+
+def do_test_stream(test_num, show, dims, test_name):
+    test_start, test_end = start_end_id(test_num, 100, 150)
+    show_f = shpl.show3d if dims == 3 else shpl.show2d
+    for test_num in range(test_start, test_end):
+        rnd.seed(test_num)
+        geoms = rnd_geoms(dims, rnd.randrange(1, 30), with_fill=False)
+
+        plot_data = []
+        shpl.draw_many(geoms, plot_data, dims=dims)
+        binary = rnd.choice((False, True, "f4"))
+        decimals = rnd.choice((None, 2))
+        fig = show_f(plot_data, show=show, validate=False, binary=binary, decimals=decimals)
+
+        # Same plots and layout as show2d/show3d.
+        f = io.StringIO()
+        shpl.write_json(iter(plot_data), f, dims=dims, binary=binary, decimals=decimals)
+        assert figure_data(f.getvalue()) == figure_data(pio.to_json(fig, validate=False)), f'{test_name}[{test_num}]'
+        assert json.loads(f.getvalue())["layout"] == json.loads(pio.to_json(fig, validate=False))["layout"], \
+            f'{test_name}[{test_num}]'
+
+        # The HTML page holds the same plots.
+        f = io.StringIO()
+        shpl.write_html(plot_data, f, dims=dims, binary=binary, decimals=decimals, title="Test")
+        page = f.getvalue()
+        start = page.index('Plotly.newPlot("shapely-plotly", [') + len('Plotly.newPlot("shapely-plotly", ')
+        end = page.index('], {', start) + 1
+        assert figure_data('{"data": ' + page[start:end] + "}") == figure_data(pio.to_json(fig, validate=False)), \
+            f'{test_name}[{test_num}]'
+
+        # Chunks share legend entries, as with a single draw_many(...).  Every plot belongs to a legend entry.
+        plots = list(shpl.iter_plots(geoms, dims=dims, chunk_size=rnd.randrange(1, 10)))
+        assert sorted(p.name for p in plots if p.showlegend) == sorted(p.name for p in plot_data if p.showlegend), \
+            f'{test_name}[{test_num}]'
+        shown_groups = set(p.legendgroup for p in plots if p.showlegend)
+        for p in plots:
+            assert p.legendgroup in shown_groups, f'{test_name}[{test_num}]'
+
+    return
+
+
+def test_stream2d(test_num=None, show=False):
+    """
+    Self-checking randoms.  Streamed figures match show2d(...).
+    """
+    do_test_stream(test_num, show, 2, "test_stream2d")
+    return
+
+
+test_list.append(TDef(test_stream2d, has_id=True, has_show=True))
+
+
+def test_stream3d(test_num=None, show=False):
+    """
+    Self-checking randoms.  Streamed figures match show3d(...).
+    """
+    do_test_stream(test_num, show, 3, "test_stream3d")
+    return
+
+
+test_list.append(TDef(test_stream3d, has_id=True, has_show=True))
+
+
+def test_stream_file():
+    """
+    Write to a path, and read back with Plotly.
+    """
+    rnd.seed(0)
+    geoms = rnd_geoms(2, 20, with_fill=False)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "fig.json")
+        shpl.write_json(shpl.iter_plots(geoms, chunk_size=7), path, view=(0.0, 0.0, 10.0, 10.0),
+                        origin=(5.0, 5.0), layout=dict(title="Streamed"))
+        fig = pio.read_json(path)
+
+    assert fig.layout.title.text == "Streamed"
+    assert tuple(fig.layout.xaxis.range) == (-5.0, 5.0)
+    assert fig.layout.xaxis.title.text == "x - 5"
+    assert np.nanmin(np.concatenate([np.array(p.x, dtype=float) for p in fig.data])) >= -5.0
+    return
+
+
+test_list.append(TDef(test_stream_file))
+
+
+def test_stream_title():
+    """
+    The page title is escaped.
+    """
+    f = io.StringIO()
+    shpl.write_html([], f, title="Roads & <b>Rails</b>")
+    assert "<title>Roads &amp; &lt;b&gt;Rails&lt;/b&gt;</title>" in f.getvalue()
+    return
+
+
+test_list.append(TDef(test_stream_title))
+
+
+def test_stream_colors():
+    """
+    Colors and sizes are split with the geometries, and the color range is set from all of them.
+    """
+    points = [shp.Point(i, i) for i in range(6)]
+    sizes = np.arange(6) + 5.0
+    for colors in (np.array([0.0, 1.0, 2.0, 3.0, 4.0, 5.0]), np.array(["red", "blue", "green"] * 2)):
+        plot_data = []
+        shpl.draw_many(points, plot_data, name="Points", colors=colors, sizes=sizes)
+        plots = list(shpl.iter_plots(points, chunk_size=3, name="Points", colors=colors, sizes=sizes))
+        assert len(plots) == 2
+        for key in ("color", "size"):
+            assert list(np.concatenate([p.marker[key] for p in plots])) == list(plot_data[0].marker[key])
+        for p in plots:
+            assert (p.marker.cmin, p.marker.cmax) == (plot_data[0].marker.cmin, plot_data[0].marker.cmax)
+
+    # Color buckets, and their trace budget, would be worked out per chunk.
+    for kwargs in (dict(max_traces=6), dict(max_vertices=100), dict(tolerance="auto")):
+        try:
+            next(shpl.iter_plots(points, chunk_size=3, colors=np.arange(6.0), **kwargs))
+        except AssertionError:
+            pass
+        else:
+            assert False, f"{kwargs} not rejected"
+    return
+
+
+test_list.append(TDef(test_stream_colors))
+
+
+if __name__ == "__main__":
+    run_main(test_list)
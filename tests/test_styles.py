@@ -4,7 +4,11 @@ Check style attributes, including cascading.
 The rest of the checks will run lots of testing.  Adding this here as a simple check to make sure Styles are working
 """
 
+import gc
 import random as rnd
+import shapely as shp
+import shapely_plotly as shpl
+from shapely_plotly.style import global_geom_data
 from shapely_plotly.tests.utils.utils import rnd_style
 from shapely_plotly.tests.utils.run_main import run_main, TDef, start_end_id
 
@@ -17,8 +21,59 @@ def test_styles(test_num=None):
         s = rnd_style(rnd.choice((True, False)))  # Create and tests a random style.
 
 
+def test_geometry_info_identity():
+    """
+    Meta-data belongs to the geometry object, not to equal geometries.  It is removed when the geometry is collected.
+    """
+    a = shp.LineString([(0, 0), (1, 1)])
+    b = shp.LineString([(0, 0), (1, 1)])
+    assert a == b
+
+    a.plotly_set_name("a")
+    assert a.plotly_get_name() == "a"
+    assert b.plotly_get_name() is None
+
+    num_info = len(global_geom_data)
+    del a
+    gc.collect()
+    assert len(global_geom_data) == num_info - 1
+
+
+def test_style_versions():
+    """
+    Resolved styles follow changes to the style and its parents.  Unrelated changes do not alter the version.
+    """
+    root = shpl.Style(line_style={"color": "red"})
+    child = shpl.Style(parent=root)
+    other = shpl.Style()
+    assert child.parent is root
+    assert child.line_style == {"color": "red"}
+    assert child.fill_color == shpl.default_style.fill_color
+
+    version = child.version
+    resolved = child.resolved()
+    other.line_style = None
+    shpl.Style(fill_color="red").point_style = None
+    assert child.version == version
+    # Unrelated changes keep the snapshot, rather than resolving again.
+    assert child.resolved() is resolved
+
+    root.line_style = {"color": "blue"}
+    assert child.line_style == {"color": "blue"}
+    assert child.version > version
+    assert child.resolved() is not resolved
+
+    version = child.version
+    child.parent = shpl.DEFAULT
+    assert child.parent is shpl.default_style
+    assert child.line_style == shpl.default_style.line_style
+    assert child.version > version
+
+
 test_list = [
-    TDef(test_styles, has_id=True)
+    TDef(test_styles, has_id=True),
+    TDef(test_geometry_info_identity),
+    TDef(test_style_versions)
 ]
 
 if __name__ == "__main__":
@@ -0,0 +1,119 @@
+"""
+Check viewport culling and clipping in draw_many.
+"""
+
+import random as rnd
+import shapely as shp
+
+from shapely_plotly.tests.utils.rnd_shapes import rnd_geom_classes
+from shapely_plotly.tests.utils.rnd_shapes_3d import rnd_geom_classes as rnd_geom_classes_3d
+from shapely_plotly.tests.utils.utils import rnd_style, rnd_string
+from shapely_plotly.tests.utils.run_main import run_main, TDef, start_end_id
+from shapely_plotly.tests.test_bulk import plot_coord_set, geom_coord_set, check_legend
+
+import shapely_plotly as shpl
+import shapely_plotly.coords as shpl_coords
+
+test_list = []
+
+
+def do_test_view(test_num, show, dims, test_name):
+    test_start, test_end = start_end_id(test_num, 100, 200)
+    for test_num in range(test_start, test_end):
+        rnd.seed(test_num)
+
+        # Geometries on a grid, and a view somewhere over the grid.
+        geoms = []
+        for i in range(rnd.randrange(1, 30)):
+            x, y = (i % 6) * 5.0, (i // 6) * 5.0
+            if dims == 3:
+                geom, _ = rnd.choice(rnd_geom_classes_3d).rnd_shape_3d(x, y, -1.0, 4.0, 4.0, 2.0)
+            else:
+                geom, _ = rnd.choice(rnd_geom_classes).rnd_shape_2d(x, y, 4.0, 4.0)
+            geoms.append(geom)
+
+        min_x, min_y = rnd.uniform(-5.0, 25.0), rnd.uniform(-5.0, 25.0)
+        view = (min_x, min_y, min_x + rnd.uniform(1.0, 15.0), min_y + rnd.uniform(1.0, 15.0))
+        view_box = shp.box(*shpl_coords.view_bounds(view)[0:4])
+
+        style = rnd_style(False)
+        name = rnd.choice((None, rnd_string()))
+
+        plot_data = []
+        shpl.draw_many(geoms, plot_data, style=style, name=name, dims=dims, view=view)
+
+        if show:
+            shpl.show3d(plot_data, view=view) if dims == 3 else shpl.show2d(plot_data, view=view)
+
+        # Nothing is drawn outside the view, including the margin.
+        coords = plot_coord_set(plot_data, dims)
+        assert all(view_box.covers(shp.Point(c[0:2])) for c in coords), f'{test_name}[{test_num}]'
+
+        # Geometries entirely inside the view are drawn as they are.
+        inside = [g for g in geoms if view_box.contains_properly(g)]
+        assert geom_coord_set(inside, dims) <= coords, f'{test_name}[{test_num}]'
+
+        # Something is drawn if any geometry is in the view.
+        if any(view_box.intersects(g) for g in geoms):
+            check_legend(plot_data, name, 4 if dims == 3 else 5)
+        else:
+            assert plot_data == []
+
+    return
+
+
+def test_view2d(test_num=None, show=False):
+    """
+    Self-checking randoms.  Geometries are culled and clipped to a view rectangle - 2D.
+    """
+    do_test_view(test_num, show, 2, "test_view2d")
+    return
+
+
+test_list.append(TDef(test_view2d, has_id=True, has_show=True))
+
+
+def test_view3d(test_num=None, show=False):
+    """
+    Self-checking randoms.  Geometries are culled and clipped to a view rectangle - 3D.
+    """
+    do_test_view(test_num, show, 3, "test_view3d")
+    return
+
+
+test_list.append(TDef(test_view3d, has_id=True, has_show=True))
+
+
+def test_view_box():
+    """
+    A 3D view box also skips geometries above or below it.  show2d/show3d set the axes to the view.
+    """
+    geoms = [shp.LineString([(0.0, 0.0, z), (1.0, 1.0, z)]) for z in range(10)]
+
+    plot_data = []
+    shpl.draw_many(geoms, plot_data, dims=3, view=(-1.0, -1.0, 2.5, 2.0, 2.0, 5.5))
+    assert set(c[2] for c in plot_coord_set(plot_data, 3)) == {3.0, 4.0, 5.0}
+
+    # Unmerged geometries are culled too.
+    plot_data = []
+    shpl.draw_many(geoms, plot_data, dims=3, view=(-1.0, -1.0, 2.5, 2.0, 2.0, 5.5), merge=False)
+    assert len(plot_data) == 3
+
+    fig = shpl.show3d(plot_data, show=False, view=(-1.0, -1.0, 2.5, 2.0, 2.0, 5.5))
+    assert tuple(fig.layout.scene.zaxis.range) == (2.5, 5.5)
+    fig = shpl.show2d(plot_data, show=False, view=(-1.0, -2.0, 2.0, 3.0))
+    assert tuple(fig.layout.xaxis.range) == (-1.0, 2.0)
+    assert tuple(fig.layout.yaxis.range) == (-2.0, 3.0)
+
+    # Nothing in view.
+    plot_data = []
+    shpl.draw_many(geoms, plot_data, view=(10.0, 10.0, 11.0, 11.0))
+    assert plot_data == []
+    return
+
+
+test_list.append(TDef(test_view_box))
+
+
+if __name__ == "__main__":
+    run_main(test_list)
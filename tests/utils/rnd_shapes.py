@@ -1,7 +1,9 @@
 import random as rnd
 from math import pi, sin, cos
 import shapely as shp
-from shapely_plotly.tests.utils.utils import rnd_style, rnd_string, normalize_plot_obj, compare_object
+from shapely_plotly.tests.utils.utils import (
+    rnd_style, rnd_string, normalize_plot_obj, normalize_coords, compare_object
+)
 import shapely_plotly as shpl
 from abc import ABC, abstractstaticmethod
 from shapely_plotly.tests.utils.run_main import start_end_id
@@ -501,68 +503,7 @@ class RndPolyComplex2d(RndGeometry):
         expected_data - To be updated with needed expected data.
         """
 
-        if len(geom.interiors) > 0:
-            # Has interioriors.  We have 1 to 3 plots.
-            total_plots = 0
-
-            # 1) Fill plot:
-            if final_style.fill_color is not None:
-                # For x,y I'm just going to take the polygon's x/ys for expected values.
-                # This is a non-test.  I could rebuild the x/y lists, but it would just be repeating the
-                # same code already in the polygon plot function.
-                fill_plot_data = plot_data[pd_start]
-                expect_data = {
-                    "dims": "2d",
-                    "x": tuple(fill_plot_data.x),
-                    "y": tuple(fill_plot_data.y)
-                }
-
-                assert len(fill_plot_data.x) == \
-                       len(geom.exterior.xy[0]) + len(geom.interiors) + sum(len(i.xy[0]) for i in geom.interiors)
-
-                add_normalized_style_info(expect_data, final_style, final_name, "poly_fill")
-                expected_data_list.append(expect_data)
-                total_plots += 1
-
-            # 2) Exterior plot.
-            if (final_style.line_style is not None) or (final_style.vertex_style is not None):
-                ext = geom.exterior
-                ext_x, ext_y = ext.xy
-                expect_data = {
-                    "dims": "2d",
-                    "x": tuple(ext_x),
-                    "y": tuple(ext_y)
-                }
-                add_normalized_style_info(expect_data, final_style, final_name, "line")
-                expected_data_list.append(expect_data)
-                total_plots += 1
-
-            # 3) Interiors plot.
-            if (final_style.hole_line_style is not None) or (final_style.hole_vertex_style is not None):
-                # Again, we just take the plot's xy coordinates.
-                hole_plot_data = plot_data[pd_start + total_plots]
-                expect_data = {
-                    "dims": "2d",
-                    "x": tuple(hole_plot_data.x),
-                    "y": tuple(hole_plot_data.y)
-                }
-                assert len(hole_plot_data.x) == \
-                       len(geom.interiors) + sum(len(i.xy[0]) for i in geom.interiors) - 1
-
-                add_normalized_style_info(expect_data, final_style, final_name, "hole")
-                expected_data_list.append(expect_data)
-                total_plots += 1
-
-        else:
-            # No interiors.  Just the one plot, and we can build just a single expected value like normal.
-            expect_data = {
-                "dims": "2d",
-                "x": tuple(c[0] for c in geom.exterior.coords),
-                "y": tuple(c[1] for c in geom.exterior.coords)
-            }
-            add_normalized_style_info(expect_data, final_style, final_name, "poly")
-            expected_data_list.append(expect_data)
-
+        get_expected_polygons_2d([geom], final_style, final_name, plot_data, pd_start, expected_data_list)
         return
 
     @abstractstaticmethod
@@ -619,7 +560,7 @@ class RndMultiPoly2d(RndGeometry):
         """
         Compute expected_data for the plotted geometry, and add to expected_data list.
 
-        Add expected data to expect_data_list for the 1 to 3 plots created by drawing a polygon (geom).
+        Add expected data to expect_data_list for the 1 to 3 plots created by drawing a multi-polygon (geom).
         Unlike other geometries, polygons do not set dims and x/y as geometry creation time.
         For polygons, those values are complex and we wait until after the plots are made to create them.
 
@@ -632,10 +573,8 @@ class RndMultiPoly2d(RndGeometry):
         expected_data - To be updated with needed expected data.
         """
 
-        # Build expected style data for all the plots.  All use the same final_style
-        for poly in geom.geoms:
-            RndPolyComplex2d.get_expected_data_2d(poly, proto_expected_data, final_style, final_name, plot_data,
-                                                  len(expected_data_list), expected_data_list)
+        # All the polygons are plotted together, like a single polygon.
+        get_expected_polygons_2d(list(geom.geoms), final_style, final_name, plot_data, pd_start, expected_data_list)
         return
 
     @abstractstaticmethod
@@ -724,6 +663,100 @@ rnd_geom_classes = [
 
 
 
+def joined_coords(rings, axis):
+    """
+    Coordinates of several rings along one axis, joined with None gaps.  As plotted, after normalization.
+    """
+    coords = []
+    for ring in rings:
+        if len(coords) > 0:
+            coords.append(None)
+        coords.extend(ring.xy[axis])
+
+    return tuple(coords)
+
+
+def get_expected_polygons_2d(polys, final_style, final_name, plot_data, pd_start, expected_data_list):
+    """
+    Add expected data to expect_data_list for the 1 to 3 plots created by drawing polygons together, as a
+    single Polygon or a MultiPolygon.
+    Unlike other geometries, polygons do not set dims and x/y as geometry creation time.
+    For polygons, those values are complex and we wait until after the plots are made to create them.
+
+    polys - List of the Polygons plotted.
+    final_style - The style chosen during plotting.
+    final_name - The name assigned during plotting.
+    plot_data - The plots
+    pd_start - The first plot in plot_data belonging to the geometry.
+    expected_data - To be updated with needed expected data.
+    """
+    exteriors = [p.exterior for p in polys if not p.is_empty]
+    interiors = [i for p in polys for i in p.interiors]
+    if len(exteriors) == 0:
+        # Empty.  Nothing plotted.
+        return
+
+    num_rings = len(exteriors) + len(interiors)
+    num_ring_coords = sum(len(r.xy[0]) for r in exteriors) + sum(len(i.xy[0]) for i in interiors)
+
+    if len(interiors) > 0:
+        # Has interioriors.  We have 1 to 3 plots.
+        total_plots = 0
+
+        # 1) Fill plot:
+        if final_style.fill_color is not None:
+            # For x,y I'm just going to take the polygon's x/ys for expected values.
+            # This is a non-test.  I could rebuild the x/y lists, but it would just be repeating the
+            # same code already in the polygon plot function.
+            fill_plot_data = plot_data[pd_start]
+            expect_data = {
+                "dims": "2d",
+                "x": normalize_coords(fill_plot_data.x),
+                "y": normalize_coords(fill_plot_data.y)
+            }
+
+            assert len(fill_plot_data.x) == num_ring_coords + num_rings - 1
+
+            add_normalized_style_info(expect_data, final_style, final_name, "poly_fill")
+            expected_data_list.append(expect_data)
+            total_plots += 1
+
+        # 2) Exterior plot.
+        if (final_style.line_style is not None) or (final_style.vertex_style is not None):
+            expect_data = {
+                "dims": "2d",
+                "x": joined_coords(exteriors, 0),
+                "y": joined_coords(exteriors, 1)
+            }
+            add_normalized_style_info(expect_data, final_style, final_name, "line")
+            expected_data_list.append(expect_data)
+            total_plots += 1
+
+        # 3) Interiors plot.
+        if (final_style.hole_line_style is not None) or (final_style.hole_vertex_style is not None):
+            expect_data = {
+                "dims": "2d",
+                "x": joined_coords(interiors, 0),
+                "y": joined_coords(interiors, 1)
+            }
+            add_normalized_style_info(expect_data, final_style, final_name, "hole")
+            expected_data_list.append(expect_data)
+            total_plots += 1
+
+    else:
+        # No interiors.  Just the one plot, and we can build just a single expected value like normal.
+        # The exteriors are plotted as they are.  Orientation only matters for holes.
+        expect_data = {
+            "dims": "2d",
+            "x": joined_coords(exteriors, 0),
+            "y": joined_coords(exteriors, 1)
+        }
+        add_normalized_style_info(expect_data, final_style, final_name, "poly")
+        expected_data_list.append(expect_data)
+
+    return
+
+
 def do_rnd_geom_plotting(plot_data, expected_data_list, GeomClass, xoff, yoff, width=1.0, height=None):
     if height is None:
         height = width
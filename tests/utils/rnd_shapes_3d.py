@@ -527,7 +527,7 @@ class RndPolyComplex3d(RndGeometry3D):
         """
         Compute expected_data for the plotted geometry, and add to expected_data list.
 
-        Add expected data to expect_data_list for the 1 to 3 plots created by drawing a polygon (geom).
+        Add expected data to expect_data_list for the 1 or 2 plots created by drawing a polygon (geom).
         Unlike other geometries, polygons do not set dims and x/y as geometry creation time.
         For polygons, those values are complex and we wait until after the plots are made to create them.
 
@@ -540,64 +540,7 @@ class RndPolyComplex3d(RndGeometry3D):
         expected_data - To be updated with needed expected data.
         """
 
-        if len(geom.interiors) > 0:
-            # Has interioriors.  We have 1 to 3 plots.
-            total_plots = 0
-
-            # 1) Exterior plot.
-            if (final_style.line_style is not None) or (final_style.vertex_style is not None):
-                ext = geom.exterior
-                ext_x, ext_y = ext.xy
-                if ext.has_z:
-                    ext_z = tuple(c[2] for c in ext.coords)
-                else:
-                    ext_z = (0.0,) * len(ext_x)
-                expect_data = {
-                    "dims": "3d",
-                    "x": tuple(ext_x),
-                    "y": tuple(ext_y),
-                    "z": ext_z
-                }
-                add_normalized_style_info(expect_data, final_style, final_name, "line")
-                expected_data_list.append(expect_data)
-                total_plots += 1
-
-            # 2) Interior plots.
-            if (final_style.hole_line_style is not None) or (final_style.hole_vertex_style is not None):
-                for interior in geom.interiors:
-                    hole_x, hole_y = interior.xy
-                    if interior.has_z:
-                        hole_z = tuple(c[2] for c in interior.coords)
-                    else:
-                        hole_z = (0.0,)*len(hole_x)
-                    expect_data = {
-                        "dims": "3d",
-                        "x": tuple(hole_x),
-                        "y": tuple(hole_y),
-                        "z": hole_z
-                    }
-
-                    add_normalized_style_info(expect_data, final_style, final_name, "hole")
-                    expected_data_list.append(expect_data)
-                    total_plots += 1
-
-        else:
-            # No interiors.  Just the one plot, and we can build just a single expected value like normal.
-            ext = geom.exterior
-            ext_x, ext_y = ext.xy
-            if ext.has_z:
-                ext_z = tuple(c[2] for c in ext.coords)
-            else:
-                ext_z = (0.0,)*len(ext_x)
-            expect_data = {
-                "dims": "3d",
-                "x": tuple(ext_x),
-                "y": tuple(ext_y),
-                "z": ext_z
-            }
-            add_normalized_style_info(expect_data, final_style, final_name, "line")
-            expected_data_list.append(expect_data)
-
+        get_expected_polygons_3d([geom], final_style, final_name, expected_data_list)
         return
 
     @staticmethod
@@ -655,7 +598,7 @@ class RndMultiPoly3d(RndGeometry3D):
         """
         Compute expected_data for the plotted geometry, and add to expected_data list.
 
-        Add expected data to expect_data_list for the 1 to 3 plots created by drawing a polygon (geom).
+        Add expected data to expect_data_list for the 1 or 2 plots created by drawing a multi-polygon (geom).
         Unlike other geometries, polygons do not set dims and x/y as geometry creation time.
         For polygons, those values are complex and we wait until after the plots are made to create them.
 
@@ -668,10 +611,8 @@ class RndMultiPoly3d(RndGeometry3D):
         expected_data - To be updated with needed expected data.
         """
 
-        # Build expected style data for all the plots.  All use the same final_style
-        for poly in geom.geoms:
-            RndPolyComplex3d.get_expected_data_3d(poly, proto_expected_data, final_style, final_name, plot_data,
-                                                  len(expected_data_list), expected_data_list)
+        # All the polygons are plotted together, like a single polygon.
+        get_expected_polygons_3d(list(geom.geoms), final_style, final_name, expected_data_list)
         return
 
     @staticmethod
@@ -723,7 +664,7 @@ class RndGeomCollection3d(RndGeometry3D):
         """
         Compute expected_data for the plotted geometry, and add to expected_data list.
 
-        Add expected data to expect_data_list for the 1 to 3 plots created by drawing a polygon (geom).
+        Add expected data to expect_data_list for the 1 or 2 plots created by drawing a polygon (geom).
         Unlike other geometries, polygons do not set dims and x/y as geometry creation time.
         For polygons, those values are complex and we wait until after the plots are made to create them.
 
@@ -761,6 +702,61 @@ rnd_geom_classes = [
 ]
 
 
+def joined_coords_3d(rings):
+    """
+    Coordinates of several rings, joined with None gaps.  As plotted, after normalization.
+    Missing z-coordinates are 0.0.
+
+    Returns x, y, z tuples.
+    """
+    xs, ys, zs = [], [], []
+    for ring in rings:
+        if len(xs) > 0:
+            xs.append(None)
+            ys.append(None)
+            zs.append(None)
+        ring_x, ring_y = ring.xy
+        xs.extend(ring_x)
+        ys.extend(ring_y)
+        if ring.has_z:
+            zs.extend(c[2] for c in ring.coords)
+        else:
+            zs.extend((0.0,) * len(ring_x))
+
+    return tuple(xs), tuple(ys), tuple(zs)
+
+
+def get_expected_polygons_3d(polys, final_style, final_name, expected_data_list):
+    """
+    Add expected data to expect_data_list for the 1 or 2 plots created by drawing polygons together, as a
+    single Polygon or a MultiPolygon.  All exteriors are in one plot, and all holes in another.
+
+    polys - List of the Polygons plotted.
+    final_style - The style chosen during plotting.
+    final_name - The name assigned during plotting.
+    expected_data - To be updated with needed expected data.
+    """
+    exteriors = [p.exterior for p in polys if not p.is_empty]
+    interiors = [i for p in polys for i in p.interiors]
+
+    # 1) Exterior plot.
+    if (len(exteriors) > 0) and ((final_style.line_style is not None) or (final_style.vertex_style is not None)):
+        x, y, z = joined_coords_3d(exteriors)
+        expect_data = {"dims": "3d", "x": x, "y": y, "z": z}
+        add_normalized_style_info(expect_data, final_style, final_name, "line")
+        expected_data_list.append(expect_data)
+
+    # 2) Interiors plot.
+    if (len(interiors) > 0) and \
+            ((final_style.hole_line_style is not None) or (final_style.hole_vertex_style is not None)):
+        x, y, z = joined_coords_3d(interiors)
+        expect_data = {"dims": "3d", "x": x, "y": y, "z": z}
+        add_normalized_style_info(expect_data, final_style, final_name, "hole")
+        expected_data_list.append(expect_data)
+
+    return
+
+
 def do_rnd_geom_plotting_3d(plot_data, expected_data_list, GeomClass, xoff, yoff, zoff, width=1.0, height=None, zheight=None):
     if height is None:
         height = width
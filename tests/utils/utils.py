@@ -1,7 +1,9 @@
+import json
 import random as rnd
 from string import ascii_letters, digits, punctuation
 
 import plotly.graph_objects as graph
+import plotly.io as pio
 import shapely_plotly as shpl
 
 rnd_chars = ascii_letters + digits + punctuation
@@ -45,12 +47,19 @@ norm_fields_3d = [
     "z"
 ]
 
+def normalize_coords(coords):
+    """
+    Normalize a coordinate array to a tuple of floats.  Gaps (NaN or None) become None.
+    """
+    return tuple(None if (v is None) or (v != v) else float(v) for v in coords)
+
+
 def normalize_plot_obj(plot_obj):
     """
     Normalize a Scatter/Scatter3d object.
     """
     d = {}
-    if isinstance(plot_obj, graph.Scatter):
+    if isinstance(plot_obj, (graph.Scatter, graph.Scattergl)):
         d["dims"] = "2d"
         is_3d = False
         norm_fields = norm_fields_2d
@@ -64,6 +73,10 @@ def normalize_plot_obj(plot_obj):
     for field in norm_fields:
         d[field] = getattr(plot_obj, field)
 
+    # Coordinates may be NumPy arrays, using NaN for gaps.
+    for field in ("x", "y", "z") if is_3d else ("x", "y"):
+        d[field] = normalize_coords(d[field])
+
     if not is_3d:
         # Polygons will sometimes be labled as fill toself even when there is no fill color.
         # In this case we ignore it, because filling with no fill color will not fill.  So we normalize it to None
@@ -223,6 +236,48 @@ def rnd_string():
     return s
 
 
+def rnd_geoms(dims, num_geoms, with_fill=True, rnd_fill_3d=False):
+    """
+    Random geometries on a grid, with a few random styles and names.
+    """
+    # rnd_shapes imports this module.
+    from shapely_plotly.tests.utils.rnd_shapes import rnd_geom_classes
+    from shapely_plotly.tests.utils.rnd_shapes_3d import rnd_geom_classes as rnd_geom_classes_3d
+
+    styles = [rnd_style(with_fill) for _ in range(3)]
+    if rnd_fill_3d:
+        for s in styles:
+            s.fill_3d = rnd.choice((False, True))
+    names = [rnd_string() for _ in range(2)]
+
+    geoms = []
+    for i in range(num_geoms):
+        x, y = (i % 5) * 5.0, (i // 5) * 5.0
+        if dims == 3:
+            geom, _ = rnd.choice(rnd_geom_classes_3d).rnd_shape_3d(x, y, -1.0, 4.0, 4.0, 2.0)
+        else:
+            geom, _ = rnd.choice(rnd_geom_classes).rnd_shape_2d(x, y, 4.0, 4.0)
+        geom.plotly_set_style(rnd.choice(styles))
+        geom.plotly_set_name(rnd.choice(names))
+        geoms.append(geom)
+
+    return geoms
+
+
+def figure_data(plot_data, dims):
+    """
+    The plots as Python objects, via Plotly's JSON.  Legend groups are replaced by their order of first appearance,
+    as they are generated.
+    """
+    show_f = shpl.show3d if dims == 3 else shpl.show2d
+    data = json.loads(pio.to_json(show_f(plot_data, show=False, validate=False), validate=False))["data"]
+    groups = {}
+    for p in data:
+        if "legendgroup" in p:
+            p["legendgroup"] = groups.setdefault(p["legendgroup"], len(groups))
+    return data
+
+
 def check_style(s):
     """
     Test all Style elements to make sure they give the correct values.